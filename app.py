@@ -20,9 +20,12 @@ import plotly.graph_objects as go
 from statsmodels.tsa.arima.model import ARIMA
 from investor import suggest_diversificatio_corr
 from analytics_engine import load_analytics_pack, suggest_starter_from_pack
-from news_fetcher import get_news_signals
+from news_fetcher import iter_news_signals
 from speech_backtest import get_signal_leaderboard
 from hedge_fund_mirror import get_fund_holdings, FUNDS
+from fund_matrix import build_holdings_matrix, parse_portfolio
+from etf_exposure import get_exposure_matrix
+from tracking_helpers import load_watchlist
 
 
 FONT_SIZE = "15px"
@@ -1060,6 +1063,42 @@ with tab_portfolio:
         except Exception as e:
             st.error(f"Failed to generate starter portfolio: {e}")
 
+    # ---- Look-through exposure (ETF holdings → single stocks & sectors) ----
+    st.subheader("🔍 Look-Through Exposure")
+    st.caption("What you actually own once each ETF is expanded into its holdings.")
+
+    if st.session_state.get("sim_new_tickers") and st.session_state.get("sim_new_allocs"):
+        default_mix = " ".join(
+            f"{t}:{a:g}" for t, a in zip(st.session_state.sim_new_tickers, st.session_state.sim_new_allocs)
+        )
+    else:
+        default_mix = "SPY:60 QQQ:20 NVDA:20"
+    mix_text = st.text_input(
+        "Holdings as SYMBOL[:WEIGHT] — ETFs and stocks, space-separated",
+        value=default_mix, key="lookthrough_mix",
+    )
+    mix = parse_portfolio(mix_text.replace(",", " ").split())
+    if mix:
+        try:
+            em = get_exposure_matrix()
+            lt_stocks, lt_sectors = em.look_through(mix)
+            col_s, col_sec = st.columns(2)
+            with col_s:
+                st.markdown("**Top single-stock exposure**")
+                show = lt_stocks.head(15).copy()
+                for col in ("weight", "direct", "via_etfs"):
+                    show[col] = (show[col] * 100).round(2)
+                show.columns = ["Ticker", "Total %", "Direct %", "Via ETFs %", "Sector"]
+                st.dataframe(show, use_container_width=True, hide_index=True)
+            with col_sec:
+                fig_lt = px.pie(lt_sectors, names="sector", values="weight", title="Sector exposure", hole=0.4)
+                fig_lt.update_layout(margin=dict(t=50, b=20))
+                st.plotly_chart(fig_lt, use_container_width=True)
+            if not em.etfs:
+                st.info("No ETF holdings cached yet — run `python etf_holdings_fetcher.py --all`.")
+        except Exception as e:
+            st.warning(f"Look-through exposure unavailable: {e}")
+
 
 # ── 🧠 Intelligence Tab ────────────────────────────────────────────────────────
 with tab_intel:
@@ -1067,18 +1106,28 @@ with tab_intel:
 
     # Section 1: Political Signal Backtest leaderboard
     st.subheader("📊 Political Signal Backtest")
-    st.caption("More data accumulates daily — signals strengthen over time.")
+    st.caption("More data accumulates daily — signals strengthen over time. "
+               "Ranked by permutation p-value (lower = less likely to be noise).")
     try:
         board = get_signal_leaderboard()
         if board:
-            board_df = pd.DataFrame(board)[
-                ["keyword", "ticker", "direction", "hit_rate", "avg_return_5d", "sample_size"]
-            ].copy()
+            board_df = pd.DataFrame(board).reindex(columns=[
+                "keyword", "ticker", "direction", "hit_rate", "hit_rate_ci_low", "hit_rate_ci_high",
+                "p_value", "avg_return_5d", "sample_size",
+            ])
+            board_df["hit_rate_ci"] = [
+                f"{lo*100:.0f}–{hi*100:.0f}%" if pd.notna(lo) else "N/A"
+                for lo, hi in zip(board_df["hit_rate_ci_low"], board_df["hit_rate_ci_high"])
+            ]
             board_df["hit_rate"] = (board_df["hit_rate"] * 100).round(1).astype(str) + "%"
+            board_df["p_value"] = board_df["p_value"].apply(lambda x: f"{x:.3f}" if pd.notna(x) else "N/A")
             board_df["avg_return_5d"] = board_df["avg_return_5d"].apply(
-                lambda x: f"{x*100:+.2f}%" if x is not None else "N/A"
+                lambda x: f"{x:+.2f}%" if pd.notna(x) else "N/A"   # already in percent
             )
-            board_df.columns = ["Keyword", "Ticker", "Dir", "Hit Rate", "Avg 5d Return", "Sample Size"]
+            board_df = board_df[["keyword", "ticker", "direction", "hit_rate", "hit_rate_ci",
+                                 "p_value", "avg_return_5d", "sample_size"]]
+            board_df.columns = ["Keyword", "Ticker", "Dir", "Hit Rate", "Hit Rate 95% CI",
+                                "p-value", "Avg 5d Return", "Sample Size"]
             st.dataframe(board_df, use_container_width=True, hide_index=True)
         else:
             st.info("No backtest data with sufficient sample size yet. Run `python speech_backtest.py --run` to populate.")
@@ -1091,17 +1140,20 @@ with tab_intel:
     st.subheader("🗞️ Today's News Signals")
     default_intel_tickers = ["NVDA", "AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "JPM", "MU", "DELL"]
     try:
-        with st.spinner("Fetching latest news signals..."):
-            news_sigs = get_news_signals(default_intel_tickers, use_cache=True)
-        if news_sigs:
+        # Rows are appended as each feed arrives instead of waiting on all of them
+        news_placeholder = st.empty()
+        news_sigs = []
+        for batch in iter_news_signals(default_intel_tickers, use_cache=True):
+            news_sigs.extend(batch)
+            news_sigs.sort(key=lambda s: s["score"], reverse=True)
             news_df = pd.DataFrame(news_sigs[:15])[
                 ["ticker", "direction", "keyword", "score", "headline", "source"]
             ].copy()
             news_df.columns = ["Ticker", "Dir", "Keyword", "Score", "Headline", "Source"]
             news_df["Score"] = news_df["Score"].round(1)
-            st.dataframe(news_df, use_container_width=True, hide_index=True)
-        else:
-            st.info("No keyword-matched news signals at the moment.")
+            news_placeholder.dataframe(news_df, use_container_width=True, hide_index=True)
+        if not news_sigs:
+            news_placeholder.info("No keyword-matched news signals at the moment.")
     except Exception as e:
         st.warning(f"News signals unavailable: {e}")
 
@@ -1126,7 +1178,7 @@ with tab_hedge:
         df_fund = st.session_state["hedge_df"]
         st.markdown(f"**{fund_choice}** — {len(df_fund)} positions")
 
-        display_df = df_fund.copy()
+        display_df = df_fund[["ticker", "issuer", "shares", "market_value", "pct_portfolio"]].copy()
         display_df["market_value"] = display_df["market_value"].apply(lambda x: f"${x:,.0f}")
         display_df["shares"] = display_df["shares"].apply(lambda x: f"{x:,.0f}")
         display_df["pct_portfolio"] = display_df["pct_portfolio"].apply(lambda x: f"{x:.2f}%")
@@ -1147,6 +1199,48 @@ with tab_hedge:
     else:
         st.info("Select a fund and click **Load Holdings** to view positions.")
 
+    # Cross-fund consensus — sparse fund × security matrix over cached 13Fs
+    st.markdown("---")
+    st.markdown("### 🤝 Cross-Fund Consensus")
+
+    @st.cache_resource(ttl=3600, show_spinner=False)
+    def load_holdings_matrix():
+        return build_holdings_matrix()
+
+    try:
+        hm = load_holdings_matrix()
+    except Exception as e:
+        hm = None
+        st.warning(f"Holdings matrix unavailable: {e}")
+
+    if hm is None or hm.shape[0] == 0:
+        st.info("No cached 13F holdings yet — run `python hedge_fund_mirror.py --all`.")
+    else:
+        st.caption(f"{hm.shape[0]} funds × {hm.shape[1]} securities from the latest cached 13F filings.")
+        col_wide, col_holders = st.columns(2)
+        with col_wide:
+            st.markdown("**Most widely held**")
+            wide = hm.most_widely_held(20)[["ticker", "issuer", "n_funds", "avg_weight_pct"]]
+            wide.columns = ["Ticker", "Issuer", "# Funds", "Avg Weight %"]
+            st.dataframe(wide, use_container_width=True, hide_index=True)
+        with col_holders:
+            held_ticker = st.text_input("Funds holding ticker", value="NVDA", key="consensus_ticker")
+            holders = hm.funds_holding(held_ticker.strip())
+            holders.columns = ["Fund", "Weight %"]
+            st.dataframe(holders, use_container_width=True, hide_index=True)
+
+        st.markdown("**Overlap with my portfolio**")
+        default_port = " ".join(load_watchlist()) or "NVDA:40 AAPL:30 MSFT:30"
+        port_text = st.text_input(
+            "Holdings as TICKER[:WEIGHT], space-separated (equal weight if omitted)",
+            value=default_port, key="consensus_portfolio",
+        )
+        portfolio = parse_portfolio(port_text.replace(",", " ").split())
+        if portfolio:
+            overlap = hm.portfolio_overlap(portfolio).head(15)
+            overlap.columns = ["Fund", "Shared Names", "Fund % in Your Names", "Cosine Similarity"]
+            st.dataframe(overlap, use_container_width=True, hide_index=True)
+
 
 # ── 🚨 Alerts Tab ─────────────────────────────────────────────────────────────
 with tab_alerts:
@@ -29,6 +29,7 @@ import yfinance as yf
 from news_fetcher import get_news_signals, get_ticker_news_score
 from insider_tracker import get_insider_signals
 from etf_holdings_fetcher import _load_cache as _load_etf_cache
+from event_study import log_verdicts
 
 SCORES_PATH = Path("data/convergence_scores.json")
 LOOKBACK_DAYS = 90
@@ -238,6 +239,10 @@ def _save_scores(results: List[Dict]) -> None:
     }
     SCORES_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     log.info(f"Saved {len(results)} scores to {SCORES_PATH}")
+    try:
+        log_verdicts(results)   # verdict history for the event study
+    except Exception as e:
+        log.warning(f"Could not log convergence verdicts: {e}")
 
 
 # ── CLI ────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,275 @@
+"""
+cusip_index.py — Offline CUSIP / issuer-name → ticker resolution for 13F holdings
+
+13F information tables identify securities by CUSIP and an abbreviated
+issuer name ("BANK AMER CORP", "OCCIDENTAL PETE CORP"); the ticker edgartools
+attaches is often blank. This index resolves them without network calls:
+
+  cusip    — 9-char CUSIP → ticker, learned from every filing that did carry
+             a ticker (thirteenf_store feeds each parsed table back in)
+  issuer6  — 6-char issuer prefix → ticker, when every known issue of that
+             issuer maps to the same single ticker and the issuer is not a
+             multi-class S&P company; never used for rows whose title names
+             a share class (CL A / CL B issues are told apart by full CUSIP)
+  names    — precomputed issuer-name keys → ticker, from data/snp500.csv
+             Security names and filings. Names are normalised on both sides:
+             13F abbreviations are expanded (PETE → PETROLEUM, AMER → AMERICA,
+             FINL → FINANCIAL) and corporate-form words dropped. Keys are the
+             full name, the same with spaces removed, and a loose key without
+             generic descriptors (CAPITAL ONE FINANCIAL / Capital One), each
+             also with the share class. Keys that point at more than one
+             ticker are dropped when the index is built. A row whose title
+             names a share class only matches class keys.
+
+Resolution is a dictionary lookup per row, so a whole information table is
+resolved in one pass. The index is stored in data/cusip_ticker_index.json.
+
+Functions:
+  build_index()                 -> rebuild from data/snp500.csv and the cached 13Fs
+  resolve_tickers(df)           -> df with blank tickers filled (cusip, issuer, title_class columns)
+  learn_from_holdings(df)       -> number of new CUSIP → ticker pairs recorded
+
+CLI:
+  python cusip_index.py --build
+  python cusip_index.py --lookup "OCCIDENTAL PETE CORP" [--cusip 674599105]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+INDEX_PATH = Path("data/cusip_ticker_index.json")
+INDEX_VERSION = 2          # bump when name_keys changes; older stored indexes are rebuilt
+UNIVERSE_CSV = Path("data/snp500.csv")
+STORE_DIR = Path("data/13f")
+
+# Corporate-form and 13F title words that carry no identity
+_NOISE = {
+    "INC", "INCORPORATED", "CORP", "CORPORATION", "CO", "COMPANY", "COS", "LTD", "LIMITED",
+    "PLC", "LLC", "LP", "NV", "SA", "AG", "SE", "HOLDINGS", "HLDGS", "HLDG", "GROUP", "GRP",
+    "THE", "OF", "AND", "NEW", "DEL", "COM", "CL", "CLASS", "SHS", "ORD", "ADR", "SPONSORED",
+}
+# SEC / 13F issuer-name abbreviations, expanded on both sides of a match
+_ABBREV = {
+    "AMER": "AMERICA", "AMERN": "AMERICAN", "PETE": "PETROLEUM", "FINL": "FINANCIAL",
+    "INTL": "INTERNATIONAL", "NATL": "NATIONAL", "SVCS": "SERVICES", "SVC": "SERVICE",
+    "SYS": "SYSTEMS", "MFG": "MANUFACTURING", "INDS": "INDUSTRIES", "LABS": "LABORATORIES",
+    "ELEC": "ELECTRIC", "GEN": "GENERAL", "MTRS": "MOTORS", "PPTYS": "PROPERTIES",
+    "RES": "RESOURCES", "MGMT": "MANAGEMENT", "INVT": "INVESTMENT", "ENTMT": "ENTERTAINMENT",
+    "HLTH": "HEALTH", "CHEM": "CHEMICAL", "INSTRS": "INSTRUMENTS", "RLTY": "REALTY",
+    "TR": "TRUST", "BK": "BANK", "UTD": "UNITED", "BROS": "BROTHERS", "MACH": "MACHINES",
+    "COMMUNICATION": "COMMUNICATIONS", "TECHNOLOGIES": "TECHNOLOGY", "TECH": "TECHNOLOGY",
+}
+# Descriptors that one side of a match often omits; dropped from the loose key only
+_GENERIC = {
+    "FINANCIAL", "INTERNATIONAL", "INDUSTRIES", "ENTERPRISES", "TECHNOLOGY", "SYSTEMS",
+    "SERVICES", "HOLDING", "PLATFORMS", "BRANDS", "WORLDWIDE", "GLOBAL",
+}
+_CLASS_RE = re.compile(r"\b(?:CL(?:ASS)?)\s+([A-Z])\b")
+
+log = logging.getLogger(__name__)
+
+_LOCK = threading.Lock()
+_INDEX: Optional[Dict] = None
+
+
+# ── Name keys ──────────────────────────────────────────────────────────────────
+def _tokens(name: str) -> List[str]:
+    name = _CLASS_RE.sub(" ", re.sub(r"\(CLASS ([A-Z])\)", r" CL \1", name.upper()))
+    name = re.sub(r"[^A-Z0-9 ]+", " ", name.replace("&", " AND "))
+    return [_ABBREV.get(t, t) for t in name.split() if t not in _NOISE]
+
+
+def share_class(text: str) -> str:
+    """'CAP STK CL A' / 'Alphabet Inc. (Class A)' -> 'A'; '' when none."""
+    m = _CLASS_RE.search(re.sub(r"\(CLASS ([A-Z])\)", r" CL \1", (text or "").upper()))
+    return m.group(1) if m else ""
+
+
+def name_keys(name: str, cls: str = "") -> List[str]:
+    """Lookup keys for an issuer name, most specific first."""
+    toks = _tokens(name)
+    if not toks:
+        return []
+    full = " ".join(toks)
+    keys = [full, "=" + "".join(toks)]                          # EXXON MOBIL / ExxonMobil
+    loose = [t for t in toks if t not in _GENERIC]
+    if len(loose) > 1 or (loose and loose == toks):   # one word left over is too loose
+        keys.append("~" + " ".join(loose))                      # CAPITAL ONE FINANCIAL / Capital One
+    if cls:
+        keys = [f"{k}|{cls}" for k in keys] + keys
+    return keys
+
+
+# ── Build / load ───────────────────────────────────────────────────────────────
+def _universe_names(path: Path = UNIVERSE_CSV) -> Iterable[Tuple[str, str, str]]:
+    """(ticker, security name, share class) from the S&P 500 list."""
+    if not path.exists():
+        return []
+    with path.open(newline="", encoding="utf-8") as f:
+        return [
+            (row["Ticker"].strip().upper(), row["Security"], share_class(row["Security"]))
+            for row in csv.DictReader(f)
+            if row.get("Ticker") and row.get("Security")
+        ]
+
+
+def _cached_filings(store_dir: Path = STORE_DIR) -> Iterable[pd.DataFrame]:
+    for path in sorted(store_dir.glob("*/*.parquet")):
+        try:
+            yield pd.read_parquet(path, columns=["cusip", "issuer", "ticker", "title_class"])
+        except Exception as e:
+            log.warning(f"Skipping {path}: {e}")
+
+
+def _unique(mapping: Dict[str, Set[str]]) -> Dict[str, str]:
+    return {k: next(iter(v)) for k, v in mapping.items() if len(v) == 1}
+
+
+def build_index() -> Dict:
+    """Rebuild the index from data/snp500.csv and every cached 13F table."""
+    names: Dict[str, Set[str]] = defaultdict(set)
+    cusips: Dict[str, Set[str]] = defaultdict(set)
+    multi_class: Set[str] = set()
+
+    for ticker, security, cls in _universe_names():
+        if cls:
+            multi_class.add(ticker)
+        for key in name_keys(security, cls):
+            names[key].add(ticker)
+
+    for df in _cached_filings():
+        known = df[df["ticker"].fillna("") != ""]
+        for cusip, issuer, ticker, title in known.itertuples(index=False):
+            ticker = ticker.upper()
+            cusips[cusip].add(ticker)
+            for key in name_keys(issuer, share_class(title)):
+                names[key].add(ticker)
+
+    cusip_map = _unique(cusips)
+    # Every ticker ever seen on an issuer's CUSIPs counts, conflicting ones too
+    issuers: Dict[str, Set[str]] = defaultdict(set)
+    for cusip, tickers in cusips.items():
+        issuers[cusip[:6]].update(tickers)
+    issuer_map = {k: t for k, t in _unique(issuers).items() if t not in multi_class}
+
+    index = {
+        "version": INDEX_VERSION,
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "cusip": cusip_map,
+        "issuer6": issuer_map,
+        "names": _unique(names),
+    }
+    _save_index(index)
+    log.info(f"CUSIP index: {len(index['cusip'])} CUSIPs, {len(index['issuer6'])} issuers, "
+             f"{len(index['names'])} name keys → {INDEX_PATH}")
+    return index
+
+
+def _save_index(index: Dict) -> None:
+    global _INDEX
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    INDEX_PATH.write_text(json.dumps(index, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+    _INDEX = index
+
+
+def _load_index() -> Dict:
+    """Load once per process; build from local data the first time."""
+    global _INDEX
+    with _LOCK:
+        if _INDEX is None:
+            if INDEX_PATH.exists():
+                try:
+                    _INDEX = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+                except Exception as e:
+                    log.warning(f"Could not read {INDEX_PATH} ({e}) — rebuilding.")
+                if _INDEX is not None and _INDEX.get("version") != INDEX_VERSION:
+                    log.info(f"{INDEX_PATH} was built by an older version — rebuilding.")
+                    _INDEX = None
+            if _INDEX is None:
+                build_index()
+        return _INDEX
+
+
+# ── Resolve / learn ────────────────────────────────────────────────────────────
+def _resolve_one(index: Dict, cusip: str, issuer: str, title: str) -> str:
+    cls = share_class(title)
+    ticker = index["cusip"].get(cusip) or ("" if cls else index["issuer6"].get(cusip[:6]))
+    if ticker:
+        return ticker
+    names = index["names"]
+    keys = name_keys(issuer, cls)
+    if cls:   # never let a class-less name match stand in for a named share class
+        keys = [k for k in keys if k.endswith(f"|{cls}")]
+    for key in keys:
+        ticker = names.get(key)
+        if ticker:
+            return ticker
+    return ""
+
+
+def resolve_tickers(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill blank `ticker` values from the index. Expects cusip and issuer columns."""
+    index = _load_index()
+    df = df.copy()
+    if "ticker" not in df.columns:
+        df["ticker"] = ""
+    titles = df["title_class"] if "title_class" in df.columns else pd.Series("", index=df.index)
+    blank = df["ticker"].fillna("").astype(str).str.strip() == ""
+    df.loc[blank, "ticker"] = [
+        _resolve_one(index, c, i, t)
+        for c, i, t in zip(df.loc[blank, "cusip"], df.loc[blank, "issuer"], titles[blank].fillna(""))
+    ]
+    df["ticker"] = df["ticker"].fillna("")
+    resolved = int((df.loc[blank, "ticker"] != "").sum())
+    if blank.any():
+        log.info(f"CUSIP index resolved {resolved}/{int(blank.sum())} missing tickers")
+    return df
+
+
+def learn_from_holdings(df: pd.DataFrame) -> int:
+    """Record CUSIP → ticker pairs from a table whose tickers came from the filing."""
+    index = _load_index()
+    known = df[df["ticker"].fillna("") != ""]
+    new = {
+        c: t.upper() for c, t in zip(known["cusip"], known["ticker"])
+        if c not in index["cusip"]
+    }
+    if not new:
+        return 0
+    with _LOCK:
+        index["cusip"].update(new)   # issuer6 is only recomputed by build_index()
+        _save_index(index)
+    return len(new)
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="Offline CUSIP / issuer → ticker index.")
+    parser.add_argument("--build", action="store_true", help="Rebuild from data/snp500.csv and cached 13Fs")
+    parser.add_argument("--lookup", metavar="ISSUER", help="Resolve an issuer name")
+    parser.add_argument("--cusip", default="", help="CUSIP to try first with --lookup")
+    parser.add_argument("--title", default="", help="Title of class (e.g. 'CAP STK CL A') with --lookup")
+    args = parser.parse_args()
+
+    index = build_index() if args.build else _load_index()
+    if args.lookup:
+        ticker = _resolve_one(index, args.cusip.upper(), args.lookup, args.title)
+        print(f"  {args.lookup!r} → {ticker or '(unresolved)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,26 @@
 digest_mailer.py — Daily Market Update Email
 
 Sends at 9:00 PM ET on weekdays via GitHub Actions.
-Reads pre-cached data files — does NOT re-fetch live data.
+Reads pre-cached data files — does NOT re-fetch live data. A DigestSnapshot
+loads every file once per build and is shared by the subject and all sections;
+only the tail of the ETF price CSV is read.
+
+Each recipient with their own data/watchlists/<email>.csv gets a "Your
+Watchlist" section built from it; everyone else gets the plain shared digest.
+Shared sections are rendered once, personal ones in a
+worker pool, and everything goes out over one reused SMTP_SSL connection
+(DigestSender: batches, NOOP checks, retry with reconnect).
 
 Email sections:
   1. 📊 What Happened Today
-  2. 🔎 Stocks Worth Watching Tommorow
-  3. 👀 Company Insiders Are Buying Their Own Stock
-  4. 📰 News That Could Move Stocks
-  5. 🐳 What Big Investors Are Doing
-  6. 📊 How the Market Did Today
-  7. ✅ Signals That Have Actually Worked
-  8. ⚠️ Just So You Know
+  2. 👤 Your Watchlist (per recipient)
+  3. 🔎 Stocks Worth Watching Tommorow
+  4. 👀 Company Insiders Are Buying Their Own Stock
+  5. 📰 News That Could Move Stocks
+  6. 🐳 What Big Investors Are Doing
+  7. 📊 How the Market Did Today
+  8. ✅ Signals That Have Actually Worked
+  9. ⚠️ Just So You Know
 
 CLI:
   python digest_mailer.py --preview   (saves HTML locally, does NOT send)
@@ -29,20 +38,26 @@ except ImportError:
     pass
 
 import argparse
+import io
 import json
 import logging
 import os
 import smtplib
 import ssl
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from tracking_helpers import load_watchlist
+
 log = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
 
@@ -53,11 +68,22 @@ DIGESTS_DIR = Path("data/digests")
 CONVERGENCE_PATH = Path("data/convergence_scores.json")
 INSIDER_PATH = Path("data/insider_signals.json")
 BACKTEST_PATH = Path("data/backtest_results.json")
+EVENT_STUDY_PATH = Path("data/event_study_results.json")
 HEDGE_PATH = Path("data/hedge_fund_holdings.json")
 NEWS_CACHE_PATH = Path("data/news_signals.json")
 ETF_PRICES_PATH = Path("data/etf_prices_converted.csv")
 
 _BENCHMARK_ETFS = ["SPY", "QQQ", "VTI", "GLD", "TLT"]
+_TAIL_BLOCK = 8192   # bytes read per step when scanning the ETF price CSV from its end
+_PERSONAL_SLOT = "<!--personal-->"
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+RENDER_WORKERS = 4
+SEND_BATCH = 20        # messages per batch; the connection is health-checked between batches
+SEND_RETRIES = 3       # attempts per message, reconnecting after a failure
+RETRY_BACKOFF = 2.0    # seconds, doubled on each retry
+WATCHLIST_ROWS = 10
 
 
 # ── Recipients ─────────────────────────────────────────────────────────────────
@@ -110,6 +136,29 @@ def _load_backtest() -> List[dict]:
     )
 
 
+def _load_signal_track_record() -> List[dict]:
+    """
+    Rows for "Signals That Have Actually Worked", every signal type:
+    the top keyword+ticker pairs from the news backtest, then insider and
+    convergence labels from the event study (pooled over all stocks).
+    Each row: kind, pattern, ticker, hit_rate, avg_return_5d (percent), sample_size.
+    """
+    rows = [
+        {"kind": "News", "pattern": r["keyword"], "ticker": r["ticker"], "hit_rate": r["hit_rate"],
+         "avg_return_5d": r.get("avg_return_5d"), "sample_size": r["sample_size"]}
+        for r in _load_backtest()[:3]
+    ]
+    study = _load_json(EVENT_STUDY_PATH, {}) or {}
+    for source, kind in (("insider", "Insider"), ("convergence", "Convergence")):
+        good = [r for r in study.get("sources", {}).get(source, []) if (r.get("hit_rate") or 0) >= 0.55]
+        rows += [
+            {"kind": kind, "pattern": r["label"], "ticker": "Any stock", "hit_rate": r["hit_rate"],
+             "avg_return_5d": r.get("avg_return_5d"), "sample_size": r["sample_size"]}
+            for r in sorted(good, key=lambda r: r["hit_rate"], reverse=True)[:2]
+        ]
+    return rows
+
+
 def _load_hedge_notable() -> Optional[dict]:
     data = _load_json(HEDGE_PATH, {})
     if not data:
@@ -143,12 +192,31 @@ def _load_news_signals() -> List[dict]:
         return []
 
 
+def _read_csv_tail(path: Path, n_rows: int) -> pd.DataFrame:
+    """Header plus the last `n_rows` lines of a CSV, read from the end of the file."""
+    with path.open("rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > body_start and tail.rstrip(b"\n").count(b"\n") < n_rows:
+            step = min(_TAIL_BLOCK, pos - body_start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    lines = tail.rstrip(b"\n").split(b"\n")[-n_rows:]
+    text = (header + b"\n".join(lines) + b"\n").decode("utf-8")
+    return pd.read_csv(io.StringIO(text), index_col=0, parse_dates=True)
+
+
 def _load_etf_pulse() -> dict:
+    """Day-over-day % change per ETF from the last two rows of the price store
+    (rows are appended in date order, so only the file's tail is read)."""
     if not ETF_PRICES_PATH.exists():
         return {}
     try:
-        df = pd.read_csv(ETF_PRICES_PATH, index_col=0, parse_dates=True)
-        df = df.sort_index()
+        df = _read_csv_tail(ETF_PRICES_PATH, 2).sort_index()
         if len(df) < 2:
             return {}
         last = df.iloc[-1]
@@ -160,6 +228,44 @@ def _load_etf_pulse() -> dict:
         return {}
 
 
+@dataclass
+class DigestSnapshot:
+    """Every artifact one digest build needs, each file read once."""
+
+    convergence: List[dict]
+    insider: List[dict]
+    track_record: List[dict]
+    hedge_notable: Optional[dict]
+    news_signals: List[dict]
+    etf_data: dict
+    convergence_age_hours: Optional[float]
+
+    @cached_property
+    def by_ticker(self) -> Dict[str, dict]:
+        """{ticker: {"score": convergence row, "insider": [...], "news": [...]}} for watchlist sections."""
+        index: Dict[str, dict] = {}
+        for s in self.convergence:
+            index.setdefault(s.get("ticker", ""), {"score": None, "insider": [], "news": []})["score"] = s
+        for s in self.insider:
+            index.setdefault(s.get("ticker", ""), {"score": None, "insider": [], "news": []})["insider"].append(s)
+        for s in self.news_signals:
+            index.setdefault(s.get("ticker", ""), {"score": None, "insider": [], "news": []})["news"].append(s)
+        return index
+
+    @classmethod
+    def load(cls) -> "DigestSnapshot":
+        age = ((time.time() - CONVERGENCE_PATH.stat().st_mtime) / 3600) if CONVERGENCE_PATH.exists() else None
+        return cls(
+            convergence=_load_convergence(),
+            insider=_load_insider(),
+            track_record=_load_signal_track_record(),
+            hedge_notable=_load_hedge_notable(),
+            news_signals=_load_news_signals(),
+            etf_data=_load_etf_pulse(),
+            convergence_age_hours=age,
+        )
+
+
 # ── ETF Pulse section builder ──────────────────────────────────────────────────
 _ETF_LABELS = {
     "SPY": "S&P 500 (SPY) — most big US stocks",
@@ -278,21 +384,28 @@ def _pill(text: str, color: str = "#3b82f6") -> str:
     return f'<span style="background:{color};color:white;padding:2px 10px;border-radius:99px;font-size:12px;font-weight:600;">{text}</span>'
 
 
-def build_email_html() -> str:
+def build_email_html(snap: Optional[DigestSnapshot] = None) -> str:
+    """The digest without any per-recipient section (previews, --test)."""
+    return render_shared_html(snap or DigestSnapshot.load()).replace(_PERSONAL_SLOT, "")
+
+
+def render_shared_html(snap: Optional[DigestSnapshot] = None) -> str:
+    """Every shared section, rendered once; _PERSONAL_SLOT marks where a recipient's own section goes."""
     now = datetime.now(timezone(timedelta(hours=-5)))  # ET (UTC-5; handles EST; close enough for date display)
     date_str = now.strftime("%A, %B %-d, %Y")
 
-    convergence = _load_convergence()
-    insider = _load_insider()
-    backtest = _load_backtest()
-    hedge_notable = _load_hedge_notable()
-    news_signals = _load_news_signals()
-    etf_data = _load_etf_pulse()
+    snap = snap or DigestSnapshot.load()
+    convergence = snap.convergence
+    insider = snap.insider
+    track_record = snap.track_record
+    hedge_notable = snap.hedge_notable
+    news_signals = snap.news_signals
+    etf_data = snap.etf_data
 
     # Staleness check
     staleness_warning = ""
-    if CONVERGENCE_PATH.exists():
-        file_age_hours = (time.time() - CONVERGENCE_PATH.stat().st_mtime) / 3600
+    if snap.convergence_age_hours is not None:
+        file_age_hours = snap.convergence_age_hours
         if file_age_hours > 36:
             log.warning(f"convergence_scores.json is {file_age_hours:.0f} hours old — signals may be stale")
             staleness_warning = f"⚠️ Note: Signal data is {file_age_hours:.0f} hours old and may not reflect today's market."
@@ -424,14 +537,15 @@ def build_email_html() -> str:
     etf_pulse_section = _build_etf_pulse_section(etf_data)
 
     # ── Section 6: Signals That Have Actually Worked ──────────────────────────
-    if backtest[:3]:
+    if track_record:
         rows = ""
-        for r in backtest[:3]:
+        for r in track_record:
             avg5 = r.get("avg_return_5d")
-            avg5_str = f"{avg5*100:+.2f}%" if avg5 is not None else "N/A"
+            avg5_str = f"{avg5:+.2f}%" if avg5 is not None else "N/A"
             rows += f"""
             <tr>
-              <td style="padding:8px;">{r['keyword']}</td>
+              <td style="padding:8px;color:#6b7280;">{r['kind']}</td>
+              <td style="padding:8px;">{r['pattern']}</td>
               <td style="padding:8px;font-weight:700;">{r['ticker']}</td>
               <td style="padding:8px;color:#16a34a;font-weight:600;">{r['hit_rate']*100:.0f}%</td>
               <td style="padding:8px;">{avg5_str}</td>
@@ -439,17 +553,18 @@ def build_email_html() -> str:
             </tr>"""
         bt_body = f"""
           <p style="color:#374151;font-size:14px;margin:0 0 12px 0;">
-            These are patterns we've tracked over time that have been right more often than not. Not a guarantee — just what the data actually shows.
+            These are patterns we've tracked over time — news keywords, insider buying and our own convergence calls — that have been right more often than not. Not a guarantee — just what the data actually shows.
           </p>
           <table style="width:100%;border-collapse:collapse;">
             <tr style="background:#e2e8f0;">
+              <th style="padding:8px;text-align:left;">Signal</th>
               <th style="padding:8px;text-align:left;">Pattern</th><th style="padding:8px;text-align:left;">Stock</th>
               <th style="padding:8px;text-align:left;">How often it worked</th><th style="padding:8px;text-align:left;">Avg gain in 5 days</th>
               <th style="padding:8px;text-align:left;">Times tracked</th>
             </tr>{rows}
           </table>"""
     else:
-        bt_body = "<p style='color:#6b7280;'>Still collecting data — these patterns get more reliable over time as we track more news.</p>"
+        bt_body = "<p style='color:#6b7280;'>Still collecting data — these patterns get more reliable over time as we track more signals.</p>"
     bt_section = _section("✅ Signals That Have Actually Worked", bt_body)
 
     # ── Section 7: Just So You Know ───────────────────────────────────────────
@@ -476,6 +591,7 @@ def build_email_html() -> str:
     <div style="padding:8px 24px 32px 24px;">
       <p style="color:#374151;font-size:15px;margin:16px 0 0 0;">Here's today's market recap — what happened today and what to watch tomorrow.</p>
       {pulse_section}
+      {_PERSONAL_SLOT}
       {picks_section}
       {insider_section}
       {news_section}
@@ -495,10 +611,11 @@ def build_email_html() -> str:
 
 
 # ── Send ───────────────────────────────────────────────────────────────────────
-def _build_subject() -> str:
+def _build_subject(snap: Optional[DigestSnapshot] = None) -> str:
     now = datetime.now(timezone(timedelta(hours=-5)))
-    convergence = _load_convergence()
-    insider = _load_insider()
+    snap = snap or DigestSnapshot.load()
+    convergence = snap.convergence
+    insider = snap.insider
     strong = len([s for s in convergence if s.get("verdict") in ("STRONG BUY", "BUY")])
     high_ins = len([s for s in insider if s.get("signal_strength") == "HIGH"])
     parts = []
@@ -510,33 +627,177 @@ def _build_subject() -> str:
     return f"📊 Market Recap — {now.strftime('%a %b %-d')} | Tomorrow's watchlist inside"
 
 
-def send_digest(recipients: List[str], html: str, subject: str) -> bool:
-    sender = os.environ.get("DIGEST_SENDER_EMAIL", "")
-    password = os.environ.get("DIGEST_SENDER_PASS", "")
+# ── Personalised sections ─────────────────────────────────────────────────────
+def _build_watchlist_section(tickers: List[str], snap: DigestSnapshot) -> str:
+    """'Your Watchlist' — today's score, insider buys and top headline for the recipient's tickers."""
+    if not tickers:
+        return ""
+    rows = ""
+    for tk in tickers[:WATCHLIST_ROWS]:
+        info = snap.by_ticker.get(tk, {})
+        score = info.get("score")
+        verdict = score.get("verdict", "") if score else ""
+        verdict_html = _pill(verdict, _VERDICT_COLOR.get(verdict, "#6b7280")) if verdict else "—"
+        buys = len(info.get("insider", []))
+        news = max(info.get("news", []), key=lambda n: n.get("score", 0), default=None)
+        headline = f"{news.get('direction', '')} {news.get('headline', '')[:80]}" if news else "—"
+        rows += f"""
+            <tr>
+              <td style="padding:8px;font-weight:700;">{tk}</td>
+              <td style="padding:8px;">{verdict_html}</td>
+              <td style="padding:8px;">{f"{buys} insider buy{'s' if buys != 1 else ''}" if buys else "—"}</td>
+              <td style="padding:8px;color:#374151;font-size:13px;">{headline}</td>
+            </tr>"""
+    body = f"""
+      <p style="color:#374151;font-size:14px;margin:0 0 12px 0;">What today's data says about the stocks you follow.</p>
+      <table style="width:100%;border-collapse:collapse;">
+        <tr style="background:#e2e8f0;">
+          <th style="padding:8px;text-align:left;">Stock</th><th style="padding:8px;text-align:left;">Our take</th>
+          <th style="padding:8px;text-align:left;">Insiders</th><th style="padding:8px;text-align:left;">Top headline</th>
+        </tr>{rows}
+      </table>"""
+    return _section("👤 Your Watchlist", body)
+
+
+def build_digests(recipients: List[str], snap: Optional[DigestSnapshot] = None,
+                  workers: int = RENDER_WORKERS) -> List[Tuple[str, str, str]]:
+    """
+    (recipient, subject, html) per recipient. Shared sections are rendered
+    once; each recipient's watchlist section is rendered in a worker pool
+    and dropped into the shared page. Only a recipient's own watchlist file
+    counts — without one the page is the plain shared digest.
+    """
+    snap = snap or DigestSnapshot.load()
+    shared = render_shared_html(snap)
+    subject = _build_subject(snap)
 
-    if not sender or not password:
-        log.error("DIGEST_SENDER_EMAIL or DIGEST_SENDER_PASS not set in environment.")
+    def _render(email: str) -> Tuple[str, str, str]:
+        return email, subject, shared.replace(_PERSONAL_SLOT, _build_watchlist_section(load_watchlist(email, shared_fallback=False), snap))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="digest") as pool:
+        return list(pool.map(_render, recipients))
+
+
+# ── Send ───────────────────────────────────────────────────────────────────────
+class DigestSender:
+    """
+    One logged-in SMTP connection reused for every message. Messages go out
+    in batches of SEND_BATCH with a NOOP health check between batches; a
+    message that hits a transient error is retried up to SEND_RETRIES times
+    on a fresh connection with exponential backoff. Permanent (5xx) refusals
+    fail that message without a retry, and an authentication error stops
+    the whole run — every further login would fail the same way.
+    """
+
+    def __init__(self, sender: str, password: str, host: str = SMTP_HOST, port: int = SMTP_PORT,
+                 connect: Optional[Callable[[str, int], smtplib.SMTP]] = None):
+        self.sender = sender
+        self.password = password
+        self.host = host
+        self.port = port
+        self._connect_fn = connect or (
+            lambda h, p: smtplib.SMTP_SSL(h, p, context=ssl.create_default_context())
+        )
+        self._server: Optional[smtplib.SMTP] = None
+        self.connections = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        self.close()
+        server = self._connect_fn(self.host, self.port)
+        if self.password:
+            try:
+                server.login(self.sender, self.password)
+            except Exception:
+                server.close()
+                raise
+        self._server = server
+        self.connections += 1
+        return server
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def _alive(self) -> bool:
+        try:
+            return self._server is not None and self._server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _send_one(self, recipient: str, subject: str, html: str) -> bool:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.sender
+        msg["To"] = recipient
+        msg.attach(MIMEText(html, "html"))
+        payload = msg.as_string()
+
+        for attempt in range(1, SEND_RETRIES + 1):
+            try:
+                server = self._server or self._connect()
+                server.sendmail(self.sender, [recipient], payload)
+                return True
+            except smtplib.SMTPAuthenticationError:
+                raise
+            except smtplib.SMTPRecipientsRefused as e:
+                log.error(f"[{recipient}] refused: {e}")
+                return False
+            except Exception as e:
+                if isinstance(e, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)) and e.smtp_code >= 500:
+                    log.error(f"[{recipient}] rejected ({e.smtp_code}): {e}")
+                    return False
+                log.warning(f"[{recipient}] send attempt {attempt}/{SEND_RETRIES} failed: {e}")
+                self.close()
+                if attempt < SEND_RETRIES:
+                    time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
         return False
-    if not recipients:
+
+    def send_all(self, messages: List[Tuple[str, str, str]]) -> Dict[str, int]:
+        """Send (recipient, subject, html) messages; returns {"sent", "failed", "connections"}."""
+        sent = failed = 0
+        try:
+            for start in range(0, len(messages), SEND_BATCH):
+                if self._server is not None and not self._alive():
+                    self.close()   # _send_one reconnects
+                for recipient, subject, html in messages[start:start + SEND_BATCH]:
+                    if self._send_one(recipient, subject, html):
+                        sent += 1
+                    else:
+                        failed += 1
+        except smtplib.SMTPAuthenticationError as e:
+            failed = len(messages) - sent
+            log.error(f"SMTP login failed ({e.smtp_code}) — not retrying; {failed} message(s) unsent.")
+        finally:
+            self.close()
+        return {"sent": sent, "failed": failed, "connections": self.connections}
+
+
+def send_digests(messages: List[Tuple[str, str, str]], sender: Optional[DigestSender] = None) -> bool:
+    """Deliver per-recipient digests over one reused connection. True if every message went out."""
+    if sender is None:
+        address = os.environ.get("DIGEST_SENDER_EMAIL", "")
+        password = os.environ.get("DIGEST_SENDER_PASS", "")
+        if not address or not password:
+            log.error("DIGEST_SENDER_EMAIL or DIGEST_SENDER_PASS not set in environment.")
+            return False
+        sender = DigestSender(address, password)
+    if not messages:
         log.warning("No recipients found.")
         return False
 
-    msg = MIMEMultipart("alternative")
-    msg["Subject"] = subject
-    msg["From"] = sender
-    msg["To"] = ", ".join(recipients)
-    msg.attach(MIMEText(html, "html"))
+    stats = sender.send_all(messages)
+    log.info(f"Digest sent to {stats['sent']}/{len(messages)} recipient(s) "
+             f"over {stats['connections']} connection(s); {stats['failed']} failed.")
+    return stats["failed"] == 0
 
-    try:
-        ctx = ssl.create_default_context()
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=ctx) as server:
-            server.login(sender, password)
-            server.sendmail(sender, recipients, msg.as_string())
-        log.info(f"Digest sent to {len(recipients)} recipient(s).")
-        return True
-    except Exception as e:
-        log.error(f"Send failed: {e}")
-        return False
+
+def send_digest(recipients: List[str], html: str, subject: str) -> bool:
+    """Send the same digest to every recipient (one message each)."""
+    return send_digests([(r, subject, html) for r in recipients])
 
 
 def _save_preview(html: str) -> Path:
@@ -548,12 +809,11 @@ def _save_preview(html: str) -> Path:
 
 # ── Entry point ────────────────────────────────────────────────────────────────
 def run_digest() -> None:
-    """Main entry point — build and send to all recipients."""
+    """Main entry point — build personalised digests and send to all recipients."""
     recipients = read_recipients()
-    html = build_email_html()
-    subject = _build_subject()
-    _save_preview(html)
-    send_digest(recipients, html, subject)
+    snap = DigestSnapshot.load()
+    _save_preview(build_email_html(snap))
+    send_digests(build_digests(recipients, snap))
 
 
 def main() -> None:
@@ -564,8 +824,9 @@ def main() -> None:
     group.add_argument("--test", action="store_true", help="Send to first recipient only")
     args = parser.parse_args()
 
-    html = build_email_html()
-    subject = _build_subject()
+    snap = DigestSnapshot.load()
+    html = build_email_html(snap)
+    subject = _build_subject(snap)
     path = _save_preview(html)
     log.info(f"HTML saved to {path}")
 
@@ -584,7 +845,7 @@ def main() -> None:
             log.warning("No recipients in digest_recipients.txt — add at least one.")
             return
 
-    ok = send_digest(recipients, html, subject)
+    ok = send_digests(build_digests(recipients, snap))
     print(f"\n{'✅ Sent' if ok else '❌ Send failed'} to {len(recipients)} recipient(s).")
 
 
@@ -0,0 +1,133 @@
+"""
+edgar_daily_index.py — EDGAR daily form-index reader
+
+Reads the daily form index EDGAR publishes for each business day
+  {ARCHIVE_ROOT}/edgar/daily-index/{YYYY}/QTR{q}/form.{YYYYMMDD}.idx
+and the filing documents it points to ({ARCHIVE_ROOT}/edgar/data/...).
+
+ARCHIVE_ROOT is the public https archive by default. It can also be a local
+directory laid out like Archives/ (edgar/daily-index/..., edgar/data/...),
+which is how the ingestion is exercised offline. Override with the
+EDGAR_ARCHIVE_ROOT environment variable or the `root` argument.
+
+Remote reads draw from the process-wide SEC token bucket (rate_limit.py),
+are retried on HTTP 429, and send the User-Agent SEC requires.
+
+Functions:
+  daily_index_path(day)                    -> relative path of a day's form index
+  read_archive(rel_path, root=None, scheduler=None)      -> bytes, or None if not found
+  iter_form_index(day, forms, root=None, scheduler=None) -> index rows for the given form types
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+import requests
+
+from rate_limit import SEC_BUCKET, RequestScheduler
+
+ARCHIVE_ROOT = os.environ.get("EDGAR_ARCHIVE_ROOT", "https://www.sec.gov/Archives")
+EDGAR_IDENTITY = "SmartPortfolioBot research@smartportfoliobot.com"
+
+log = logging.getLogger(__name__)
+
+_session = requests.Session()
+_session.headers.update({"User-Agent": EDGAR_IDENTITY, "Accept-Encoding": "gzip, deflate"})
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+_default_scheduler = RequestScheduler(SEC_BUCKET, name="edgar-archive")
+
+
+def _is_remote(root: str) -> bool:
+    return root.startswith(("http://", "https://"))
+
+
+# ── Archive access ─────────────────────────────────────────────────────────────
+def daily_index_path(day: date) -> str:
+    quarter = (day.month - 1) // 3 + 1
+    return f"edgar/daily-index/{day.year}/QTR{quarter}/form.{day:%Y%m%d}.idx"
+
+
+def _get(url: str) -> Optional[bytes]:
+    resp = _session.get(url, timeout=30)
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    return resp.content
+
+
+def read_archive(
+    rel_path: str,
+    root: Optional[str] = None,
+    scheduler: Optional[RequestScheduler] = None,
+) -> Optional[bytes]:
+    """
+    Read one archive file relative to the root. Returns None when it does
+    not exist (e.g. no index on weekends and holidays). Remote reads go
+    through `scheduler` (rate limit, 429 retry, request counting).
+    """
+    root = root or ARCHIVE_ROOT
+    if not _is_remote(root):
+        path = Path(root) / rel_path
+        return path.read_bytes() if path.exists() else None
+
+    return (scheduler or _default_scheduler).call(_get, f"{root.rstrip('/')}/{rel_path}")
+
+
+# ── Form index parsing ─────────────────────────────────────────────────────────
+def _parse_form_index(text: str, forms: Iterable[str]) -> Iterator[Dict]:
+    """
+    Parse a form.*.idx body. Columns are fixed-width, so the form type is cut
+    at the header's "Company Name" offset; the last three fields are split
+    from the right since company names contain spaces.
+    """
+    wanted = set(forms)
+    form_width = None
+    in_body = False
+    for line in text.splitlines():
+        if not in_body:
+            if line.startswith("Form Type"):
+                form_width = line.index("Company Name")
+            elif line.startswith("---") and form_width is not None:
+                in_body = True
+            continue
+
+        form = line[:form_width].strip()
+        if form not in wanted:
+            continue
+        parts = line[form_width:].rsplit(None, 3)
+        if len(parts) != 4:
+            continue
+        company, cik, filed, file_name = parts
+        yield {
+            "form": form,
+            "company": company.strip(),
+            "cik": int(cik),
+            "date_filed": f"{filed[:4]}-{filed[4:6]}-{filed[6:8]}",
+            "file_name": file_name,
+            "accession_no": Path(file_name).stem,
+        }
+
+
+def iter_form_index(
+    day: date,
+    forms: Iterable[str] = ("4",),
+    root: Optional[str] = None,
+    scheduler: Optional[RequestScheduler] = None,
+) -> Iterator[Dict]:
+    """
+    Yield index rows of the given form types filed on `day`:
+      {form, company, cik, date_filed, file_name, accession_no}
+    A Form 4 is listed once per party (issuer and each reporting owner),
+    so callers filter on cik and dedupe on accession_no.
+    """
+    raw = read_archive(daily_index_path(day), root, scheduler)
+    if raw is None:
+        log.info(f"No EDGAR daily index for {day} (weekend/holiday or not yet published)")
+        return
+    yield from _parse_form_index(raw.decode("latin-1"), forms)
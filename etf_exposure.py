@@ -0,0 +1,235 @@
+"""
+etf_exposure.py — Sparse ETF × stock weight matrix and look-through exposure
+
+Compiles the ETF holdings cache (etf_holdings_fetcher) into one CSR matrix
+(rows = ETFs, columns = stock tickers, values = holding weight) with a
+ticker → column index, plus a stock × sector indicator matrix from the GICS
+sectors in data/snp500.csv. Portfolio questions become sparse products:
+
+  overlap      — which ETFs hold my stocks:  W @ 1[mine]
+  look-through — effective stock weights of a portfolio mixing ETFs and
+                 stocks:  w_etf @ W + w_direct, then sectors via @ S
+
+etfdb lists only each ETF's top holdings, so the weight an ETF does not
+itemise is reported as "(unlisted)" rather than silently dropped.
+
+Classes:
+  ExposureMatrix                               — ETF × ticker CSR + sector map
+
+Functions:
+  build_exposure_matrix(cache=None)            -> ExposureMatrix
+  get_exposure_matrix()                        -> process-wide ExposureMatrix, rebuilt
+                                                  only when the holdings cache changes
+  look_through(portfolio)                      -> (stock exposure df, sector exposure df)
+
+CLI:
+  python etf_exposure.py --portfolio QQQ:50 SPY:30 NVDA:20 [--top 15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from etf_holdings_fetcher import HOLDINGS_DIR, LEGACY_HOLDINGS_PATH, _load_cache
+
+UNIVERSE_CSV = Path("data/snp500.csv")
+UNLISTED = "(unlisted)"
+OTHER_SECTOR = "Other / Unknown"
+
+log = logging.getLogger(__name__)
+
+_MATRIX_LOCK = threading.Lock()
+_MATRIX: Dict = {"signature": None, "matrix": None}
+
+
+def _load_sectors(path: Path = UNIVERSE_CSV) -> Dict[str, str]:
+    if not path.exists():
+        return {}
+    with path.open(newline="", encoding="utf-8") as f:
+        return {row["Ticker"].strip().upper(): row["GICS Sector"] for row in csv.DictReader(f) if row.get("Ticker")}
+
+
+# ── Matrix ─────────────────────────────────────────────────────────────────────
+class ExposureMatrix:
+    """
+    weights[e, t] = weight of ticker t inside ETF e (fractions, rows sum to
+    at most 1). `sector_of` is a (tickers × sectors) 0/1 CSR matrix.
+    """
+
+    def __init__(self, weights: sparse.csr_matrix, etfs: List[str], tickers: List[str], sectors: Dict[str, str]):
+        self.weights = weights
+        self.etfs = etfs
+        self.tickers = tickers
+        self.etf_index = {e: i for i, e in enumerate(etfs)}
+        self.ticker_index = {t: i for i, t in enumerate(tickers)}
+        self.listed = np.asarray(weights.sum(axis=1)).ravel()
+        self.n_holdings = np.diff(weights.indptr)
+        self.sector_map = sectors
+
+        sector_names = [sectors.get(t, OTHER_SECTOR) for t in tickers]
+        self.sectors, codes = np.unique(np.array(sector_names + [OTHER_SECTOR], dtype=object), return_inverse=True)
+        codes = codes[:-1]
+        self.sector_of = sparse.csr_matrix(
+            (np.ones(len(tickers)), (np.arange(len(tickers)), codes)),
+            shape=(len(tickers), len(self.sectors)),
+        )
+        self._other_col = int(np.flatnonzero(self.sectors == OTHER_SECTOR)[0])
+
+    def _split(self, portfolio: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
+        """Normalised portfolio → (ETF weight vector, direct-stock vector, unknown symbols)."""
+        total = sum(w for w in portfolio.values() if w > 0)
+        etf_w = np.zeros(len(self.etfs))
+        stock_w = np.zeros(len(self.tickers))
+        unknown: Dict[str, float] = {}
+        for sym, w in portfolio.items():
+            if w <= 0 or not total:
+                continue
+            sym, w = sym.upper(), w / total
+            if sym in self.etf_index:
+                etf_w[self.etf_index[sym]] += w
+            elif sym in self.ticker_index:
+                stock_w[self.ticker_index[sym]] += w
+            else:
+                unknown[sym] = unknown.get(sym, 0.0) + w
+        return etf_w, stock_w, unknown
+
+    def overlap(self, tickers: List[str]) -> pd.DataFrame:
+        """Per ETF: how much of it sits in the given stocks (ETFs with no overlap omitted)."""
+        mine = np.zeros(len(self.tickers))
+        cols = [self.ticker_index[t.upper()] for t in tickers if t.upper() in self.ticker_index]
+        mine[cols] = 1.0
+        weight = self.weights @ mine
+        count = (self.weights > 0).astype(np.float64) @ mine
+        rows = np.flatnonzero(count)
+        hits = self.weights[rows][:, cols].tocsr()   # only the matched cells, for the ticker lists
+        cols = np.asarray(cols)
+        df = pd.DataFrame({
+            "etf": [self.etfs[i] for i in rows],
+            "overlap_tickers": [[self.tickers[c] for c in cols[hits[k].indices]] for k in range(len(rows))],
+            "overlap_weight": weight[rows].round(4),
+            "overlap_count": count[rows].astype(int),
+            "total_holdings": self.n_holdings[rows],
+        })
+        return df.sort_values("overlap_weight", ascending=False, ignore_index=True)
+
+    def look_through(self, portfolio: Dict[str, float]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Effective exposure of a {symbol: weight} portfolio mixing ETFs and stocks.
+        Returns (stocks: ticker, weight, direct, via_etfs, sector) and
+        (sectors: sector, weight), weights as fractions of the whole portfolio.
+        Symbols that are neither a cached ETF nor held by one are passed
+        through as direct holdings, with their GICS sector from data/snp500.csv
+        when listed there (etfdb only itemises top holdings) and of unknown
+        sector otherwise.
+        """
+        etf_w, stock_w, unknown = self._split(portfolio)
+        via = self.weights.T @ etf_w
+        total = via + stock_w
+        unlisted = float(etf_w @ (1.0 - self.listed))
+
+        nz = np.flatnonzero(total)
+        stocks = pd.DataFrame({
+            "ticker": [self.tickers[i] for i in nz],
+            "weight": total[nz],
+            "direct": stock_w[nz],
+            "via_etfs": via[nz],
+            "sector": self.sectors[self.sector_of[nz].indices] if len(nz) else [],
+        })
+        unknown_sectors = {sym: self.sector_map.get(sym, OTHER_SECTOR) for sym in unknown}
+        extra = [(sym, w, w, 0.0, unknown_sectors[sym]) for sym, w in unknown.items()]
+        if unlisted > 1e-9:
+            extra.append((UNLISTED, unlisted, 0.0, unlisted, OTHER_SECTOR))
+        if extra:
+            stocks = pd.concat([stocks, pd.DataFrame(extra, columns=stocks.columns)], ignore_index=True)
+        stocks = stocks.sort_values("weight", ascending=False, ignore_index=True)
+
+        by_sector = total @ self.sector_of
+        by_sector[self._other_col] += unlisted
+        sectors = pd.DataFrame({"sector": self.sectors, "weight": by_sector})
+        if unknown:
+            sectors = (
+                pd.concat([sectors, pd.DataFrame({"sector": list(unknown_sectors.values()),
+                                                  "weight": list(unknown.values())})])
+                .groupby("sector", as_index=False)["weight"].sum()
+            )
+        sectors = sectors[sectors["weight"] > 0].sort_values("weight", ascending=False, ignore_index=True)
+        return stocks, sectors
+
+
+# ── Build ──────────────────────────────────────────────────────────────────────
+def build_exposure_matrix(cache: Optional[Dict] = None) -> ExposureMatrix:
+    """Compile the ETF holdings cache (default: etf_holdings_fetcher's) into an ExposureMatrix."""
+    cache = _load_cache() if cache is None else cache
+    etfs = sorted(sym for sym, entry in cache.items() if entry.get("holdings"))
+    rows, tickers, weights = [], [], []
+    for r, sym in enumerate(etfs):
+        for h in cache[sym]["holdings"]:
+            ticker = (h.get("ticker") or "").upper().strip()
+            if ticker:
+                rows.append(r)
+                tickers.append(ticker)
+                weights.append(float(h.get("weight") or 0.0))
+
+    codes, uniques = pd.factorize(pd.Series(tickers, dtype=object))
+    matrix = sparse.csr_matrix(
+        (np.asarray(weights), (np.asarray(rows, dtype=np.int64), codes)),
+        shape=(len(etfs), len(uniques)),
+    )
+    matrix.sum_duplicates()
+    log.info(f"Exposure matrix: {len(etfs)} ETFs × {len(uniques)} tickers, {matrix.nnz} weights")
+    return ExposureMatrix(matrix, etfs, list(uniques), _load_sectors())
+
+
+def _cache_signature() -> Tuple:
+    """(name, mtime, size) of every holdings cache file — changes whenever an ETF is refreshed."""
+    paths = sorted(HOLDINGS_DIR.glob("*.json")) if HOLDINGS_DIR.exists() else []
+    if LEGACY_HOLDINGS_PATH.exists():
+        paths.append(LEGACY_HOLDINGS_PATH)
+    return tuple((p.name, st.st_mtime_ns, st.st_size) for p in paths for st in [p.stat()])
+
+
+def get_exposure_matrix() -> ExposureMatrix:
+    """The compiled matrix for the current holdings cache, reused until a cache file changes."""
+    signature = _cache_signature()
+    with _MATRIX_LOCK:
+        if _MATRIX["matrix"] is None or _MATRIX["signature"] != signature:
+            _MATRIX.update(signature=signature, matrix=build_exposure_matrix())
+        return _MATRIX["matrix"]
+
+
+def look_through(portfolio: Dict[str, float]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return get_exposure_matrix().look_through(portfolio)
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    from fund_matrix import parse_portfolio
+
+    parser = argparse.ArgumentParser(description="Look-through stock and sector exposure of a portfolio.")
+    parser.add_argument("--portfolio", nargs="+", required=True, metavar="SYMBOL[:WEIGHT]",
+                        help="ETFs and/or stocks, equal weight if omitted")
+    parser.add_argument("--top", type=int, default=15, help="Stocks to show")
+    args = parser.parse_args()
+
+    stocks, sectors = look_through(parse_portfolio(args.portfolio))
+    print(f"\n  {'Ticker':<12} {'Weight':>8} {'Direct':>8} {'Via ETFs':>9}  Sector")
+    print("  " + "─" * 60)
+    for r in stocks.head(args.top).itertuples(index=False):
+        print(f"  {r.ticker:<12} {r.weight:>8.2%} {r.direct:>8.2%} {r.via_etfs:>9.2%}  {r.sector}")
+    print(f"\n  {'Sector':<28} {'Weight':>8}")
+    print("  " + "─" * 38)
+    for r in sectors.itertuples(index=False):
+        print(f"  {r.sector:<28} {r.weight:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+etf_history.py — Dated ETF holdings snapshots (delta rows) + rebalance diffs
+
+The ETF holdings cache only knows each fund's latest holdings. This module
+keeps their history as one small parquet file per snapshot day:
+
+  data/etf_history/2026-10-19.parquet     etf, ticker, weight, removed, source, baseline
+
+The first snapshot stores every row; later ones store only rows whose weight
+changed, that are new, or that left the fund (removed=True). The holdings of
+any day are rebuilt by replaying the deltas up to it. ETFs missing from a
+snapshot's cache are left untouched rather than read as fully sold.
+
+An ETF's first snapshot, and any snapshot where its holdings source changed
+(etfdb ↔ yfinance), is written in full with baseline=True. Diffs skip ETFs
+with a baseline inside the window: a fund appearing, or a different source
+listing different top holdings, is not a rebalance.
+
+Diffs between two days are computed for all ETFs in one vectorized pass
+(outer join on etf + ticker). Each ETF also gets a turnover figure
+(½ Σ |Δweight|); a turnover over REBALANCE_TURNOVER flags a likely index
+rebalance.
+
+Functions:
+  record_snapshot(cache=None, day=None)   -> delta rows written for `day`
+  holdings_at(day=None)                   -> etf, ticker, weight as of `day`
+  rebalance_diff(start, end=None)         -> (per-holding changes, per-ETF turnover)
+
+CLI:
+  python etf_history.py --record
+  python etf_history.py --diff 2026-09-01 [--until 2026-10-19] [--etf QQQ]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+HISTORY_DIR = Path("data/etf_history")
+WEIGHT_TOL = 1e-6            # smaller moves are rounding noise, not a change
+REBALANCE_TURNOVER = 0.02    # ½ Σ|Δw| above 2% of the fund → likely rebalance
+
+log = logging.getLogger(__name__)
+
+
+def _snapshot_path(day: date) -> Path:
+    return HISTORY_DIR / f"{day.isoformat()}.parquet"
+
+
+def _cache_frame(cache: Dict) -> pd.DataFrame:
+    rows = [
+        (sym, (h.get("ticker") or "").upper().strip(), float(h.get("weight") or 0.0),
+         entry.get("holdings_source", ""))
+        for sym, entry in cache.items()
+        for h in entry.get("holdings", [])
+        if h.get("ticker")
+    ]
+    df = pd.DataFrame(rows, columns=["etf", "ticker", "weight", "source"])
+    return df.groupby(["etf", "ticker"], as_index=False, sort=False).agg(weight=("weight", "sum"), source=("source", "first"))
+
+
+# ── Read ───────────────────────────────────────────────────────────────────────
+def _load_deltas(day: Optional[date] = None) -> pd.DataFrame:
+    """Every delta row up to and including `day`, with its snapshot day."""
+    paths = sorted(HISTORY_DIR.glob("*.parquet"))
+    if day is not None:
+        paths = [p for p in paths if p.stem <= day.isoformat()]
+    if not paths:
+        return pd.DataFrame(columns=["etf", "ticker", "weight", "removed", "source", "baseline", "day"])
+    deltas = pd.concat([pd.read_parquet(p).assign(day=p.stem) for p in paths], ignore_index=True)
+    # Snapshots written before sources were tracked
+    if "source" not in deltas:
+        deltas["source"] = ""
+    if "baseline" not in deltas:
+        deltas["baseline"] = False
+    deltas["source"] = deltas["source"].fillna("")
+    deltas["baseline"] = deltas["baseline"].fillna(False).astype(bool)
+    return deltas
+
+
+def holdings_at(day: Optional[date] = None) -> pd.DataFrame:
+    """Replay deltas up to and including `day` (default: all) into holdings."""
+    deltas = _load_deltas(day)
+    latest = deltas.sort_values("day", kind="stable").drop_duplicates(["etf", "ticker"], keep="last")
+    return latest.loc[~latest["removed"].astype(bool), ["etf", "ticker", "weight", "source"]].reset_index(drop=True)
+
+
+# ── Write ──────────────────────────────────────────────────────────────────────
+def record_snapshot(cache: Optional[Dict] = None, day: Optional[date] = None) -> int:
+    """
+    Store today's holdings as deltas against the replayed history. Only ETFs
+    present in `cache` (default: the holdings cache) are compared. Returns the
+    number of delta rows written (0 writes nothing).
+    """
+    if cache is None:
+        from etf_holdings_fetcher import _load_cache
+        cache = _load_cache()
+    day = day or date.today()
+
+    current = _cache_frame(cache)
+    previous = holdings_at(day)
+    previous = previous[previous["etf"].isin(current["etf"].unique())]
+
+    # New ETFs and ETFs whose source changed are rewritten in full as a baseline
+    prev_source = previous.groupby("etf")["source"].first()
+    cur_source = current.groupby("etf")["source"].first()
+    known = prev_source.reindex(cur_source.index)
+    rebased = cur_source.index[known.isna() | ((known != "") & (known != cur_source))]
+
+    merged = previous.merge(current, on=["etf", "ticker"], how="outer", suffixes=("_prev", ""), indicator=True)
+    baseline = merged["etf"].isin(rebased) & (merged["_merge"] != "left_only")
+    removed = merged["_merge"] == "left_only"
+    changed = baseline | (merged["_merge"] == "right_only") | (
+        (merged["_merge"] == "both") & ((merged["weight"] - merged["weight_prev"]).abs() > WEIGHT_TOL)
+    )
+    keep = removed | changed
+    delta = merged.loc[keep, ["etf", "ticker", "weight"]].copy()
+    delta["removed"] = removed[keep].to_numpy()
+    delta["weight"] = delta["weight"].fillna(0.0)
+    delta["source"] = merged.loc[keep, "source"].fillna(merged.loc[keep, "source_prev"]).fillna("").to_numpy()
+    delta["baseline"] = baseline[keep].to_numpy()
+
+    path = _snapshot_path(day)
+    if path.exists():   # re-recording a day: fold into that day's deltas
+        delta = (
+            pd.concat([pd.read_parquet(path), delta], ignore_index=True)
+            .drop_duplicates(["etf", "ticker"], keep="last")
+        )
+    if delta.empty:
+        log.info(f"ETF history: no holdings changes on {day}")
+        return 0
+
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    delta.sort_values(["etf", "ticker"]).to_parquet(path, index=False, compression="zstd")
+    log.info(f"ETF history: {len(delta)} delta row(s) for {delta['etf'].nunique()} ETF(s) → {path}")
+    return len(delta)
+
+
+# ── Diff ───────────────────────────────────────────────────────────────────────
+def rebalance_diff(start: date, end: Optional[date] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Weight changes from `start` to `end` (default: latest) for every ETF at once.
+    ETFs with no snapshot by `start`, or re-baselined after it (source
+    change), are skipped.
+    Returns:
+      changes  — etf, ticker, weight_before, weight_after, change, status
+                 (added / removed / increased / decreased), largest moves first
+      turnover — etf, turnover, n_changes, rebalance (bool), by turnover
+    """
+    deltas = _load_deltas(end)
+    rebased = deltas.loc[deltas["baseline"] & (deltas["day"] > start.isoformat()), "etf"].unique()
+    before = holdings_at(start)
+    after = holdings_at(end)
+    comparable = set(before["etf"]) - set(rebased)
+    before = before.loc[before["etf"].isin(comparable), ["etf", "ticker", "weight"]]
+    after = after.loc[after["etf"].isin(comparable), ["etf", "ticker", "weight"]]
+    merged = before.merge(after, on=["etf", "ticker"], how="outer", suffixes=("_before", "_after"))
+    merged[["weight_before", "weight_after"]] = merged[["weight_before", "weight_after"]].fillna(0.0)
+    merged["change"] = merged["weight_after"] - merged["weight_before"]
+    merged = merged[merged["change"].abs() > WEIGHT_TOL]
+
+    merged["status"] = np.select(
+        [merged["weight_before"] == 0, merged["weight_after"] == 0, merged["change"] > 0],
+        ["added", "removed", "increased"],
+        default="decreased",
+    )
+    changes = merged.reindex(merged["change"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+    turnover = (
+        changes.assign(abs_change=changes["change"].abs())
+        .groupby("etf")
+        .agg(turnover=("abs_change", "sum"), n_changes=("ticker", "size"))
+        .reset_index()
+    )
+    turnover["turnover"] = (turnover["turnover"] / 2).round(6)
+    turnover["rebalance"] = turnover["turnover"] > REBALANCE_TURNOVER
+    return changes, turnover.sort_values("turnover", ascending=False, ignore_index=True)
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="ETF holdings snapshot history and rebalance diffs.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--record", action="store_true", help="Snapshot the holdings cache for today")
+    group.add_argument("--diff", type=date.fromisoformat, metavar="YYYY-MM-DD", help="Diff from this day")
+    parser.add_argument("--until", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="Diff up to this day (default: latest snapshot)")
+    parser.add_argument("--etf", help="Show holding-level changes for one ETF")
+    parser.add_argument("--top", type=int, default=15, help="Rows to show")
+    args = parser.parse_args()
+
+    if args.record:
+        n = record_snapshot()
+        print(f"Recorded {n} delta row(s).")
+        return
+
+    changes, turnover = rebalance_diff(args.diff, args.until)
+    print(f"\n  {'ETF':<7} {'Turnover':>9} {'Changes':>8}  Rebalance")
+    print("  " + "─" * 38)
+    for r in turnover.head(args.top).itertuples(index=False):
+        print(f"  {r.etf:<7} {r.turnover:>9.2%} {r.n_changes:>8}  {'⚠️' if r.rebalance else ''}")
+    if args.etf:
+        sub = changes[changes["etf"] == args.etf.upper()].head(args.top)
+        print(f"\n  {args.etf.upper()} holding changes")
+        for r in sub.itertuples(index=False):
+            print(f"  {r.status:<10} {r.ticker:<8} {r.weight_before:>8.2%} → {r.weight_after:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,14 @@ Fetches ETF constituent holdings: ticker weights, ETF info (AUM, expense ratio,
 
 Primary source:  etf-database.com (requests + BeautifulSoup, no API key)
 Fallback:        yfinance .info['holdings']
-Cache:           data/etf_holdings.json — refreshed after 24 hours per symbol.
+Cache:           data/etf_holdings/{SYMBOL}.json — one file per ETF, refreshed
+                 after 24 hours. A refresh only rewrites the symbols it
+                 fetched; the legacy data/etf_holdings.json is still read.
+
+Symbols are fetched concurrently. Each remote host has its own token bucket
+(rate_limit.TokenBucket), etfdb requests share one pooled session, and the
+refreshed entries are written together at the end of the run, and their
+holdings are appended to the dated snapshot history (etf_history.py).
 
 CLI:
     python etf_holdings_fetcher.py --etf QQQ SPY XLK
@@ -17,20 +24,28 @@ from __future__ import annotations
 import argparse
 import json
 import logging
-import time
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import yfinance as yf
 
+from etf_history import record_snapshot
+from rate_limit import RequestScheduler, TokenBucket
+
 # ── Config ─────────────────────────────────────────────────────────────────────
-HOLDINGS_PATH = Path("data/etf_holdings.json")
+HOLDINGS_DIR = Path("data/etf_holdings")
+LEGACY_HOLDINGS_PATH = Path("data/etf_holdings.json")   # single-file cache, read-only now
 ETF_SYMBOLS_FILE = Path("etf_symbols.txt")
 CACHE_TTL_HOURS = 24
-REQUEST_DELAY = 1.5  # polite delay between HTTP requests (seconds)
+FETCH_WORKERS = 6
+ETFDB_RPS = 1 / 1.5      # same politeness as the old 1.5 s sleep, now across all workers
+YAHOO_RPS = 2.0
 
 logging.basicConfig(
     level=logging.INFO,
@@ -51,18 +66,37 @@ _HEADERS = {
 
 
 # ── Cache helpers ──────────────────────────────────────────────────────────────
+def _entry_path(symbol: str) -> Path:
+    return HOLDINGS_DIR / f"{symbol.upper()}.json"
+
+
 def _load_cache() -> Dict:
-    if HOLDINGS_PATH.exists():
+    """All cached entries, {SYMBOL: entry}. Per-symbol files win over the legacy file."""
+    cache: Dict = {}
+    if LEGACY_HOLDINGS_PATH.exists():
         try:
-            return json.loads(HOLDINGS_PATH.read_text(encoding="utf-8"))
+            cache.update(json.loads(LEGACY_HOLDINGS_PATH.read_text(encoding="utf-8")))
         except Exception as e:
-            log.warning(f"Cache read error ({e}) — starting fresh.")
-    return {}
+            log.warning(f"Legacy cache read error ({e}) — ignoring it.")
+    if HOLDINGS_DIR.exists():
+        for path in sorted(HOLDINGS_DIR.glob("*.json")):
+            try:
+                cache[path.stem] = json.loads(path.read_text(encoding="utf-8"))
+            except Exception as e:
+                log.warning(f"[{path.stem}] cache read error ({e}) — skipping.")
+    return cache
 
 
-def _save_cache(data: Dict) -> None:
-    HOLDINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    HOLDINGS_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+def _save_entries(entries: Dict) -> None:
+    """Write only the given symbols, each atomically to its own file."""
+    if not entries:
+        return
+    HOLDINGS_DIR.mkdir(parents=True, exist_ok=True)
+    for symbol, entry in entries.items():
+        path = _entry_path(symbol)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
 
 
 def _is_stale(entry: Dict) -> bool:
@@ -86,10 +120,25 @@ def read_etf_symbols(path: Path = ETF_SYMBOLS_FILE) -> List[str]:
     ]
 
 
+# ── HTTP: per-host rate limits + pooled session ──────────────────────────────
+_session = requests.Session()
+_session.headers.update(_HEADERS)
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=FETCH_WORKERS))
+
+_etfdb = RequestScheduler(TokenBucket(ETFDB_RPS, capacity=1), name="etfdb")
+_yahoo = RequestScheduler(TokenBucket(YAHOO_RPS, capacity=2), name="yahoo")
+
+
+def _get_page(url: str) -> requests.Response:
+    resp = _session.get(url, timeout=15)
+    resp.raise_for_status()   # inside the scheduler call so HTTP 429 is retried
+    return resp
+
+
 # ── yfinance helpers ───────────────────────────────────────────────────────────
 def _fetch_yf_info(symbol: str) -> Dict:
     try:
-        info = yf.Ticker(symbol).info
+        info = _yahoo.call(lambda: yf.Ticker(symbol).info)
         aum = info.get("totalAssets") or info.get("netAssets")
         return {
             "short_name": info.get("shortName", ""),
@@ -109,7 +158,7 @@ def _fetch_yf_info(symbol: str) -> Dict:
 def _yf_holdings_fallback(symbol: str) -> List[Dict]:
     """yfinance returns top ~10 holdings for some ETFs via .info['holdings']."""
     try:
-        raw = yf.Ticker(symbol).info.get("holdings") or []
+        raw = _yahoo.call(lambda: yf.Ticker(symbol).info).get("holdings") or []
         return [
             {
                 "ticker": h.get("symbol", ""),
@@ -125,6 +174,53 @@ def _yf_holdings_fallback(symbol: str) -> List[Dict]:
 
 
 # ── etfdb.com scraper ──────────────────────────────────────────────────────────
+# Only the holdings table is parsed: the page is sliced to that <table>
+# first, and the strainer keeps BeautifulSoup from building the rest of the
+# tree if the slice fails. lxml is used when installed.
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+_HOLDINGS_TABLE = SoupStrainer("table", id="etf-holdings")
+_HOLDINGS_TABLE_RE = re.compile(r"""<table\b[^>]*\bid\s*=\s*["']etf-holdings["']""", re.I)
+
+
+def _holdings_table_html(html: str) -> str:
+    """The etf-holdings <table>...</table> substring, or the whole page if not found."""
+    m = _HOLDINGS_TABLE_RE.search(html)
+    if not m:
+        return html
+    end = html.find("</table>", m.end())
+    return html[m.start():end + len("</table>")] if end != -1 else html[m.start():]
+
+
+def _parse_etfdb_holdings(html: str) -> List[Dict]:
+    """Holdings rows from an etfdb ETF page; [] when the table is missing."""
+    soup = BeautifulSoup(_holdings_table_html(html), _HTML_PARSER, parse_only=_HOLDINGS_TABLE)
+    table = soup.find("table")
+    tbody = table.find("tbody") if table else None
+    if not tbody:
+        return []
+
+    holdings: List[Dict] = []
+    for row in tbody.find_all("tr"):
+        cells = [td.get_text(strip=True) for td in row.find_all("td", limit=3)]
+        if len(cells) < 3:
+            continue
+        ticker = cells[0].upper()
+        name = cells[1]
+        weight_str = cells[2].rstrip("%")
+        try:
+            weight = round(float(weight_str) / 100.0, 6)
+        except ValueError:
+            weight = 0.0
+        if ticker:
+            holdings.append({"ticker": ticker, "name": name, "weight": weight})
+    return holdings
+
+
 def _scrape_etfdb(symbol: str) -> List[Dict]:
     """
     Scrape top holdings from etfdb.com (table id='etf-holdings').
@@ -132,34 +228,12 @@ def _scrape_etfdb(symbol: str) -> List[Dict]:
     """
     url = f"https://etfdb.com/etf/{symbol}/"
     try:
-        resp = requests.get(url, headers=_HEADERS, timeout=15)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        table = soup.find("table", {"id": "etf-holdings"})
-        if not table:
+        resp = _etfdb.call(_get_page, url)
+        holdings = _parse_etfdb_holdings(resp.text)
+        if not holdings:
             log.debug(f"[{symbol}] etfdb.com: 'etf-holdings' table not found in page")
             return []
 
-        tbody = table.find("tbody")
-        if not tbody:
-            return []
-
-        holdings: List[Dict] = []
-        for row in tbody.find_all("tr"):
-            cells = [td.get_text(strip=True) for td in row.find_all("td")]
-            if len(cells) < 3:
-                continue
-            ticker = cells[0].upper()
-            name = cells[1]
-            weight_str = cells[2].rstrip("%")
-            try:
-                weight = round(float(weight_str) / 100.0, 6)
-            except ValueError:
-                weight = 0.0
-            if ticker:
-                holdings.append({"ticker": ticker, "name": name, "weight": weight})
-
         log.info(f"[{symbol}] etfdb.com: scraped {len(holdings)} holdings")
         return holdings
 
@@ -184,7 +258,6 @@ def fetch_one(symbol: str, cache: Dict) -> Dict:
     info = _fetch_yf_info(symbol)
 
     holdings = _scrape_etfdb(symbol)
-    time.sleep(REQUEST_DELAY)
 
     source = "etfdb"
     if not holdings:
@@ -204,16 +277,52 @@ def fetch_one(symbol: str, cache: Dict) -> Dict:
 def get_etf_holdings(symbol: str) -> Dict:
     """
     Return the holdings entry for a single ETF.
-    Reads from cache if fresh; otherwise fetches and updates the cache.
+    Reads from cache if fresh; otherwise fetches and updates that symbol's file.
     """
     symbol = symbol.upper().strip()
     cache = _load_cache()
     entry = fetch_one(symbol, cache)
-    cache[symbol] = entry
-    _save_cache(cache)
+    if entry is not cache.get(symbol):
+        _save_entries({symbol: entry})
     return entry
 
 
+def refresh_etfs(symbols: Iterable[str], workers: int = FETCH_WORKERS) -> Dict[str, Dict]:
+    """
+    Fetch stale symbols concurrently (per-host limits still apply) and write
+    the refreshed entries once at the end. Returns {symbol: entry} for every
+    symbol that succeeded, cache hits included.
+    """
+    cache = _load_cache()
+    symbols = list(dict.fromkeys(s.upper().strip() for s in symbols))
+    results: Dict[str, Dict] = {}
+    fetched: Dict[str, Dict] = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etf") as pool:
+        futures = {pool.submit(fetch_one, sym, cache): sym for sym in symbols}
+        for fut in as_completed(futures):
+            sym = futures[fut]
+            try:
+                entry = fut.result()
+            except Exception as e:
+                log.error(f"[{sym}] unexpected error: {e}")
+                continue
+            results[sym] = entry
+            if entry is not cache.get(sym):
+                fetched[sym] = entry
+
+    _save_entries(fetched)
+    if fetched:
+        try:
+            record_snapshot(fetched)
+        except Exception as e:
+            log.warning(f"Could not record ETF holdings history: {e}")
+    log.info(f"Refreshed {len(fetched)} ETF(s), {len(results) - len(fetched)} cache hit(s) → {HOLDINGS_DIR}")
+    _etfdb.log_stats()
+    _yahoo.log_stats()
+    return results
+
+
 def get_etf_overlap(portfolio_tickers: List[str]) -> Dict[str, Dict]:
     """
     For every ETF in the local cache, compute how much it overlaps with
@@ -229,25 +338,18 @@ def get_etf_overlap(portfolio_tickers: List[str]) -> Dict[str, Dict]:
           }, ...
         }
     """
-    cache = _load_cache()
-    needle = {t.upper().strip() for t in portfolio_tickers}
-    result: Dict[str, Dict] = {}
+    from etf_exposure import get_exposure_matrix   # compiled sparse ETF × ticker matrix, reused
 
-    for etf_sym, entry in cache.items():
-        holdings = entry.get("holdings", [])
-        if not holdings:
-            continue
-        matched = [h for h in holdings if h.get("ticker", "").upper() in needle]
-        if not matched:
-            continue
-        result[etf_sym] = {
-            "overlap_tickers": [h["ticker"] for h in matched],
-            "overlap_weight": round(sum(h.get("weight", 0.0) for h in matched), 4),
-            "overlap_count": len(matched),
-            "total_holdings": len(holdings),
+    df = get_exposure_matrix().overlap(portfolio_tickers)
+    return {
+        row.etf: {
+            "overlap_tickers": row.overlap_tickers,
+            "overlap_weight": float(row.overlap_weight),
+            "overlap_count": int(row.overlap_count),
+            "total_holdings": int(row.total_holdings),
         }
-
-    return dict(sorted(result.items(), key=lambda x: x[1]["overlap_weight"], reverse=True))
+        for row in df.itertuples(index=False)
+    }
 
 
 # ── CLI ────────────────────────────────────────────────────────────────────────
@@ -263,37 +365,32 @@ def main() -> None:
     targets = read_etf_symbols() if args.all else [s.upper() for s in args.etf]
     log.info(f"Targets ({len(targets)}): {targets}")
 
-    cache = _load_cache()
-    ok, failed = 0, []
+    results = refresh_etfs(targets)
+    failed = [sym for sym in targets if sym not in results]
 
     for sym in targets:
-        try:
-            entry = fetch_one(sym, cache)
-            cache[sym] = entry
-            _save_cache(cache)
-
-            n_holdings = len(entry.get("holdings", []))
-            info = entry.get("info", {})
-            aum = info.get("aum")
-            aum_str = f"${aum / 1e9:.1f}B" if aum else "N/A"
-            source = entry.get("holdings_source", "?")
-            category = info.get("category") or "—"
-            name = info.get("short_name") or info.get("long_name") or sym
-
-            print(
-                f"  {sym:<6}  {name:<35}  "
-                f"AUM {aum_str:<10}  "
-                f"Category: {category:<22}  "
-                f"Holdings: {n_holdings:>3}  "
-                f"[{source}]"
-            )
-            ok += 1
-        except Exception as e:
-            log.error(f"[{sym}] unexpected error: {e}")
-            failed.append(sym)
+        entry = results.get(sym)
+        if entry is None:
+            continue
+        n_holdings = len(entry.get("holdings", []))
+        info = entry.get("info", {})
+        aum = info.get("aum")
+        aum_str = f"${aum / 1e9:.1f}B" if aum else "N/A"
+        source = entry.get("holdings_source", "?")
+        category = info.get("category") or "—"
+        name = info.get("short_name") or info.get("long_name") or sym
+
+        print(
+            f"  {sym:<6}  {name:<35}  "
+            f"AUM {aum_str:<10}  "
+            f"Category: {category:<22}  "
+            f"Holdings: {n_holdings:>3}  "
+            f"[{source}]"
+        )
+    ok = len(results)
 
     print(f"\n{'─'*60}")
-    print(f"Fetched {ok}/{len(targets)} ETFs.  Cache: {HOLDINGS_PATH}")
+    print(f"Fetched {ok}/{len(targets)} ETFs.  Cache: {HOLDINGS_DIR}/")
     if failed:
         print(f"Failed: {failed}")
 
@@ -0,0 +1,341 @@
+"""
+event_study.py — Generic event-study engine for every signal type
+
+Takes any event table — one row per (ticker, timestamp, direction, label) —
+and measures what the stock did afterwards, raw and relative to the market:
+
+  r{h}d    forward return over h trading days (percent)
+  ar{h}d   abnormal return: r{h}d minus the benchmark's return over the
+           same window. The benchmark is SPY when the price store has it,
+           else an equal-weight index of every stock in the store.
+
+Forward returns for all tickers and horizons are precomputed once into a
+ReturnPanel (horizons × dates × tickers); a whole event table is resolved
+in one np.searchsorted batch, and summaries are a single groupby.
+
+Event sources (each a DataFrame with ticker, timestamp, direction, label):
+  news         — keyword events from the news event log (speech_backtest)
+  insider      — open-market insider buys (insider_clusters event table),
+                 labelled by role, dated by transaction date
+  convergence  — BUY / STRONG BUY / AVOID verdicts, appended to
+                 data/convergence_verdicts.jsonl each time scores are saved
+
+Classes:
+  ReturnPanel                            — precomputed forward-return array
+
+Functions:
+  event_returns(events, panel)           -> events + r{h}d / ar{h}d columns
+  summarize(returns, by="label")         -> per-group hit rates, means, t-stats
+  log_verdicts(scores)                   -> convergence verdicts appended
+  run_event_studies()                    -> payload saved to data/event_study_results.json
+  load_study_results()                   -> {source: [summary rows]}
+
+CLI:
+  python event_study.py --run
+  python event_study.py --show [--source insider]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRICE_CSV = Path("data/snp500_30day_wide.csv")
+RESULTS_PATH = Path("data/event_study_results.json")
+VERDICT_LOG_PATH = Path("data/convergence_verdicts.jsonl")
+CONVERGENCE_PATH = Path("data/convergence_scores.json")
+
+HORIZONS = (1, 2, 5, 10)   # trading days
+BENCHMARK = "SPY"
+MARKET = "__MARKET__"      # equal-weight stand-in when the price store has no SPY
+MIN_EVENTS = 3
+
+VERDICT_DIRECTION = {"STRONG BUY": "↑", "BUY": "↑", "AVOID": "↓"}
+
+log = logging.getLogger(__name__)
+
+
+# ── Prices ─────────────────────────────────────────────────────────────────────
+def load_prices() -> pd.DataFrame:
+    """Wide price CSV indexed by date, plus the benchmark column."""
+    if not PRICE_CSV.exists():
+        raise FileNotFoundError(f"{PRICE_CSV} not found — run update_snp500_history.py first.")
+    df = pd.read_csv(PRICE_CSV)
+    df["Date"] = pd.to_datetime(df["Date"], format="%m/%d/%y", errors="coerce")
+    return df.dropna(subset=["Date"]).set_index("Date").sort_index()
+
+
+def _benchmark_column(prices: pd.DataFrame) -> str:
+    """Name of the benchmark column, adding an equal-weight index when SPY is absent."""
+    if BENCHMARK in prices.columns:
+        return BENCHMARK
+    if MARKET not in prices.columns:
+        daily = prices.pct_change(fill_method=None).mean(axis=1, skipna=True).fillna(0.0)
+        prices[MARKET] = 100 * (1 + daily).cumprod()
+    return MARKET
+
+
+class ReturnPanel:
+    """
+    Forward returns for every ticker, precomputed once as a
+    (horizons × dates+1 × tickers) array in percent. Row i+1 holds the
+    returns of an event falling on or after dates[i] (and before the next
+    date); row 0 covers events before the first date.
+
+    Per ticker, missing prices are skipped: the base is the last valid
+    price on or before the event (else the first one after it) and the
+    h-day return uses the h-th valid price strictly after it.
+    """
+
+    def __init__(self, prices: pd.DataFrame, horizons: Tuple[int, ...] = HORIZONS):
+        self.horizons = horizons
+        self.dates = prices.index.values.astype("datetime64[ns]")
+        self.tickers = list(prices.columns)
+        self.ticker_index = {t: i for i, t in enumerate(self.tickers)}
+
+        values = prices.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        n_valid = valid.sum(axis=0)
+        # valid prices packed to the top of each column, in date order
+        packed = np.take_along_axis(values, np.argsort(~valid, axis=0, kind="stable"), axis=0)
+        packed = np.vstack([packed, np.full((max(horizons) + 1, values.shape[1]), np.nan)])
+        cols = np.arange(values.shape[1])
+
+        # k = number of valid prices on or before each row's date
+        k = np.vstack([np.zeros((1, values.shape[1]), dtype=np.int64), np.cumsum(valid, axis=0)])
+        base = packed[np.maximum(k - 1, 0), cols]
+        self.returns = np.full((len(horizons), len(k), values.shape[1]), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for j, h in enumerate(horizons):
+                ahead = packed[k + h - 1, cols]
+                ahead[k + h - 1 >= n_valid] = np.nan
+                self.returns[j] = np.round((ahead - base) / base * 100, 4)
+
+    def lookup(self, tickers: List[str], event_dates) -> np.ndarray:
+        """(horizons × events) forward returns; NaN where the ticker or future prices are missing."""
+        if not len(tickers):
+            return np.empty((len(self.horizons), 0))
+        cols = np.array([self.ticker_index.get(t, -1) for t in tickers])
+        rows = np.searchsorted(self.dates, np.asarray(event_dates, dtype="datetime64[ns]"), side="right")
+        out = self.returns[:, rows, np.maximum(cols, 0)]
+        out[:, cols < 0] = np.nan
+        return out
+
+
+# ── Engine ─────────────────────────────────────────────────────────────────────
+def event_returns(events: pd.DataFrame, panel: ReturnPanel, benchmark: str = BENCHMARK) -> pd.DataFrame:
+    """
+    Add r{h}d and ar{h}d columns to an event table (ticker, timestamp,
+    direction, label). Abnormal returns are left NaN if `benchmark` is not
+    a panel column.
+    """
+    out = events.reset_index(drop=True).copy()
+    tickers = out["ticker"].astype(str).str.upper().tolist()
+    stamps = pd.to_datetime(out["timestamp"]).to_numpy(dtype="datetime64[ns]")
+    raw = panel.lookup(tickers, stamps)
+    bench = (panel.lookup([benchmark] * len(out), stamps) if benchmark in panel.ticker_index
+             else np.full_like(raw, np.nan))
+    for j, h in enumerate(panel.horizons):
+        out[f"r{h}d"] = raw[j]
+        out[f"ar{h}d"] = np.round(raw[j] - bench[j], 4)
+    return out
+
+
+def summarize(returns: pd.DataFrame, by: str = "label", min_events: int = MIN_EVENTS,
+              horizons: Tuple[int, ...] = HORIZONS) -> List[Dict]:
+    """
+    Per-group statistics over events with a 5-day return:
+      sample_size, direction (dominant), hit_rate / hit_rate_abnormal
+      (direction right on the 5d raw / abnormal return), avg_return_{h}d,
+      avg_abnormal_{h}d, t_stat_abnormal_5d. Groups under `min_events` are
+      dropped; rows are sorted by hit_rate_abnormal, then hit_rate.
+    """
+    df = returns[returns["r5d"].notna()].copy()
+    if df.empty:
+        return []
+    sign = df["direction"].map({"↑": 1, "↓": -1}).fillna(0)
+    df["hit"] = (sign * df["r5d"] > 0).astype(float)
+    df["hit_abnormal"] = np.where(df["ar5d"].notna(), (sign * df["ar5d"] > 0).astype(float), np.nan)
+
+    agg = {"sample_size": ("r5d", "size"), "hit_rate": ("hit", "mean"),
+           "hit_rate_abnormal": ("hit_abnormal", "mean"),
+           "ar5d_std": ("ar5d", "std"), "ar5d_n": ("ar5d", "count")}
+    for h in horizons:
+        agg[f"avg_return_{h}d"] = (f"r{h}d", "mean")
+        agg[f"avg_abnormal_{h}d"] = (f"ar{h}d", "mean")
+    grouped = df.groupby(by).agg(**agg)
+    grouped["direction"] = df.groupby(by)["direction"].agg(lambda s: s.mode().iat[0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grouped["t_stat_abnormal_5d"] = grouped["avg_abnormal_5d"] / (grouped["ar5d_std"] / np.sqrt(grouped["ar5d_n"]))
+    grouped = grouped[grouped["sample_size"] >= min_events].drop(columns=["ar5d_std", "ar5d_n"])
+    grouped = grouped.sort_values(["hit_rate_abnormal", "hit_rate"], ascending=False).reset_index()
+
+    rows = json.loads(grouped.round(4).to_json(orient="records"))   # NaN / inf -> null
+    return rows
+
+
+# ── Event sources ──────────────────────────────────────────────────────────────
+_EVENT_COLUMNS = ["ticker", "timestamp", "direction", "label"]
+
+
+def news_events() -> pd.DataFrame:
+    """Keyword events (expanded to related tickers), labelled by keyword."""
+    from speech_backtest import _build_event_table
+
+    events = _build_event_table()
+    return pd.DataFrame(
+        [(e["ticker"], e["event_date"], e["direction"], e["keyword"].lower()) for e in events],
+        columns=_EVENT_COLUMNS,
+    )
+
+
+def insider_events() -> pd.DataFrame:
+    """Open-market buys from the insider event table, labelled by the buyer's role."""
+    from insider_clusters import ROLE_CSUITE, ROLE_DIRECTOR, load_event_table
+
+    table = load_event_table()
+    role_label = np.where(table.role == ROLE_CSUITE, "C-suite buy",
+                          np.where(table.role == ROLE_DIRECTOR, "Director buy", "Other insider buy"))
+    return pd.DataFrame({
+        "ticker": table.ticker, "timestamp": table.date.astype("datetime64[ns]"),
+        "direction": "↑", "label": role_label,
+    })
+
+
+def log_verdicts(scores: List[Dict], path: Path = VERDICT_LOG_PATH) -> int:
+    """
+    Append directional convergence verdicts (one per ticker per day) to the
+    verdict log. Returns the number of rows written.
+    """
+    seen = set()
+    if path.exists():
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                seen.add((row["ticker"], row["scored_at"][:10]))
+
+    new = []
+    for s in scores:
+        if s.get("verdict") not in VERDICT_DIRECTION or not s.get("ticker"):
+            continue
+        scored_at = s.get("scored_at") or datetime.utcnow().isoformat(timespec="seconds")
+        key = (s["ticker"], scored_at[:10])
+        if key in seen:
+            continue
+        seen.add(key)
+        new.append({"ticker": s["ticker"], "scored_at": scored_at, "verdict": s["verdict"],
+                    "convergence_score": s.get("convergence_score")})
+    if new:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            for row in new:
+                f.write(json.dumps(row) + "\n")
+        log.info(f"Logged {len(new)} convergence verdict(s) → {path}")
+    return len(new)
+
+
+def convergence_events() -> pd.DataFrame:
+    """Directional verdicts from the verdict log, labelled by verdict."""
+    if not VERDICT_LOG_PATH.exists() and CONVERGENCE_PATH.exists():
+        # first run: seed the log from the latest saved scores
+        log_verdicts(json.loads(CONVERGENCE_PATH.read_text(encoding="utf-8")).get("scores", []))
+    if not VERDICT_LOG_PATH.exists():
+        return pd.DataFrame(columns=_EVENT_COLUMNS)
+    df = pd.read_json(VERDICT_LOG_PATH, lines=True, dtype={"ticker": str, "scored_at": str})
+    return pd.DataFrame({
+        "ticker": df["ticker"],
+        "timestamp": pd.to_datetime(df["scored_at"]),
+        "direction": df["verdict"].map(VERDICT_DIRECTION),
+        "label": df["verdict"],
+    })
+
+
+SOURCES: Dict[str, Callable[[], pd.DataFrame]] = {
+    "news": news_events,
+    "insider": insider_events,
+    "convergence": convergence_events,
+}
+
+
+# ── Run / persist ──────────────────────────────────────────────────────────────
+def run_event_studies(sources: Optional[List[str]] = None) -> Dict:
+    """Run every source through one shared ReturnPanel and save the summaries."""
+    prices = load_prices()
+    benchmark = _benchmark_column(prices)
+    panel = ReturnPanel(prices)
+
+    results: Dict[str, List[Dict]] = {}
+    for name in sources or list(SOURCES):
+        try:
+            events = SOURCES[name]()
+        except Exception as e:
+            log.warning(f"[{name}] could not load events: {e}")
+            continue
+        rows = summarize(event_returns(events, panel, benchmark))
+        results[name] = rows
+        log.info(f"[{name}] {len(events)} events → {len(rows)} label(s) with ≥{MIN_EVENTS} scored events")
+
+    payload = {
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "benchmark": BENCHMARK if benchmark == BENCHMARK else "equal-weight S&P 500",
+        "horizons": list(HORIZONS),
+        "sources": results,
+    }
+    RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    RESULTS_PATH.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    log.info(f"Saved event-study results → {RESULTS_PATH}")
+    return payload
+
+
+def load_study_results() -> Dict[str, List[Dict]]:
+    if not RESULTS_PATH.exists():
+        return {}
+    try:
+        return json.loads(RESULTS_PATH.read_text(encoding="utf-8")).get("sources", {})
+    except Exception:
+        return {}
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="Event study over news, insider and convergence signals.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--run", action="store_true", help="Recompute and save all event studies")
+    group.add_argument("--show", action="store_true", help="Print saved results")
+    parser.add_argument("--source", choices=list(SOURCES), help="Limit to one signal source")
+    args = parser.parse_args()
+
+    if args.run:
+        results = run_event_studies([args.source] if args.source else None)["sources"]
+    else:
+        results = load_study_results()
+        if args.source:
+            results = {args.source: results.get(args.source, [])}
+
+    for name, rows in results.items():
+        print(f"\n  {name.upper()}  ({len(rows)} labels)")
+        print(f"  {'Label':<22} {'N':>5} {'Dir':>3} {'Hit':>7} {'Hit vs mkt':>10} {'Avg5d%':>8} {'Abn5d%':>8} {'t':>6}")
+        print("  " + "─" * 76)
+        for r in rows[:20]:
+            def _f(v, fmt):
+                return format(v, fmt) if v is not None else "N/A"
+            print(f"  {r['label'][:22]:<22} {r['sample_size']:>5} {r['direction']:>3} "
+                  f"{_f(r['hit_rate'], '>7.1%')} {_f(r['hit_rate_abnormal'], '>10.1%')} "
+                  f"{_f(r['avg_return_5d'], '>8.2f')} {_f(r['avg_abnormal_5d'], '>8.2f')} "
+                  f"{_f(r['t_stat_abnormal_5d'], '>6.2f')}")
+
+
+if __name__ == "__main__":
+    main()
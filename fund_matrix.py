@@ -0,0 +1,205 @@
+"""
+fund_matrix.py — Sparse fund × security holdings matrix
+
+Stacks the latest cached 13F of every registry fund into one CSR matrix
+(rows = funds, columns = securities by CUSIP, values = portfolio weight), so
+cross-fund questions are sparse matrix–vector products instead of loops over
+per-fund DataFrames:
+
+  most widely held names         — column sums of the holder indicator / weights
+  funds holding a ticker         — one column of the CSC copy
+  overlap of each fund with a portfolio — W @ p, (W > 0) @ (p > 0), W @ 1[p > 0]
+
+Holdings come from the per-accession 13F store (thirteenf_store.py). Funds
+with nothing cached there fall back to their top positions in
+data/hedge_fund_holdings.json.
+
+Classes:
+  HoldingsMatrix                              — CSR/CSC matrix + fund and security labels
+
+Functions:
+  build_holdings_matrix(funds=None)           -> HoldingsMatrix
+  parse_portfolio(["NVDA:40", "AAPL"])        -> {ticker: weight}
+
+CLI:
+  python fund_matrix.py [--top 20] [--ticker NVDA] [--portfolio NVDA:40 AAPL:30 MSFT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from hedge_fund_mirror import FUNDS, _load_cache
+from thirteenf_store import list_quarters, load_holdings
+
+log = logging.getLogger(__name__)
+
+
+# ── Matrix ─────────────────────────────────────────────────────────────────────
+class HoldingsMatrix:
+    """
+    weights[f, s] = fraction of fund f's reported equity book in security s.
+    `funds` and `securities` label the rows and columns; `by_ticker` maps a
+    ticker to its column(s) (share classes can share one).
+    """
+
+    def __init__(self, weights: sparse.csr_matrix, funds: List[str], securities: pd.DataFrame):
+        self.weights = weights
+        self.holds = (weights > 0).astype(np.float64).tocsr()
+        self._by_security = weights.tocsc()
+        self.funds = funds
+        self.securities = securities.reset_index(drop=True)   # cusip, ticker, issuer
+        self.by_ticker: Dict[str, np.ndarray] = {
+            t: idx.to_numpy()
+            for t, idx in self.securities.groupby("ticker").groups.items()
+            if t
+        }
+
+    @property
+    def shape(self):
+        return self.weights.shape
+
+    def _portfolio_vector(self, portfolio: Dict[str, float]) -> np.ndarray:
+        """Dense security vector of normalised portfolio weights (unknown tickers dropped)."""
+        vec = np.zeros(self.shape[1])
+        for ticker, w in portfolio.items():
+            cols = self.by_ticker.get(ticker.upper())
+            if cols is not None:
+                vec[cols] = w / len(cols)
+        total = vec.sum()
+        return vec / total if total else vec
+
+    def most_widely_held(self, top: int = 20) -> pd.DataFrame:
+        """Securities by number of holders, then by summed weight across funds."""
+        holders = np.asarray(self.holds.sum(axis=0)).ravel()
+        total_weight = np.asarray(self.weights.sum(axis=0)).ravel()
+        df = self.securities.assign(
+            n_funds=holders.astype(int),
+            avg_weight_pct=np.where(holders > 0, total_weight / np.maximum(holders, 1) * 100, 0.0).round(3),
+        )
+        return df.sort_values(["n_funds", "avg_weight_pct"], ascending=False).head(top).reset_index(drop=True)
+
+    def funds_holding(self, ticker: str) -> pd.DataFrame:
+        """Funds with a position in `ticker`, largest weight first."""
+        cols = self.by_ticker.get(ticker.upper())
+        if cols is None:
+            return pd.DataFrame(columns=["fund", "weight_pct"])
+        col = np.asarray(self._by_security[:, cols].sum(axis=1)).ravel()
+        rows = np.flatnonzero(col)
+        df = pd.DataFrame({"fund": [self.funds[i] for i in rows], "weight_pct": (col[rows] * 100).round(3)})
+        return df.sort_values("weight_pct", ascending=False, ignore_index=True)
+
+    def portfolio_overlap(self, portfolio: Dict[str, float]) -> pd.DataFrame:
+        """
+        Per fund, against a {ticker: weight} portfolio:
+          shared_names      — securities both hold
+          fund_pct_in_yours — % of the fund's book in your names
+          cosine            — weight-vector cosine similarity
+        """
+        p = self._portfolio_vector(portfolio)
+        held = (p > 0).astype(np.float64)
+        shared = self.holds @ held
+        in_yours = self.weights @ held
+        dot = self.weights @ p
+        norms = np.sqrt(np.asarray(self.weights.multiply(self.weights).sum(axis=1)).ravel())
+        p_norm = np.linalg.norm(p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cosine = np.where(norms * p_norm > 0, dot / (norms * p_norm), 0.0)
+        df = pd.DataFrame({
+            "fund": self.funds,
+            "shared_names": shared.astype(int),
+            "fund_pct_in_yours": (in_yours * 100).round(2),
+            "cosine": cosine.round(4),
+        })
+        return df.sort_values(["cosine", "shared_names"], ascending=False, ignore_index=True)
+
+
+# ── Build ──────────────────────────────────────────────────────────────────────
+def _latest_holdings(name: str, cik: str, json_cache: dict) -> Optional[pd.DataFrame]:
+    quarters = list_quarters(cik)
+    if quarters:
+        df = load_holdings(cik, quarters[0]["accession"])
+        return df[["cusip", "ticker", "issuer", "value"]]
+    entry = json_cache.get(name)
+    if not entry or not entry.get("holdings"):
+        return None
+    df = pd.DataFrame(entry["holdings"])
+    if "cusip" not in df.columns:   # entries written before the 13F store
+        df["cusip"] = df["ticker"].where(df["ticker"] != "", df["issuer"])
+    return df.rename(columns={"market_value": "value"})[["cusip", "ticker", "issuer", "value"]]
+
+
+def build_holdings_matrix(funds: Optional[Dict[str, str]] = None) -> HoldingsMatrix:
+    """Assemble the matrix from the latest cached holdings of each fund."""
+    funds = funds or FUNDS
+    json_cache = _load_cache()
+
+    frames = []
+    names: List[str] = []
+    for name, cik in funds.items():
+        df = _latest_holdings(name, cik, json_cache)
+        if df is None or df.empty or df["value"].sum() <= 0:
+            continue
+        frames.append(df.assign(row=len(names), weight=df["value"] / df["value"].sum()))
+        names.append(name)
+
+    if not frames:
+        return HoldingsMatrix(sparse.csr_matrix((0, 0)), [], pd.DataFrame(columns=["cusip", "ticker", "issuer"]))
+
+    long = pd.concat(frames, ignore_index=True)
+    long["ticker"] = long["ticker"].fillna("").astype(str).str.upper()
+    codes, cusips = pd.factorize(long["cusip"])
+    securities = (
+        long.assign(col=codes)
+        .sort_values("ticker", ascending=False)      # prefer a row that knows the ticker
+        .drop_duplicates("col")
+        .sort_values("col")[["cusip", "ticker", "issuer"]]
+    )
+    weights = sparse.csr_matrix(
+        (long["weight"].to_numpy(), (long["row"].to_numpy(), codes)),
+        shape=(len(names), len(cusips)),
+    )
+    weights.sum_duplicates()
+    log.info(f"Holdings matrix: {len(names)} funds × {len(cusips)} securities, {weights.nnz} positions")
+    return HoldingsMatrix(weights, names, securities)
+
+
+def parse_portfolio(items: List[str]) -> Dict[str, float]:
+    """["NVDA:40", "AAPL"] -> {"NVDA": 40.0, "AAPL": 1.0}; malformed weights are skipped."""
+    out: Dict[str, float] = {}
+    for item in items:
+        ticker, _, weight = item.partition(":")
+        try:
+            out[ticker.strip().upper()] = float(weight) if weight else 1.0
+        except ValueError:
+            continue
+    return out
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cross-fund consensus queries over cached 13F holdings.")
+    parser.add_argument("--top", type=int, default=20, help="Most widely held names to show")
+    parser.add_argument("--ticker", help="List funds holding this ticker")
+    parser.add_argument("--portfolio", nargs="+", metavar="TICKER[:WEIGHT]", help="Overlap of each fund with these holdings")
+    args = parser.parse_args()
+
+    m = build_holdings_matrix()
+    print(f"\n  {m.shape[0]} funds × {m.shape[1]} securities\n")
+    print(m.most_widely_held(args.top).to_string(index=False))
+    if args.ticker:
+        print(f"\n  Funds holding {args.ticker.upper()}\n")
+        print(m.funds_holding(args.ticker).to_string(index=False))
+    if args.portfolio:
+        print("\n  Fund overlap with portfolio\n")
+        print(m.portfolio_overlap(parse_portfolio(args.portfolio)).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 """
 hedge_fund_mirror.py — 13F Hedge Fund Holdings Mirror
 
-Fetches latest 13F filings for major hedge funds via edgartools.
+Fetches latest 13F filings for institutional managers via edgartools.
 
-Funds tracked:
-  Berkshire Hathaway  CIK 0001067983
-  Bridgewater         CIK 0001350694
-  Duquesne            CIK 0001536411
+Funds tracked are listed in data/fund_registry.csv (name, cik) — add rows to
+follow more filers. A refresh first reads EDGAR's daily form indexes since
+the last run and only fetches funds that filed a new 13F-HR (or have never
+been fetched), runs those concurrently under the shared SEC rate limit, and
+writes the cache once at the end.
+
+Every parsed information table is cached by accession number under
+data/13f/ (thirteenf_store.py); each fund entry also carries the largest
+position changes against the prior quarter.
 
 Output: data/hedge_fund_holdings.json
 Function: get_fund_holdings(fund_name) -> pd.DataFrame
@@ -14,21 +19,30 @@ Function: get_fund_holdings(fund_name) -> pd.DataFrame
 
 from __future__ import annotations
 
+import csv
 import json
 import logging
-import time
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set
 
 import pandas as pd
 import edgar
 
+from edgar_daily_index import iter_form_index
+from rate_limit import SEC_BUCKET, RequestScheduler
+from thirteenf_store import diff_holdings, store_filing
+
 HOLDINGS_PATH = Path("data/hedge_fund_holdings.json")
+FUND_REGISTRY_CSV = Path("data/fund_registry.csv")
+REFRESH_STATE_PATH = Path("data/13f/refresh_state.json")
 CACHE_TTL_HOURS = 24
+TOP_CHANGES = 20            # largest quarter-over-quarter moves kept per fund
+FETCH_WORKERS = 6           # funds in flight; the SEC token bucket caps the rate
 EDGAR_IDENTITY = "SmartPortfolioBot research@smartportfoliobot.com"
+FORMS_13F = ("13F-HR", "13F-HR/A")
 
-FUNDS = {
+_DEFAULT_FUNDS = {
     "Berkshire Hathaway": "0001067983",
     "Bridgewater":        "0001350694",
     "Duquesne":           "0001536411",
@@ -42,6 +56,24 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
+# ── Fund registry ──────────────────────────────────────────────────────────────
+def load_fund_registry(path: Path = FUND_REGISTRY_CSV) -> Dict[str, str]:
+    """Fund name -> zero-padded CIK, in registry order."""
+    if not path.exists():
+        return dict(_DEFAULT_FUNDS)
+    funds: Dict[str, str] = {}
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("name") or "").strip()
+            cik = (row.get("cik") or "").strip()
+            if name and cik.isdigit():
+                funds[name] = cik.zfill(10)
+    return funds
+
+
+FUNDS = load_fund_registry()
+
+
 # ── Cache ──────────────────────────────────────────────────────────────────────
 def _load_cache() -> dict:
     if HOLDINGS_PATH.exists():
@@ -70,45 +102,52 @@ def _is_stale(entry: dict) -> bool:
 
 
 # ── Fetch one fund ─────────────────────────────────────────────────────────────
-def _fetch_fund(fund_name: str, cik: str) -> dict:
+def _fetch_fund(fund_name: str, cik: str, scheduler: Optional[RequestScheduler] = None) -> dict:
+    if scheduler is None:
+        scheduler = RequestScheduler(SEC_BUCKET, name="13f")
     edgar.set_identity(EDGAR_IDENTITY)
-    entity = edgar.get_entity(cik)
-    filings = entity.get_filings(form="13F-HR")
+    entity = scheduler.call(edgar.get_entity, cik)
+    filings = scheduler.call(entity.get_filings, form="13F-HR")
 
     if not filings or len(filings) == 0:
         raise RuntimeError(f"No 13F-HR filings found for {fund_name}")
 
+    # Parsed information tables are cached per accession (thirteenf_store),
+    # so each quarter is downloaded once; keep the prior quarter for the diff.
     latest = filings[0]
-    obj = latest.obj()
-    holdings_df: pd.DataFrame = obj.holdings.copy()
-
-    # Normalise columns
-    holdings_df.columns = [c.strip() for c in holdings_df.columns]
+    holdings_df = store_filing(cik, latest, scheduler)
+    changes: list = []
+    if len(filings) > 1:
+        prev_df = store_filing(cik, filings[1], scheduler)
+        diff = diff_holdings(prev_df, holdings_df)
+        changes = json.loads(diff[diff["status"] != "unchanged"].head(TOP_CHANGES).to_json(orient="records"))
 
     # Add % of portfolio by market value
-    total_value = holdings_df["Value"].sum()
-    holdings_df["pct_portfolio"] = (
-        (holdings_df["Value"] / total_value * 100).round(4) if total_value else 0.0
+    total_value = holdings_df["value"].sum()
+    holdings_df = holdings_df.assign(
+        pct_portfolio=(holdings_df["value"] / total_value * 100).round(4) if total_value else 0.0
     )
-    holdings_df = holdings_df.sort_values("Value", ascending=False).reset_index(drop=True)
-    holdings_df = holdings_df.head(50)  # top 50 positions
+    holdings_df = holdings_df.head(50)  # top 50 positions (already sorted by value)
 
     # Serialise
     records = []
     for _, row in holdings_df.iterrows():
         records.append({
-            "ticker":        str(row.get("Ticker", "") or ""),
-            "issuer":        str(row.get("Issuer", "") or ""),
-            "shares":        int(row.get("SharesPrnAmount", 0) or 0),
-            "market_value":  int(row.get("Value", 0) or 0),
-            "pct_portfolio": float(row.get("pct_portfolio", 0.0)),
+            "ticker":        row["ticker"],
+            "issuer":        row["issuer"],
+            "cusip":         row["cusip"],
+            "shares":        int(row["shares"]),
+            "market_value":  int(row["value"]),
+            "pct_portfolio": float(row["pct_portfolio"]),
         })
 
     return {
         "fund_name":    fund_name,
         "cik":          cik,
         "filing_date":  str(latest.filing_date),
+        "accession":    str(latest.accession_no),
         "holdings":     records,
+        "changes":      changes,
         "_fetched_at":  datetime.utcnow().isoformat(timespec="seconds"),
     }
 
@@ -135,18 +174,71 @@ def get_fund_holdings(fund_name: str) -> pd.DataFrame:
     return pd.DataFrame(entry["holdings"])
 
 
-def fetch_all_funds() -> None:
-    """Refresh all funds and save to cache."""
+def _load_refresh_watermark() -> Optional[date]:
+    try:
+        return date.fromisoformat(json.loads(REFRESH_STATE_PATH.read_text(encoding="utf-8"))["index_watermark"])
+    except Exception:
+        return None
+
+
+def _save_refresh_watermark(day: date) -> None:
+    REFRESH_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REFRESH_STATE_PATH.write_text(json.dumps({"index_watermark": day.isoformat()}), encoding="utf-8")
+
+
+def _ciks_with_new_13f(since: date, scheduler: RequestScheduler) -> Set[int]:
+    """CIKs with a 13F-HR in the daily form indexes from `since` (inclusive) to today."""
+    filers: Set[int] = set()
+    day = since
+    while day <= date.today():
+        if day.weekday() < 5:
+            filers.update(row["cik"] for row in iter_form_index(day, FORMS_13F, scheduler=scheduler))
+        day += timedelta(days=1)
+    return filers
+
+
+def _funds_due(cache: dict, scheduler: RequestScheduler, force: bool = False) -> List[str]:
+    """
+    Funds to fetch: never fetched, or with a new 13F-HR in the daily indexes
+    since the last refresh. Without a watermark every fund is due.
+    """
+    if force:
+        return list(FUNDS)
+    never = [n for n in FUNDS if "accession" not in cache.get(n, {})]
+    watermark = _load_refresh_watermark()
+    if watermark is None:
+        return list(FUNDS)
+    filers = _ciks_with_new_13f(watermark, scheduler)
+    return never + [n for n in FUNDS if n not in never and int(FUNDS[n]) in filers]
+
+
+def fetch_all_funds(force: bool = False) -> None:
+    """
+    Refresh registry funds with a new 13F-HR since the last run, concurrently
+    under the shared SEC rate limit, then write the cache once.
+    """
     cache = _load_cache()
-    for name, cik in FUNDS.items():
-        try:
-            entry = _fetch_fund(name, cik)
-            cache[name] = entry
-            _save_cache(cache)
-            log.info(f"[{name}] ✅ {len(entry['holdings'])} positions, filed {entry['filing_date']}")
-        except Exception as e:
-            log.error(f"[{name}] ❌ {e}")
-        time.sleep(1.0)
+    scheduler = RequestScheduler(SEC_BUCKET, workers=FETCH_WORKERS, name="13f")
+    today = date.today()
+
+    due = _funds_due(cache, scheduler, force)
+    log.info(f"{len(due)} of {len(FUNDS)} fund(s) have a new 13F-HR to fetch")
+
+    updated = failed = 0
+    for name, entry, err in scheduler.map(lambda n: _fetch_fund(n, FUNDS[n], scheduler), due):
+        if err is not None:
+            failed += 1
+            log.error(f"[{name}] ❌ {err}")
+            continue
+        cache[name] = entry
+        updated += 1
+        log.info(f"[{name}] ✅ {len(entry['holdings'])} positions, filed {entry['filing_date']}")
+
+    if updated:
+        _save_cache(cache)
+    if not failed:   # otherwise re-scan the same days next run so failed funds are retried
+        _save_refresh_watermark(today)
+    scheduler.log_stats()
 
 
 # ── CLI ────────────────────────────────────────────────────────────────────────
@@ -154,12 +246,13 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Fetch 13F hedge fund holdings.")
     parser.add_argument("--fund", choices=list(FUNDS), help="Single fund name")
-    parser.add_argument("--all", action="store_true", help="Fetch all funds")
+    parser.add_argument("--all", action="store_true", help="Refresh registry funds with a new 13F-HR")
+    parser.add_argument("--force", action="store_true", help="With --all: refetch every fund")
     parser.add_argument("--top", type=int, default=10, help="Top N positions to display")
     args = parser.parse_args()
 
     if args.all or not args.fund:
-        fetch_all_funds()
+        fetch_all_funds(force=args.force)
         funds_to_show = list(FUNDS)
     else:
         get_fund_holdings(args.fund)
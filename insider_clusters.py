@@ -0,0 +1,261 @@
+"""
+insider_clusters.py — Cluster-buy detector over the insider event table
+
+insider_tracker judges each Form 4 on its own and keeps only a rolling
+lookback. This module keeps every P-buy ever seen in a columnar event table
+(data/insider_events.npz) sorted by (ticker, date), with a ticker → row-range
+index, and flags cluster buys: at least `min_insiders` distinct insiders
+buying the same ticker within `window_days`.
+
+Detection is a sorted-array sweep, not a pairwise comparison. Rows are
+keyed by ticker-code × day, so one np.searchsorted gives every row's window
+end without crossing tickers; only windows holding at least `min_insiders`
+rows are checked for distinct insiders, and overlapping qualifying windows
+are merged into one cluster. Cost is O(n log n) in the table size, so it
+stays fast with the whole universe over several years.
+
+Table columns:
+  ticker, insider, role (0 other / 1 director / 2 C-suite), date, value, shares
+
+Classes:
+  InsiderEventTable                         — sorted columnar table + ticker index
+
+Functions:
+  load_event_table()                        -> InsiderEventTable
+  update_event_table(signals)               -> rows added to data/insider_events.npz
+  detect_clusters(table, window_days, min_insiders) -> cluster dicts, latest first
+
+CLI:
+  python insider_clusters.py --update
+  python insider_clusters.py [--window 30] [--min-insiders 3] [--since 2026-01-01]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from insider_tracker import SIGNALS_PATH, _is_csuite, _is_director
+
+EVENTS_PATH = Path("data/insider_events.npz")
+CLUSTER_WINDOW_DAYS = 30
+CLUSTER_MIN_INSIDERS = 3
+
+ROLE_OTHER, ROLE_DIRECTOR, ROLE_CSUITE = 0, 1, 2
+
+log = logging.getLogger(__name__)
+
+
+def _role_code(position: str) -> int:
+    if _is_csuite(position):
+        return ROLE_CSUITE
+    if _is_director(position):
+        return ROLE_DIRECTOR
+    return ROLE_OTHER
+
+
+# ── Event table ────────────────────────────────────────────────────────────────
+class InsiderEventTable:
+    """
+    Columnar P-buy events sorted by (ticker, date, insider). `index` maps a
+    ticker to its (start, stop) row range, so per-ticker reads are slices.
+    """
+
+    COLUMNS = ("ticker", "insider", "role", "date", "value", "shares")
+
+    def __init__(self, ticker, insider, role, dates, value, shares):
+        order = np.lexsort((insider, dates, ticker))
+        self.ticker = np.asarray(ticker, dtype=str)[order]
+        self.insider = np.asarray(insider, dtype=str)[order]
+        self.role = np.asarray(role, dtype=np.int8)[order]
+        self.date = np.asarray(dates, dtype="datetime64[D]")[order]
+        self.value = np.asarray(value, dtype=np.float64)[order]
+        self.shares = np.asarray(shares, dtype=np.float64)[order]
+
+        self.tickers, starts = np.unique(self.ticker, return_index=True)
+        stops = np.append(starts[1:], len(self.ticker))
+        self.index: Dict[str, Tuple[int, int]] = {
+            t: (int(a), int(b)) for t, a, b in zip(self.tickers, starts, stops)
+        }
+        # Row → position in self.tickers, for the sweep's composite key
+        self._ticker_code = np.repeat(np.arange(len(self.tickers)), stops - starts)
+
+    def __len__(self) -> int:
+        return len(self.ticker)
+
+    @classmethod
+    def empty(cls) -> "InsiderEventTable":
+        return cls([], [], [], np.array([], dtype="datetime64[D]"), [], [])
+
+    @classmethod
+    def from_signals(cls, signals: Iterable[Dict]) -> "InsiderEventTable":
+        rows = [
+            (
+                s["ticker"],
+                s["insider_name"],
+                _role_code(s.get("insider_role") or ""),
+                (s.get("transaction_date") or s["filing_date"])[:10],
+                float(s.get("total_value") or 0),
+                float(s.get("shares_bought") or 0),
+            )
+            for s in signals
+        ]
+        if not rows:
+            return cls.empty()
+        ticker, insider, role, dates, value, shares = zip(*rows)
+        return cls(ticker, insider, role, np.array(dates, dtype="datetime64[D]"), value, shares)
+
+    def rows(self, ticker: str) -> slice:
+        start, stop = self.index.get(ticker, (0, 0))
+        return slice(start, stop)
+
+    def merge(self, other: "InsiderEventTable") -> "InsiderEventTable":
+        """Union of two tables; identical (ticker, insider, date, value) rows are kept once."""
+        cols = [np.concatenate([getattr(self, c), getattr(other, c)]) for c in self.COLUMNS]
+        ticker, insider, role, dates, value, shares = cols
+        key = np.rec.fromarrays([ticker, insider, dates.astype(np.int64), value])
+        _, keep = np.unique(key, return_index=True)
+        return InsiderEventTable(*(c[keep] for c in cols))
+
+    def save(self, path: Path = EVENTS_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, **{c: getattr(self, c) for c in self.COLUMNS})
+
+
+def load_event_table(path: Path = EVENTS_PATH) -> InsiderEventTable:
+    if not path.exists():
+        return InsiderEventTable.empty()
+    with np.load(path, allow_pickle=False) as data:
+        return InsiderEventTable(*(data[c] for c in InsiderEventTable.COLUMNS))
+
+
+def update_event_table(signals: Iterable[Dict], path: Path = EVENTS_PATH) -> int:
+    """Fold signals into the persistent table. Returns the number of new rows."""
+    table = load_event_table(path)
+    merged = table.merge(InsiderEventTable.from_signals(signals))
+    added = len(merged) - len(table)
+    merged.save(path)
+    log.info(f"Insider event table: {len(merged)} rows ({added} new) → {path}")
+    return added
+
+
+# ── Cluster detection ──────────────────────────────────────────────────────────
+def detect_clusters(
+    table: InsiderEventTable,
+    window_days: int = CLUSTER_WINDOW_DAYS,
+    min_insiders: int = CLUSTER_MIN_INSIDERS,
+    since: Optional[date] = None,
+) -> List[Dict]:
+    """
+    Find runs where >= min_insiders distinct insiders bought one ticker within
+    window_days of each other. Overlapping windows merge into one cluster:
+      {ticker, start_date, end_date, n_insiders, insiders, n_csuite,
+       n_directors, n_buys, total_value}
+    Sorted by end_date, latest first.
+    """
+    n = len(table)
+    if n == 0:
+        return []
+
+    # Composite key keeps each ticker's days contiguous and ordered, so a
+    # single searchsorted finds every window end without leaving the ticker.
+    days = table.date.astype(np.int64)
+    span = int(days.max() - days.min()) + window_days + 1
+    key = table._ticker_code.astype(np.int64) * span + (days - days.min())
+    ends = np.searchsorted(key, key + window_days, side="right")
+
+    # prev[k] = row of the same insider's previous buy in the same ticker
+    # (-1 if none). A window [i, j) then holds as many distinct insiders as
+    # it has rows with prev < i — no string comparisons inside the sweep.
+    by_insider = np.lexsort((days, table.insider, table._ticker_code))
+    same = np.zeros(n, dtype=bool)
+    same[1:] = (table._ticker_code[by_insider[1:]] == table._ticker_code[by_insider[:-1]]) & (
+        table.insider[by_insider[1:]] == table.insider[by_insider[:-1]]
+    )
+    prev = np.full(n, -1, dtype=np.int64)
+    prev[by_insider[1:][same[1:]]] = by_insider[:-1][same[1:]]
+
+    # Rows in a window bound the distinct insiders from above — only
+    # windows that could qualify get the exact count.
+    candidates = np.flatnonzero(ends - np.arange(n) >= min_insiders)
+    if since is not None:
+        candidates = candidates[table.date[candidates] >= np.datetime64(since, "D")]
+
+    qualifying: List[Tuple[int, int]] = []
+    for i in candidates:
+        j = ends[i]
+        if np.count_nonzero(prev[i:j] < i) >= min_insiders:
+            qualifying.append((int(i), int(j)))
+
+    clusters: List[Dict] = []
+    start = stop = -1
+    for i, j in qualifying:
+        if i < stop and table._ticker_code[i] == table._ticker_code[start]:
+            stop = max(stop, j)
+            continue
+        if start >= 0:
+            clusters.append(_cluster_summary(table, start, stop))
+        start, stop = i, j
+    if start >= 0:
+        clusters.append(_cluster_summary(table, start, stop))
+
+    clusters.sort(key=lambda c: (c["end_date"], c["n_insiders"]), reverse=True)
+    return clusters
+
+
+def _cluster_summary(table: InsiderEventTable, start: int, stop: int) -> Dict:
+    insiders, first = np.unique(table.insider[start:stop], return_index=True)
+    roles = table.role[start:stop][first]
+    return {
+        "ticker": str(table.ticker[start]),
+        "start_date": str(table.date[start]),
+        "end_date": str(table.date[stop - 1]),
+        "n_insiders": int(len(insiders)),
+        "insiders": [str(x) for x in insiders],
+        "n_csuite": int((roles == ROLE_CSUITE).sum()),
+        "n_directors": int((roles == ROLE_DIRECTOR).sum()),
+        "n_buys": int(stop - start),
+        "total_value": round(float(table.value[start:stop].sum()), 2),
+    }
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="Detect insider cluster buys.")
+    parser.add_argument("--update", action="store_true",
+                        help=f"Fold {SIGNALS_PATH} into {EVENTS_PATH} before detecting")
+    parser.add_argument("--window", type=int, default=CLUSTER_WINDOW_DAYS,
+                        help=f"Cluster window in days (default: {CLUSTER_WINDOW_DAYS})")
+    parser.add_argument("--min-insiders", type=int, default=CLUSTER_MIN_INSIDERS,
+                        help=f"Distinct insiders needed (default: {CLUSTER_MIN_INSIDERS})")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="Only clusters starting on or after this date")
+    args = parser.parse_args()
+
+    if args.update:
+        data = json.loads(SIGNALS_PATH.read_text(encoding="utf-8")) if SIGNALS_PATH.exists() else {}
+        update_event_table(data.get("signals", []))
+
+    table = load_event_table()
+    clusters = detect_clusters(table, args.window, args.min_insiders, args.since)
+
+    print(f"\n  Insider cluster buys  |  {len(clusters)} cluster(s) in {len(table)} events "
+          f"({len(table.tickers)} tickers), ≥{args.min_insiders} insiders / {args.window}d\n")
+    for c in clusters:
+        print(
+            f"  {c['ticker']:<6} {c['start_date']} → {c['end_date']}  "
+            f"{c['n_insiders']} insiders ({c['n_csuite']} C-suite, {c['n_directors']} dir)  "
+            f"{c['n_buys']} buys  ${c['total_value']:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,30 +9,56 @@ Signal classification:
   MEDIUM — C-suite buy > $100k  OR  Director buy > $500k
   LOW    — any other open market purchase
 
+Parsed filings are cached by accession number in data/form4_cache.json, so
+each Form 4 is downloaded once no matter how often the lookback is re-scanned.
+Companies and documents are fetched concurrently under the shared SEC token
+bucket (rate_limit.py), which keeps the aggregate below 10 requests/second.
+
+Bulk mode reads EDGAR's daily form index instead of querying per company,
+keeps the Form 4s whose issuer CIK is in data/snp500.csv and downloads only
+those documents, so the whole universe costs about as much as a handful of
+per-company lookups. Both modes merge into one rolling table in
+data/insider_signals.json and drop entries filed before the lookback.
+The table also stores watermarks (the date each ticker — and bulk mode — was
+last scanned through), so a run only asks EDGAR for filings since then.
+
 Output functions:
   get_insider_signals(tickers)        -> all P-buy signals
+  get_insider_signals_bulk()          -> P-buy signals for the whole universe
   get_high_conviction_buys(tickers)   -> HIGH signals only
 
 CLI:
   python insider_tracker.py --tickers NVDA AAPL MSFT DELL MU JPM
+  python insider_tracker.py --bulk [--bulk-days N] [--archive-root ./edgar_mirror]
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
+import io
 import json
 import logging
-import time
+import re
+import xml.etree.ElementTree as ET
+from collections import defaultdict
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import edgar
 
+from edgar_daily_index import iter_form_index, read_archive
+from rate_limit import SEC_BUCKET, RequestScheduler
+
 # ── Config ─────────────────────────────────────────────────────────────────────
 SIGNALS_PATH = Path("data/insider_signals.json")
+FORM4_CACHE_PATH = Path("data/form4_cache.json")
+UNIVERSE_CSV = Path("data/snp500.csv")
 LOOKBACK_DAYS = 90          # how far back to scan Form 4 filings
-REQUEST_DELAY = 0.5         # seconds between EDGAR requests
+FORM4_CACHE_DAYS = 365      # parsed filings older than this are dropped from the cache
+FORM4_MAX_ATTEMPTS = 3      # failed fetches of one filing before it stops holding watermarks back
+FETCH_WORKERS = 6           # companies / documents in flight; the SEC token bucket caps the rate
 EDGAR_IDENTITY = "SmartPortfolioBot research@smartportfoliobot.com"
 
 _CSUITE_KEYWORDS = {"ceo", "cfo", "coo", "president", "chief executive",
@@ -72,115 +98,426 @@ def _classify_signal(position: str, total_value: float) -> str:
     return "LOW"
 
 
+# ── Form 4 cache ───────────────────────────────────────────────────────────────
+# Parsed P-buy summaries keyed by accession number. A filing with no
+# open-market purchase is stored as {"no_p": True} so it is never re-downloaded.
+def _load_form4_cache() -> Dict[str, Dict]:
+    if FORM4_CACHE_PATH.exists():
+        try:
+            return json.loads(FORM4_CACHE_PATH.read_text(encoding="utf-8"))
+        except Exception as e:
+            log.warning(f"Form 4 cache read error ({e}) — starting fresh.")
+    return {}
+
+
+def _needs_fetch(entry: Optional[Dict]) -> bool:
+    """Not cached yet, or a failure marker with retries left."""
+    return entry is None or entry.get("failed", FORM4_MAX_ATTEMPTS) < FORM4_MAX_ATTEMPTS
+
+
+def _record_failure(cache: Dict[str, Dict], accession: str, filing_date: str) -> bool:
+    """
+    Count a failed fetch in the cache ({"failed": n, "filing_date"}, pruned
+    like any entry). True while the filing should still be retried; after
+    FORM4_MAX_ATTEMPTS it is given up on so it no longer pins a watermark.
+    """
+    attempts = (cache.get(accession) or {}).get("failed", 0) + 1
+    cache[accession] = {"failed": attempts, "filing_date": filing_date}
+    return attempts < FORM4_MAX_ATTEMPTS
+
+
+def _save_form4_cache(cache: Dict[str, Dict]) -> None:
+    cutoff = (date.today() - timedelta(days=FORM4_CACHE_DAYS)).isoformat()
+    kept = {acc: entry for acc, entry in cache.items() if entry.get("filing_date", "") >= cutoff}
+    FORM4_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    FORM4_CACHE_PATH.write_text(json.dumps(kept, separators=(",", ":")), encoding="utf-8")
+
+
 # ── Core fetch ─────────────────────────────────────────────────────────────────
-def _fetch_signals_for_ticker(ticker: str, since: date) -> List[Dict]:
+def _summarize_form4(filing) -> Dict:
+    """
+    Download and parse one Form 4, aggregating its code-P rows.
+    Returns the ticker-independent summary, or a {"no_p": True} marker.
+    Uses the streaming XML parser; falls back to edgartools' Form4 object
+    only when the filing exposes no XML. XML summaries carry `issuer_cik`
+    so bulk mode can reuse them without guessing the issuer.
+    """
+    filing_date_str = filing.filing_date.isoformat() if filing.filing_date else ""
+    xml = filing.xml()
+    if xml:
+        issuer_cik, summary = _summarize_form4_xml(xml.encode("utf-8") if isinstance(xml, str) else xml,
+                                                   filing_date_str)
+        summary["issuer_cik"] = issuer_cik
+        return summary
+
+    return _summarize_form4_obj(filing.obj(), filing_date_str)
+
+
+def _summarize_form4_obj(form4, filing_date_str: str) -> Dict:
+    """Summary from an edgartools Form4 object (the pre-XML-parser path)."""
+    no_p = {"no_p": True, "filing_date": filing_date_str}
+    if form4 is None:
+        return no_p
+
+    ndt = form4.non_derivative_table
+    if ndt is None or ndt.empty:
+        return no_p
+
+    mt = ndt.market_trades
+    if mt is None or mt.empty:
+        return no_p
+
+    p_rows = mt[mt["Code"] == "P"]
+    if p_rows.empty:
+        return no_p
+
+    rows = list(zip(p_rows["Shares"].astype(float), p_rows["Price"].astype(float), p_rows["Date"].astype(str)))
+    return _summarize_p_rows(form4.insider_name or "Unknown", form4.position or "", rows, filing_date_str)
+
+
+def _summarize_p_rows(insider_name: str, position: str, rows: List[Tuple[float, float, str]],
+                      filing_date: str) -> Dict:
+    """Aggregate a filing's (shares, price, date) P rows into one summary."""
+    total_shares = sum(sh for sh, _, _ in rows)
+    # weighted average price
+    avg_price = sum(sh * px for sh, px, _ in rows) / total_shares if total_shares else 0.0
+    return {
+        "insider_name": insider_name,
+        "insider_role": position,
+        "shares_bought": round(total_shares, 0),
+        "price_per_share": round(avg_price, 4),
+        "total_value": round(total_shares * avg_price, 2),
+        "transaction_date": rows[0][2],
+        "filing_date": filing_date,
+    }
+
+
+# ── Raw Form 4 XML ─────────────────────────────────────────────────────────────
+def _extract_ownership_xml(raw: bytes) -> bytes:
+    """Cut the ownershipDocument out of a full submission .txt (or a bare XML file)."""
+    start = raw.find(b"<ownershipDocument")
+    end = raw.rfind(b"</ownershipDocument>")
+    if start == -1 or end == -1:
+        raise ValueError("no ownershipDocument in filing")
+    return raw[start:end + len(b"</ownershipDocument>")]
+
+
+_P_CODE_RE = re.compile(rb"<transactionCode>\s*P\s*</transactionCode>")
+_ISSUER_CIK_RE = re.compile(rb"<issuerCik>\s*(\d+)\s*</issuerCik>")
+
+
+def _is_set(text: Optional[str]) -> bool:
+    return (text or "").strip().lower() in ("1", "true")
+
+
+def _position_from_relationship(officer_title: str, is_director: bool, is_ten_pct: bool) -> str:
+    """Role string in the same spirit as edgartools' Form4.position."""
+    if officer_title:
+        return officer_title
+    if is_director:
+        return "Director"
+    if is_ten_pct:
+        return "10% Owner"
+    return ""
+
+
+def _summarize_form4_xml(raw: bytes, filing_date: str) -> Tuple[int, Dict]:
     """
-    Return a list of signal dicts for open-market purchases (code='P')
-    filed on or after `since`.
+    Parse a raw Form 4 into (issuer CIK, summary) — the same summary shape
+    as _summarize_form4, or a no_p marker.
+
+    Most Form 4s have no open-market purchase at all, so a byte scan for a
+    code-P transaction rejects those before any XML parsing. The rest are
+    streamed with iterparse, keeping only what a P-buy signal needs: issuer
+    CIK, the first reporting owner's name and role, and code-P
+    non-derivative transactions. Other subtrees are cleared as they close and
+    parsing stops at the end of the non-derivative table, so the derivative
+    table and footnotes are never materialised.
+    """
+    doc = _extract_ownership_xml(raw)
+    if not _P_CODE_RE.search(doc):
+        m = _ISSUER_CIK_RE.search(doc)
+        return int(m.group(1)) if m else 0, {"no_p": True, "filing_date": filing_date}
+
+    issuer_cik = 0
+    name: Optional[str] = None
+    officer_title = ""
+    is_director = is_ten_pct = False
+    owner_done = False
+    rows: List[Tuple[float, float, str]] = []
+
+    for _, elem in ET.iterparse(io.BytesIO(doc), events=("end",)):
+        tag = elem.tag
+        if tag == "nonDerivativeTransaction":
+            if (elem.findtext("transactionCoding/transactionCode") or "").strip() == "P":
+                rows.append((
+                    float(elem.findtext("transactionAmounts/transactionShares/value") or 0),
+                    float(elem.findtext("transactionAmounts/transactionPricePerShare/value") or 0),
+                    (elem.findtext("transactionDate/value") or filing_date)[:10],
+                ))
+            elem.clear()
+        elif tag == "nonDerivativeTable":
+            break
+        elif tag == "issuerCik":
+            issuer_cik = int(elem.text or 0)
+        elif owner_done:
+            if tag in ("nonDerivativeHolding", "derivativeTable"):
+                elem.clear()
+        elif tag == "rptOwnerName":
+            name = elem.text
+        elif tag == "officerTitle":
+            officer_title = (elem.text or "").strip()
+        elif tag == "isDirector":
+            is_director = _is_set(elem.text)
+        elif tag == "isTenPercentOwner":
+            is_ten_pct = _is_set(elem.text)
+        elif tag == "reportingOwner":
+            owner_done = True   # only the first reporting owner names the signal
+
+    if not rows:
+        return issuer_cik, {"no_p": True, "filing_date": filing_date}
+    position = _position_from_relationship(officer_title, is_director, is_ten_pct)
+    return issuer_cik, _summarize_p_rows((name or "Unknown").strip(), position, rows, filing_date)
+
+
+def _signal_from_summary(ticker: str, accession: str, summary: Dict) -> Dict:
+    signal = {
+        "ticker": ticker,
+        **{k: v for k, v in summary.items() if k != "issuer_cik"},
+        "accession_no": accession,
+        "signal_strength": _classify_signal(summary["insider_role"], summary["total_value"]),
+    }
+    log.info(
+        f"[{ticker}] P-buy: {signal['insider_name']} ({signal['insider_role']}) "
+        f"${signal['total_value']:,.0f} on {signal['transaction_date']} → {signal['signal_strength']}"
+    )
+    return signal
+
+
+def _fetch_signals_for_ticker(
+    ticker: str,
+    since: date,
+    form4_cache: Optional[Dict[str, Dict]] = None,
+    scheduler: Optional[RequestScheduler] = None,
+) -> Tuple[List[Dict], date]:
+    """
+    Return (signal dicts for open-market purchases (code='P') filed on or
+    after `since`, day the ticker is scanned through). Filings already in
+    `form4_cache` are not downloaded again; newly parsed ones are added to
+    it. A filing that fails to download or parse holds the scanned-through
+    day back to its filing date, so the next run fetches it again. Every
+    EDGAR call goes through `scheduler` (shared SEC rate limit, 429 retry).
     """
     signals: List[Dict] = []
+    scanned_through = date.today()
     ticker = ticker.upper().strip()
+    if form4_cache is None:
+        form4_cache = {}
+    if scheduler is None:
+        scheduler = RequestScheduler(SEC_BUCKET, name="form4")
 
+    # Lookup failures propagate so the caller leaves this ticker's watermark alone
     try:
-        company = edgar.Company(ticker)
+        company = scheduler.call(edgar.Company, ticker)
     except Exception as e:
-        log.warning(f"[{ticker}] Company lookup failed: {e}")
-        return signals
+        raise RuntimeError(f"Company lookup failed: {e}") from e
 
     try:
-        filings = company.get_filings(
+        filings = scheduler.call(
+            company.get_filings,
             form="4",
             filing_date=(since.isoformat(), date.today().isoformat()),
         )
     except Exception as e:
-        log.warning(f"[{ticker}] get_filings failed: {e}")
-        return signals
+        raise RuntimeError(f"get_filings failed: {e}") from e
 
     if not filings or len(filings) == 0:
         log.info(f"[{ticker}] no Form 4 filings in window")
-        return signals
+        return signals, scanned_through
 
     log.info(f"[{ticker}] scanning {len(filings)} Form 4 filings since {since}...")
 
+    downloaded = 0
     for filing in filings:
-        time.sleep(REQUEST_DELAY)
-        try:
-            form4 = filing.obj()
-            if form4 is None:
-                continue
-
-            ndt = form4.non_derivative_table
-            if ndt is None or ndt.empty:
-                continue
-
-            mt = ndt.market_trades
-            if mt is None or mt.empty:
+        accession = filing.accession_no
+        summary = form4_cache.get(accession)
+        if _needs_fetch(summary):
+            try:
+                # filing.xml() reads the filing index and then the XML document (cost=2)
+                summary = scheduler.call(_summarize_form4, filing, cost=2)
+            except Exception as e:
+                filed = str(filing.filing_date)[:10]
+                if _record_failure(form4_cache, accession, filed):
+                    log.warning(f"[{ticker}] filing parse error ({filed}): {e} — retried next run")
+                    scanned_through = min(scanned_through, date.fromisoformat(filed))
+                else:
+                    log.error(f"[{ticker}] filing parse error ({filed}): {e} — giving up after "
+                              f"{FORM4_MAX_ATTEMPTS} attempts")
                 continue
+            form4_cache[accession] = summary
+            downloaded += 1
 
-            p_rows = mt[mt["Code"] == "P"]
-            if p_rows.empty:
-                continue
-
-            insider_name = form4.insider_name or "Unknown"
-            position = form4.position or ""
-            filing_date_str = filing.filing_date.isoformat() if filing.filing_date else ""
-
-            # Aggregate multiple same-filing rows into one signal
-            total_shares = float(p_rows["Shares"].sum())
-            # weighted average price
-            prices = p_rows["Price"].astype(float)
-            shares = p_rows["Shares"].astype(float)
-            avg_price = float((prices * shares).sum() / shares.sum()) if total_shares else 0.0
-            total_value = total_shares * avg_price
-            txn_date = str(p_rows["Date"].iloc[0]) if not p_rows.empty else filing_date_str
-
-            signal = {
-                "ticker": ticker,
-                "insider_name": insider_name,
-                "insider_role": position,
-                "shares_bought": round(total_shares, 0),
-                "price_per_share": round(avg_price, 4),
-                "total_value": round(total_value, 2),
-                "transaction_date": txn_date,
-                "filing_date": filing_date_str,
-                "signal_strength": _classify_signal(position, total_value),
-            }
-            signals.append(signal)
-            log.info(
-                f"[{ticker}] P-buy: {insider_name} ({position}) "
-                f"${total_value:,.0f} on {txn_date} → {signal['signal_strength']}"
-            )
-
-        except Exception as e:
-            log.debug(f"[{ticker}] filing parse error ({filing.filing_date}): {e}")
+        if summary.get("no_p") or "failed" in summary:
             continue
+        signals.append(_signal_from_summary(ticker, accession, summary))
 
-    return signals
+    log.info(f"[{ticker}] {downloaded} new filing(s) downloaded, {len(filings) - downloaded} from cache")
+    return signals, scanned_through
 
 
 # ── Public API ─────────────────────────────────────────────────────────────────
 def get_insider_signals(tickers: List[str], lookback_days: int = LOOKBACK_DAYS) -> List[Dict]:
     """
     Fetch open-market purchase signals (Form 4, code='P') for all tickers.
-    Saves results to data/insider_signals.json.
-    Returns a flat list of signal dicts sorted by total_value descending.
+    Each ticker is only queried from its watermark (the last date it was
+    scanned through) rather than over the whole lookback.
+    Merges results into the rolling table in data/insider_signals.json.
+    Returns the requested tickers' signals sorted by total_value descending.
     """
     edgar.set_identity(EDGAR_IDENTITY)
-    since = date.today() - timedelta(days=lookback_days)
+    today = date.today()
+    window_start = today - timedelta(days=lookback_days)
+    tickers = [t.upper().strip() for t in tickers]
+
+    state = _load_state()
+    watermarks = state["watermarks"]
+    form4_cache = _load_form4_cache()
+    scheduler = RequestScheduler(SEC_BUCKET, workers=FETCH_WORKERS, name="form4")
+
+    def _one(ticker: str) -> Tuple[List[Dict], date]:
+        return _fetch_signals_for_ticker(ticker, _resume_from(watermarks.get(ticker), window_start),
+                                         form4_cache, scheduler)
 
     all_signals: List[Dict] = []
-    for ticker in tickers:
-        try:
-            sigs = _fetch_signals_for_ticker(ticker, since)
-            all_signals.extend(sigs)
-        except Exception as e:
-            log.error(f"[{ticker}] unexpected error: {e}")
-        time.sleep(REQUEST_DELAY)
+    for ticker, result, err in scheduler.map(_one, tickers):
+        if err is not None:
+            log.error(f"[{ticker}] unexpected error: {err}")
+            continue
+        sigs, scanned_through = result
+        all_signals.extend(sigs)
+        watermarks[ticker] = scanned_through.isoformat()
+    scheduler.log_stats()
 
-    all_signals.sort(key=lambda s: s["total_value"], reverse=True)
+    _save_form4_cache(form4_cache)
+    table = _merge_signals(state["signals"], all_signals, lookback_days)
+    _save_signals(table, watermarks, state["bulk_watermark"])
+    wanted = set(tickers)
+    return [s for s in table if s["ticker"] in wanted]
 
-    _save_signals(all_signals)
-    return all_signals
+
+def _resume_from(watermark: Optional[str], window_start: date) -> date:
+    """
+    Scan start for an incremental run: the watermark day itself (filings
+    can land after a same-day run; the accession cache absorbs the repeat),
+    never earlier than the lookback window.
+    """
+    if not watermark:
+        return window_start
+    return max(date.fromisoformat(watermark), window_start)
+
+
+def _load_universe(path: Path = UNIVERSE_CSV) -> Dict[int, str]:
+    """Issuer CIK -> ticker for every company in the S&P 500 list."""
+    universe: Dict[int, str] = {}
+    with path.open(encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                universe[int(row["CIK"])] = row["Ticker"].strip().upper()
+            except (KeyError, ValueError):
+                continue
+    return universe
+
+
+def get_insider_signals_bulk(
+    days: Optional[int] = None,
+    lookback_days: int = LOOKBACK_DAYS,
+    root: Optional[str] = None,
+) -> List[Dict]:
+    """
+    Ingest EDGAR daily form indexes for every company in data/snp500.csv,
+    from the bulk watermark through today (the whole lookback on the first
+    run), or the last `days` indexes when given (the watermark only moves
+    when that window reaches back to it). Costs one index read per
+    business day plus one read per Form 4 not already in the accession cache.
+    Merges into data/insider_signals.json and returns the full table.
+    """
+    universe = _load_universe()
+    state = _load_state()
+    form4_cache = _load_form4_cache()
+    scheduler = RequestScheduler(SEC_BUCKET, workers=FETCH_WORKERS, name="form4-bulk")
+    today = date.today()
+    resume = _resume_from(state["bulk_watermark"], today - timedelta(days=lookback_days))
+    start = resume if days is None else today - timedelta(days=days - 1)
+    # A short --bulk-days window that starts after the resume point leaves a
+    # gap; keep the old watermark so the next full run still covers it
+    partial = start > resume
+
+    # Pass 1: one index read per business day → universe filings, deduped
+    rows: Dict[str, Dict] = {}
+    listings: Dict[str, int] = defaultdict(int)   # universe CIKs listing each accession
+    for offset in range((today - start).days, -1, -1):
+        day = today - timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for row in iter_form_index(day, forms=("4", "4/A"), root=root, scheduler=scheduler):
+            if row["cik"] in universe:
+                rows.setdefault(row["accession_no"], row)
+                listings[row["accession_no"]] += 1
+
+    # Pass 2: download only filings the accession cache has not seen, concurrently
+    def _download(row: Dict) -> Optional[Dict]:
+        raw = read_archive(row["file_name"], root, scheduler)
+        if raw is None:
+            return None
+        issuer_cik, summary = _summarize_form4_xml(raw, row["date_filed"])
+        summary["issuer_cik"] = issuer_cik
+        return summary
+
+    # A failed filing holds the watermark back to its filing day, so the next
+    # run re-reads that index and retries it (the cache skips the rest), until
+    # it has failed FORM4_MAX_ATTEMPTS times
+    # Cached summaries without an issuer CIK (older cache entries) are fetched
+    # again when both issuer and owner are in the universe: the kept row
+    # alone cannot say which one issued the filing
+    missing = [
+        row for acc, row in rows.items()
+        if _needs_fetch(form4_cache.get(acc))
+        or (listings[acc] > 1 and "issuer_cik" not in form4_cache[acc] and "failed" not in form4_cache[acc])
+    ]
+    downloaded = 0
+    scanned_through = today.isoformat()
+    for row, summary, err in scheduler.map(_download, missing):
+        if err is not None or summary is None:
+            reason = err or "missing from archive"
+            if _record_failure(form4_cache, row["accession_no"], row["date_filed"]):
+                log.warning(f"[{row['accession_no']}] Form 4 not fetched ({reason}) — retried next run")
+                scanned_through = min(scanned_through, row["date_filed"])
+            else:
+                log.error(f"[{row['accession_no']}] Form 4 not fetched ({reason}) — giving up after "
+                          f"{FORM4_MAX_ATTEMPTS} attempts")
+            continue
+        form4_cache[row["accession_no"]] = summary
+        downloaded += 1
+    scheduler.log_stats()
+
+    new_signals: List[Dict] = []
+    for accession, row in rows.items():
+        summary = form4_cache.get(accession)
+        if summary is None or summary.get("no_p") or "failed" in summary:
+            continue
+        # The index lists a filing under the reporting owner's CIK too, and the
+        # kept row may be the owner's — the ticker comes from the issuer only
+        ticker = universe.get(summary.get("issuer_cik", row["cik"]))
+        if ticker is None:
+            continue
+        new_signals.append(_signal_from_summary(ticker, accession, summary))
+
+    log.info(f"Bulk ingest: {len(rows)} universe Form 4(s), {downloaded} downloaded, "
+             f"{len(new_signals)} P-buy(s)")
+    _save_form4_cache(form4_cache)
+    table = _merge_signals(state["signals"], new_signals, lookback_days)
+    _save_signals(table, state["watermarks"], state["bulk_watermark"] if partial else scanned_through)
+    return table
 
 
 def get_high_conviction_buys(tickers: List[str], lookback_days: int = LOOKBACK_DAYS) -> List[Dict]:
@@ -189,12 +526,49 @@ def get_high_conviction_buys(tickers: List[str], lookback_days: int = LOOKBACK_D
 
 
 # ── Persistence ────────────────────────────────────────────────────────────────
-def _save_signals(signals: List[Dict]) -> None:
+# data/insider_signals.json is a rolling table: signals within the lookback
+# plus the watermarks (last scanned-through date) per ticker and for bulk mode.
+def _load_state() -> Dict:
+    state = {"signals": [], "watermarks": {}, "bulk_watermark": None}
+    if not SIGNALS_PATH.exists():
+        return state
+    try:
+        data = json.loads(SIGNALS_PATH.read_text(encoding="utf-8"))
+        state["signals"] = data.get("signals", [])
+        state["watermarks"] = data.get("watermarks", {})
+        state["bulk_watermark"] = data.get("bulk_watermark")
+    except Exception as e:
+        log.warning(f"Could not read {SIGNALS_PATH} ({e}) — starting fresh.")
+    return state
+
+
+def _signal_key(signal: Dict) -> tuple:
+    # Content key rather than accession: also folds 4/A amendments and legacy rows
+    return (signal["ticker"], signal["insider_name"], signal["transaction_date"], signal["total_value"])
+
+
+def _merge_signals(existing: List[Dict], new: List[Dict], lookback_days: int) -> List[Dict]:
+    """Fold new signals into the saved table, dedupe, and drop entries filed before the lookback."""
+    cutoff = (date.today() - timedelta(days=lookback_days)).isoformat()
+    merged = {_signal_key(s): s for s in existing}
+    merged.update((_signal_key(s), s) for s in new)
+    table = [s for s in merged.values() if s.get("filing_date", "") >= cutoff]
+    table.sort(key=lambda s: s["total_value"], reverse=True)
+    return table
+
+
+def _save_signals(
+    signals: List[Dict],
+    watermarks: Optional[Dict[str, str]] = None,
+    bulk_watermark: Optional[str] = None,
+) -> None:
     SIGNALS_PATH.parent.mkdir(parents=True, exist_ok=True)
     payload = {
         "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
         "count": len(signals),
         "signals": signals,
+        "watermarks": watermarks or {},
+        "bulk_watermark": bulk_watermark,
     }
     SIGNALS_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     log.info(f"Saved {len(signals)} signals to {SIGNALS_PATH}")
@@ -225,10 +599,23 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="Fetch SEC Form 4 insider open-market purchase signals."
     )
-    parser.add_argument(
-        "--tickers", nargs="+", required=True, metavar="SYMBOL",
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
+        "--tickers", nargs="+", metavar="SYMBOL",
         help="Ticker symbols to scan"
     )
+    mode.add_argument(
+        "--bulk", action="store_true",
+        help="Scan the whole data/snp500.csv universe via EDGAR daily indexes"
+    )
+    parser.add_argument(
+        "--bulk-days", type=int, default=None,
+        help="Read only the last N daily indexes in --bulk mode (default: since the bulk watermark)"
+    )
+    parser.add_argument(
+        "--archive-root", default=None, metavar="PATH_OR_URL",
+        help="EDGAR archive root for --bulk (local mirror directory for testing)"
+    )
     parser.add_argument(
         "--days", type=int, default=LOOKBACK_DAYS,
         help=f"Lookback window in days (default: {LOOKBACK_DAYS})"
@@ -239,10 +626,13 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    tickers = [t.upper() for t in args.tickers]
-    print(f"\nScanning {len(tickers)} ticker(s) for Form 4 P-buys (last {args.days} days)...\n")
-
-    signals = get_insider_signals(tickers, lookback_days=args.days)
+    if args.bulk:
+        print("\nScanning S&P 500 universe via EDGAR daily indexes...\n")
+        signals = get_insider_signals_bulk(args.bulk_days, lookback_days=args.days, root=args.archive_root)
+    else:
+        tickers = [t.upper() for t in args.tickers]
+        print(f"\nScanning {len(tickers)} ticker(s) for Form 4 P-buys (last {args.days} days)...\n")
+        signals = get_insider_signals(tickers, lookback_days=args.days)
 
     if args.high_only:
         signals = [s for s in signals if s["signal_strength"] == "HIGH"]
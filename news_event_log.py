@@ -0,0 +1,241 @@
+"""
+news_event_log.py — Append-only news event store
+
+Every keyword-matched headline that news_fetcher sees is appended once to a
+JSONL segment under data/news_events/, one file per month of publication:
+
+  data/news_events/2026-07.jsonl
+
+Events are keyed by a hash of ticker + article URL (ticker + headline when the
+feed gives no link). Dedup only consults the key set of the target segment,
+so an insert stays O(1) however much history has piled up, and reads only open
+the segments that overlap the requested time range.
+
+Functions:
+  event_id(signal)                     -> stable dedup key
+  append_events(signals)               -> number of new events written
+  iter_events(since=None, until=None)  -> generator over stored events
+  load_events(since=None, until=None)  -> list of stored events
+  read_new_events(offsets)             -> (events appended since offsets, new offsets)
+  read_logged_before(offsets, names)   -> events of the named segments before offsets
+
+CLI:
+  python news_event_log.py --import data/news_signals.json
+  python news_event_log.py --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+LOG_DIR = Path("data/news_events")
+
+log = logging.getLogger(__name__)
+
+_LOCK = threading.Lock()
+_SEGMENT_KEYS: Dict[str, Set[str]] = {}   # segment name -> event ids already on disk
+
+
+# ── Keys & partitioning ────────────────────────────────────────────────────────
+def event_id(signal: Dict) -> str:
+    """Hash of ticker + URL (or ticker + headline) — identical across refetches."""
+    ticker = (signal.get("ticker") or "").upper()
+    ref = signal.get("url") or signal.get("headline") or ""
+    return hashlib.sha1(f"{ticker}|{ref}".encode("utf-8")).hexdigest()[:16]
+
+
+def _event_time(signal: Dict) -> Optional[datetime]:
+    """Naive-UTC publication time of a signal, or None if unparseable."""
+    ts = signal.get("published_ts")
+    if ts is not None:
+        return datetime.utcfromtimestamp(ts)
+    published = signal.get("published") or ""
+    if not published:
+        return None
+    try:
+        dt = parsedate_to_datetime(published)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(published)
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _segment_name(dt: datetime) -> str:
+    return dt.strftime("%Y-%m")
+
+
+def _segment_path(name: str) -> Path:
+    return LOG_DIR / f"{name}.jsonl"
+
+
+def _segment_keys(name: str) -> Set[str]:
+    """Load (once) the ids stored in one segment. Caller holds _LOCK."""
+    keys = _SEGMENT_KEYS.get(name)
+    if keys is not None:
+        return keys
+    keys = set()
+    path = _segment_path(name)
+    if path.exists():
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    keys.add(json.loads(line)["event_id"])
+                except (ValueError, KeyError):
+                    continue
+    _SEGMENT_KEYS[name] = keys
+    return keys
+
+
+# ── Write ──────────────────────────────────────────────────────────────────────
+def append_events(signals: Iterable[Dict]) -> int:
+    """
+    Append signals not yet in the log. Signals without a parseable
+    publication time are filed under the current month.
+    Returns the number of events actually written.
+    """
+    now = datetime.utcnow()
+    pending: Dict[str, List[Dict]] = {}
+
+    with _LOCK:
+        for sig in signals:
+            eid = event_id(sig)
+            seg = _segment_name(_event_time(sig) or now)
+            keys = _segment_keys(seg)
+            if eid in keys:
+                continue
+            keys.add(eid)
+            pending.setdefault(seg, []).append(
+                {**sig, "event_id": eid, "logged_at": now.isoformat(timespec="seconds")}
+            )
+
+        if pending:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+        for seg, rows in pending.items():
+            with _segment_path(seg).open("a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    written = sum(len(rows) for rows in pending.values())
+    if written:
+        log.info(f"Appended {written} new news event(s) to {LOG_DIR}")
+    return written
+
+
+# ── Read ───────────────────────────────────────────────────────────────────────
+def _segments_between(since: Optional[datetime], until: Optional[datetime]) -> List[Path]:
+    if not LOG_DIR.exists():
+        return []
+    lo = _segment_name(since) if since else ""
+    hi = _segment_name(until) if until else "9999-99"
+    return [p for p in sorted(LOG_DIR.glob("*.jsonl")) if lo <= p.stem <= hi]
+
+
+def iter_events(since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[Dict]:
+    """
+    Stream stored events, oldest segment first. `since`/`until` are naive UTC
+    datetimes; only segments overlapping the range are opened. Events with no
+    parseable publication time are kept whenever their segment is read.
+    """
+    for path in _segments_between(since, until):
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if since or until:
+                    dt = _event_time(event)
+                    if dt is not None and ((since and dt < since) or (until and dt > until)):
+                        continue
+                yield event
+
+
+def load_events(since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict]:
+    return list(iter_events(since, until))
+
+
+def read_new_events(offsets: Dict[str, int]) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Events appended since a previous read. `offsets` maps segment name to the
+    byte offset already consumed; each segment is read from there (segments
+    are append-only), and a trailing partial line is left for next time.
+    Returns (new events, updated offsets).
+    """
+    events: List[Dict] = []
+    updated = dict(offsets)
+    for path in _segments_between(None, None):
+        start = offsets.get(path.stem, 0)
+        if path.stat().st_size <= start:
+            continue
+        with path.open("rb") as f:
+            f.seek(start)
+            chunk = f.read()
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        updated[path.stem] = start + len(complete)
+    return events, updated
+
+
+def read_logged_before(offsets: Dict[str, int], names: Iterable[str]) -> List[Dict]:
+    """Events of the named segments that lie before `offsets` — what earlier reads consumed."""
+    events: List[Dict] = []
+    for name in sorted(set(names)):
+        end = offsets.get(name, 0)
+        path = _segment_path(name)
+        if not end or not path.exists():
+            continue
+        with path.open("rb") as f:
+            chunk = f.read(end)
+        for line in chunk.splitlines():
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="Append-only news event log.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--import", dest="import_path", metavar="JSON",
+                       help="Append signals from a news_signals.json snapshot")
+    group.add_argument("--stats", action="store_true", help="Print event counts per segment")
+    args = parser.parse_args()
+
+    if args.import_path:
+        data = json.loads(Path(args.import_path).read_text(encoding="utf-8"))
+        signals = data if isinstance(data, list) else data.get("signals", [])
+        n = append_events(signals)
+        print(f"Imported {n} new event(s) from {args.import_path} ({len(signals)} read)")
+        return
+
+    total = 0
+    for path in _segments_between(None, None):
+        with path.open(encoding="utf-8") as f:
+            n = sum(1 for _ in f)
+        total += n
+        print(f"  {path.stem}  {n:>6} events")
+    print(f"  {'total':<7}  {total:>6} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,25 +6,39 @@ ticker-keyed signals by matching bullish/bearish keywords.
 
 No API key required — uses public Yahoo Finance RSS.
 
+data/news_signals.json holds the latest fetch per ticker (each with its own
+fetched_at); every signal is also appended to the deduplicated history in
+news_event_log (data/news_events/). Each signal carries `published_ts`, its
+publication time as UTC epoch seconds, so readers never re-parse the RSS
+date string.
+
 Functions:
   get_news_signals(tickers=None)   -> list of signal dicts
+  iter_news_signals(tickers)       -> generator of signal batches, one per completed feed
   get_ticker_news_score(ticker)    -> float 0-10 (used by convergence_score)
 """
 
 from __future__ import annotations
 
+import calendar
 import json
 import logging
-import time
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import feedparser
 
+from news_event_log import append_events, load_events
+
 CACHE_PATH = Path("data/news_signals.json")
 CACHE_TTL_MINUTES = 60
-REQUEST_DELAY = 0.3
+LATEST_WINDOW_HOURS = 48    # served from the event log when the snapshot is stale
+FETCH_WORKERS = 4           # RSS feeds fetched concurrently
 
 log = logging.getLogger(__name__)
 
@@ -74,29 +88,95 @@ def _score_headline(headline: str) -> tuple[str, str, float]:
 
 
 # ── Cache ──────────────────────────────────────────────────────────────────────
-def _load_cache() -> Optional[dict]:
-    if not CACHE_PATH.exists():
-        return None
+# The snapshot file keeps one fetched_at per ticker next to the flat signal
+# list. In memory it is held with a ticker -> signals index, and only re-read
+# when the file's mtime changes.
+_CACHE_LOCK = threading.Lock()
+_MEM: Dict = {"mtime": None, "fetched": {}, "index": {}}
+
+
+def _load_cache() -> Dict:
+    """Return {"fetched": {ticker: datetime}, "index": {ticker: [signals]}}."""
+    try:
+        mtime = CACHE_PATH.stat().st_mtime
+    except OSError:
+        return {"mtime": None, "fetched": {}, "index": {}}
+    if _MEM["mtime"] == mtime:
+        return _MEM
+
+    fetched: Dict[str, datetime] = {}
+    index: Dict[str, List[Dict]] = {}
     try:
         data = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-        fetched = datetime.fromisoformat(data.get("fetched_at", "2000-01-01"))
-        age = datetime.utcnow() - fetched
-        if age < timedelta(minutes=CACHE_TTL_MINUTES):
-            return data
-    except Exception:
-        pass
-    return None
+        for s in data.get("signals", []):
+            index.setdefault(s["ticker"], []).append(s)
+        per_ticker = data.get("tickers")
+        if per_ticker is None:  # legacy snapshot: one fetched_at for every ticker in it
+            per_ticker = {t: data.get("fetched_at", "2000-01-01") for t in index}
+        fetched = {t: datetime.fromisoformat(ts) for t, ts in per_ticker.items()}
+    except Exception as e:
+        log.warning(f"News cache read error ({e}) — starting fresh.")
+
+    _MEM.update(mtime=mtime, fetched=fetched, index=index)
+    return _MEM
+
+
+def _is_fresh(fetched_at: Optional[datetime]) -> bool:
+    return fetched_at is not None and datetime.utcnow() - fetched_at < timedelta(minutes=CACHE_TTL_MINUTES)
+
 
+def _save_cache(updates: Dict[str, List[Dict]]) -> None:
+    """
+    Merge freshly fetched tickers into the snapshot. Tickers not refreshed
+    within LATEST_WINDOW_HOURS are dropped so the snapshot stays a recent view.
+    """
+    now = datetime.utcnow()
+    with _CACHE_LOCK:
+        cache = _load_cache()
+        fetched = dict(cache["fetched"])
+        index = dict(cache["index"])
+        for ticker, sigs in updates.items():
+            fetched[ticker] = now
+            index[ticker] = sigs
+        horizon = now - timedelta(hours=LATEST_WINDOW_HOURS)
+        fetched = {t: ts for t, ts in fetched.items() if ts >= horizon}
+
+        signals = [s for t in fetched for s in index.get(t, [])]
+        signals.sort(key=lambda s: s["score"], reverse=True)
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_PATH.with_suffix(".json.tmp")
+        tmp.write_text(
+            json.dumps({
+                "fetched_at": now.isoformat(timespec="seconds"),
+                "tickers": {t: ts.isoformat(timespec="seconds") for t, ts in fetched.items()},
+                "signals": signals,
+            }, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp, CACHE_PATH)  # readers never see a half-written snapshot
+    append_events(s for sigs in updates.values() for s in sigs)
 
-def _save_cache(signals: List[Dict]) -> None:
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CACHE_PATH.write_text(
-        json.dumps({"fetched_at": datetime.utcnow().isoformat(timespec="seconds"), "signals": signals}, indent=2),
-        encoding="utf-8",
-    )
+
+def _latest_from_log() -> List[Dict]:
+    """Signals published within LATEST_WINDOW_HOURS, read from the event log."""
+    since = datetime.utcnow() - timedelta(hours=LATEST_WINDOW_HOURS)
+    signals = load_events(since=since)
+    signals.sort(key=lambda s: s["score"], reverse=True)
+    return signals
 
 
 # ── Core fetch ─────────────────────────────────────────────────────────────────
+def _published_ts(entry) -> Optional[int]:
+    """Publication time as UTC epoch seconds, from feedparser's parsed struct when it has one."""
+    parsed = entry.get("published_parsed")
+    if parsed:
+        return calendar.timegm(parsed)
+    try:
+        return int(parsedate_to_datetime(entry.get("published", "")).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
 def _fetch_for_ticker(ticker: str, max_items: int = 10) -> List[Dict]:
     url = _yahoo_rss_url(ticker)
     try:
@@ -116,6 +196,7 @@ def _fetch_for_ticker(ticker: str, max_items: int = 10) -> List[Dict]:
                 "source": (entry.get("source") or {}).get("title", "Yahoo Finance"),
                 "url": entry.get("link", ""),
                 "published": entry.get("published", ""),
+                "published_ts": _published_ts(entry),
             })
         return signals
     except Exception as e:
@@ -123,7 +204,96 @@ def _fetch_for_ticker(ticker: str, max_items: int = 10) -> List[Dict]:
         return []
 
 
+def _iter_fetch(tickers: List[str], max_per_ticker: int) -> Iterator[Tuple[str, List[Dict]]]:
+    """Fetch feeds FETCH_WORKERS at a time, yielding (ticker, signals) in completion order."""
+    pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="news-fetch")
+    try:
+        futures = {pool.submit(_fetch_for_ticker, t, max_per_ticker): t for t in tickers}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_many(tickers: List[str], max_per_ticker: int) -> Dict[str, List[Dict]]:
+    return dict(_iter_fetch(tickers, max_per_ticker))
+
+
+# ── Background revalidation ────────────────────────────────────────────────────
+_REFRESHING: Set[str] = set()
+_REFRESH_LOCK = threading.Lock()
+
+
+def _revalidate_async(tickers: List[str], max_per_ticker: int) -> None:
+    """Refetch stale tickers on a daemon thread; tickers already in flight are skipped."""
+    with _REFRESH_LOCK:
+        todo = [t for t in tickers if t not in _REFRESHING]
+        _REFRESHING.update(todo)
+    if not todo:
+        return
+
+    def _run() -> None:
+        try:
+            _save_cache(_fetch_many(todo, max_per_ticker))
+            log.info(f"Revalidated news for {len(todo)} stale ticker(s)")
+        except Exception as e:
+            log.warning(f"Background news refresh failed: {e}")
+        finally:
+            with _REFRESH_LOCK:
+                _REFRESHING.difference_update(todo)
+
+    threading.Thread(target=_run, name="news-revalidate", daemon=True).start()
+
+
 # ── Public API ─────────────────────────────────────────────────────────────────
+def iter_news_signals(
+    tickers: List[str],
+    use_cache: bool = True,
+    max_per_ticker: int = 10,
+) -> Iterator[List[Dict]]:
+    """
+    Yield keyword-matched signal batches as they become available, so callers
+    can render progressively.
+
+    With use_cache, everything already in the snapshot comes out first as one
+    batch (stale tickers are revalidated in the background, as in
+    get_news_signals). Remaining tickers are fetched concurrently and each
+    non-empty feed is yielded as soon as it completes. Fetched tickers are
+    merged into the snapshot when the generator finishes or is closed.
+    """
+    upper = list(dict.fromkeys(t.upper() for t in tickers))
+    served: Set[str] = set()
+
+    if use_cache:
+        cache = _load_cache()
+        batch: List[Dict] = []
+        stale = []
+        for ticker in upper:
+            if ticker in cache["fetched"]:
+                served.add(ticker)
+                batch.extend(cache["index"].get(ticker, []))
+                if not _is_fresh(cache["fetched"][ticker]):
+                    stale.append(ticker)
+        if stale:
+            _revalidate_async(stale, max_per_ticker)
+        if batch:
+            yield batch
+
+    missing = [t for t in upper if t not in served]
+    if not missing:
+        return
+
+    fetched: Dict[str, List[Dict]] = {}
+    try:
+        for ticker, sigs in _iter_fetch(missing, max_per_ticker):
+            fetched[ticker] = sigs
+            if sigs:
+                yield sigs
+    finally:
+        if fetched:
+            _save_cache(fetched)
+
+
 def get_news_signals(
     tickers: Optional[List[str]] = None,
     use_cache: bool = True,
@@ -131,29 +301,26 @@ def get_news_signals(
 ) -> List[Dict]:
     """
     Fetch and return keyword-matched news signals for all tickers.
-    If tickers is None, returns cached signals (or empty list).
+
+    With use_cache, each ticker is served from the snapshot as long as it
+    has ever been fetched; tickers older than CACHE_TTL_MINUTES are refetched
+    on a background thread (stale-while-revalidate). Only never-seen tickers
+    are fetched inline.
+    If tickers is None, returns cached signals — falling back to the latest
+    window of the event log when the snapshot is stale (or empty list).
     Results are sorted by score descending.
     """
-    if use_cache:
-        cached = _load_cache()
-        if cached:
-            signals = cached["signals"]
-            if tickers:
-                upper = {t.upper() for t in tickers}
-                signals = [s for s in signals if s["ticker"] in upper]
-            return signals
-
     if not tickers:
-        return []
-
-    all_signals: List[Dict] = []
-    for ticker in tickers:
-        sigs = _fetch_for_ticker(ticker.upper(), max_items=max_per_ticker)
-        all_signals.extend(sigs)
-        time.sleep(REQUEST_DELAY)
+        if not use_cache:
+            return []
+        cache = _load_cache()
+        if any(_is_fresh(ts) for ts in cache["fetched"].values()):
+            signals = [s for t in cache["fetched"] for s in cache["index"].get(t, [])]
+            return sorted(signals, key=lambda s: s["score"], reverse=True)
+        return _latest_from_log()
 
+    all_signals = [s for batch in iter_news_signals(tickers, use_cache, max_per_ticker) for s in batch]
     all_signals.sort(key=lambda s: s["score"], reverse=True)
-    _save_cache(all_signals)
     return all_signals
 
 
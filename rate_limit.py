@@ -0,0 +1,153 @@
+"""
+rate_limit.py — Token-bucket request scheduler
+
+Lets the EDGAR fetchers keep several lookups and downloads in flight while
+the aggregate request rate stays under SEC's published limit of 10 requests
+per second. All SEC traffic in a process draws from the one SEC_BUCKET, so
+insider_tracker, edgar_daily_index and hedge_fund_mirror never add up past
+the limit even when they run side by side.
+
+Calls that hit HTTP 429 are retried with exponential backoff plus jitter.
+Each scheduler counts requests and retries so runs can report the
+throughput they actually achieved.
+
+Classes:
+  TokenBucket(rate, capacity)                  — thread-safe blocking token bucket
+  RequestScheduler(bucket, workers)            — worker pool + bucket + 429 retry + stats
+
+Constants:
+  SEC_MAX_RPS, SEC_TARGET_RPS, SEC_BUCKET
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+SEC_MAX_RPS = 10.0          # https://www.sec.gov/os/accessing-edgar-data
+SEC_TARGET_RPS = SEC_MAX_RPS * 0.8   # headroom for clock jitter and edgartools' own calls
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Blocking token bucket: `rate` tokens/second, bursts up to `capacity`.
+    acquire() accepts costs above `capacity` (e.g. cost=3 on the 2-token
+    SEC_BUCKET) instead of waiting for a bucket that can never fill.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate / 4)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        # A request costing more than the burst capacity waits for a full
+        # bucket and leaves it in debt, so later callers pay for the overshoot.
+        need = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= need:
+                    self._tokens -= tokens
+                    return
+                wait = (need - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+SEC_BUCKET = TokenBucket(SEC_TARGET_RPS, capacity=2)
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    text = str(exc)
+    return "429" in text or "Too Many Requests" in text
+
+
+class RequestScheduler:
+    """
+    Runs work on a thread pool while every network call goes through
+    call(), which takes tokens from the shared bucket first.
+
+      sched = RequestScheduler(SEC_BUCKET, workers=6)
+      for item, result, err in sched.map(fetch_one, items): ...
+      # inside fetch_one: sched.call(session.get, url)
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket = SEC_BUCKET,
+        workers: int = 6,
+        max_retries: int = 4,
+        backoff: float = 1.0,
+        name: str = "edgar",
+    ):
+        self.bucket = bucket
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.name = name
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._started = time.monotonic()
+
+    def call(self, fn: Callable, *args, cost: float = 1.0, **kwargs):
+        """
+        Take `cost` tokens (an estimate of the HTTP requests fn makes), run
+        fn, and retry on 429 with exponential backoff + jitter.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire(cost)
+            with self._lock:
+                self._requests += int(cost)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_rate_limited(e):
+                    raise
+                delay = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+                with self._lock:
+                    self._retries += 1
+                log.warning(f"[{self.name}] HTTP 429 — retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def map(self, fn: Callable, items: Iterable) -> Iterator[Tuple[object, object, Optional[Exception]]]:
+        """Run fn(item) on the pool; yield (item, result, error) as each finishes."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name) as pool:
+            futures = {pool.submit(fn, item): item for item in items}
+            for fut in as_completed(futures):
+                item = futures[fut]
+                try:
+                    yield item, fut.result(), None
+                except Exception as e:
+                    yield item, None, e
+
+    def stats(self) -> Dict:
+        elapsed = time.monotonic() - self._started
+        with self._lock:
+            requests, retries = self._requests, self._retries
+        return {
+            "requests": requests,
+            "retries": retries,
+            "elapsed_s": round(elapsed, 2),
+            "requests_per_s": round(requests / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+    def log_stats(self) -> None:
+        s = self.stats()
+        log.info(
+            f"[{self.name}] {s['requests']} request(s) in {s['elapsed_s']}s "
+            f"= {s['requests_per_s']} req/s ({s['retries']} 429 retries)"
+        )
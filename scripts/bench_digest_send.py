@@ -0,0 +1,155 @@
+"""
+bench_digest_send.py — Personalised digest render + send throughput
+
+Starts a local SMTP stand-in (plain TCP, no mail leaves the machine) that
+adds a configurable delay to the connection greeting (standing in for the
+TLS handshake) and to every command reply (network round trip), then
+delivers the digest to N synthetic recipients two ways:
+
+  baseline  — render the whole page per recipient, one after another, and
+              open + log in + quit a fresh connection for every message
+  pipeline  — digest_mailer.build_digests (shared sections once, watchlist
+              sections in a worker pool) + DigestSender (one reused connection)
+
+Recipients get random watchlists written to a temporary per-user watchlist
+directory. Uses the data files in the working directory, so run it from the
+repo root.
+
+Usage:
+  python scripts/bench_digest_send.py [--recipients 200] [--connect-ms 60] [--rtt-ms 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import smtplib
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import digest_mailer  # noqa: E402
+import tracking_helpers  # noqa: E402
+
+
+# ── SMTP stand-in ──────────────────────────────────────────────────────────────
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    connect_delay = 0.0
+    rtt = 0.0
+    received = 0
+    lock = threading.Lock()
+
+    def _reply(self, line: str) -> None:
+        time.sleep(self.rtt)
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self) -> None:
+        time.sleep(self.connect_delay)
+        self._reply("220 localhost stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode(errors="replace").strip().upper()
+            if cmd.startswith(("EHLO", "HELO")):
+                time.sleep(self.rtt)
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif cmd.startswith("AUTH"):
+                self._reply("235 ok")
+            elif cmd.startswith("DATA"):
+                self._reply("354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.lock:
+                    type(self).received += 1
+                self._reply("250 queued")
+            elif cmd.startswith("QUIT"):
+                self._reply("221 bye")
+                return
+            else:   # MAIL, RCPT, NOOP, RSET
+                self._reply("250 ok")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _start_server(connect_ms: float, rtt_ms: float) -> Tuple[_Server, int]:
+    _SMTPHandler.connect_delay = connect_ms / 1000
+    _SMTPHandler.rtt = rtt_ms / 1000
+    server = _Server(("127.0.0.1", 0), _SMTPHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+# ── Runs ───────────────────────────────────────────────────────────────────────
+def _baseline(recipients: List[str], snap, port: int) -> None:
+    subject = digest_mailer._build_subject(snap)
+    for email in recipients:
+        tickers = tracking_helpers.load_watchlist(email, shared_fallback=False)
+        personal = digest_mailer._build_watchlist_section(tickers, snap)
+        html = digest_mailer.render_shared_html(snap).replace(digest_mailer._PERSONAL_SLOT, personal)
+        msg = digest_mailer.MIMEMultipart("alternative")
+        msg["Subject"], msg["From"], msg["To"] = subject, "bench@localhost", email
+        msg.attach(digest_mailer.MIMEText(html, "html"))
+        server = smtplib.SMTP("127.0.0.1", port)
+        server.login("bench@localhost", "x")
+        server.sendmail("bench@localhost", [email], msg.as_string())
+        server.quit()
+
+
+def _pipeline(recipients: List[str], snap, port: int) -> dict:
+    messages = digest_mailer.build_digests(recipients, snap)
+    sender = digest_mailer.DigestSender("bench@localhost", "x", "127.0.0.1", port,
+                                        connect=lambda h, p: smtplib.SMTP(h, p))
+    return sender.send_all(messages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark personalised digest delivery against a local SMTP stand-in.")
+    parser.add_argument("--recipients", type=int, default=200, help="Synthetic recipients")
+    parser.add_argument("--connect-ms", type=float, default=60, help="Greeting delay per connection (TLS + login stand-in)")
+    parser.add_argument("--rtt-ms", type=float, default=2, help="Delay per SMTP reply")
+    args = parser.parse_args()
+
+    snap = digest_mailer.DigestSnapshot.load()
+    universe = sorted({s.get("ticker") for s in snap.convergence + snap.insider + snap.news_signals if s.get("ticker")})
+    universe = universe or ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL", "META"]
+    recipients = [f"user{i}@example.com" for i in range(args.recipients)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracking_helpers.WATCHLIST_DIR = tmp
+        rng = random.Random(0)
+        for email in recipients:
+            Path(tmp, f"{email}.csv").write_text("\n".join(rng.sample(universe, min(6, len(universe)))))
+
+        server, port = _start_server(args.connect_ms, args.rtt_ms)
+        t0 = time.perf_counter()
+        _baseline(recipients, snap, port)
+        base_s = time.perf_counter() - t0
+        base_n = _SMTPHandler.received
+
+        t0 = time.perf_counter()
+        stats = _pipeline(recipients, snap, port)
+        pipe_s = time.perf_counter() - t0
+        pipe_n = _SMTPHandler.received - base_n
+        server.shutdown()
+
+    print(f"\n  Digest delivery benchmark  |  {args.recipients} recipients, "
+          f"connect {args.connect_ms:.0f} ms, reply {args.rtt_ms:.0f} ms")
+    print(f"  {'Run':<40} {'Seconds':>8} {'Msgs / s':>9} {'Delivered':>10}")
+    print(f"  {'─' * 70}")
+    print(f"  {'baseline (serial render, conn / msg)':<40} {base_s:>8.2f} {base_n / base_s:>9.1f} {base_n:>10}")
+    print(f"  {'pipeline (pooled render, 1 connection)':<40} {pipe_s:>8.2f} {pipe_n / pipe_s:>9.1f} {pipe_n:>10}")
+    print(f"\n  Speed-up: {base_s / pipe_s:.1f}×   Connections: {stats['connections']}   Failed: {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+bench_etfdb_parse.py — etfdb holdings page parse-time benchmark
+
+Times etf_holdings_fetcher's holdings parser (slice to the etf-holdings
+table, SoupStrainer, lxml when installed) against the previous approach
+(BeautifulSoup html.parser over the whole page, then find the table) on
+saved etfdb ETF pages, and checks both return the same holdings.
+
+Fixtures are plain .html files, one per ETF page. --fetch saves fresh pages
+for the given symbols into the fixture directory first (network, rate
+limited like the fetcher).
+
+Usage (from the repo root):
+  python scripts/bench_etfdb_parse.py path/to/etfdb_pages [--repeat 10]
+  python scripts/bench_etfdb_parse.py path/to/etfdb_pages --fetch QQQ SPY XLK
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from etf_holdings_fetcher import _HTML_PARSER, _parse_etfdb_holdings  # noqa: E402
+
+
+def _parse_full_page(html: str) -> List[Dict]:
+    """Baseline: the whole page through html.parser, then walk the table."""
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", {"id": "etf-holdings"})
+    tbody = table.find("tbody") if table else None
+    if not tbody:
+        return []
+    holdings: List[Dict] = []
+    for row in tbody.find_all("tr"):
+        cells = [td.get_text(strip=True) for td in row.find_all("td")]
+        if len(cells) < 3:
+            continue
+        try:
+            weight = round(float(cells[2].rstrip("%")) / 100.0, 6)
+        except ValueError:
+            weight = 0.0
+        if cells[0]:
+            holdings.append({"ticker": cells[0].upper(), "name": cells[1], "weight": weight})
+    return holdings
+
+
+def _fetch_fixtures(symbols: List[str], out_dir: Path) -> None:
+    from etf_holdings_fetcher import _etfdb, _get_page
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for sym in symbols:
+        try:
+            html = _etfdb.call(_get_page, f"https://etfdb.com/etf/{sym.upper()}/").text
+        except Exception as e:
+            print(f"  {sym}: fetch failed ({e})")
+            continue
+        (out_dir / f"{sym.upper()}.html").write_text(html, encoding="utf-8")
+        print(f"  {sym}: saved {len(html) / 1024:.0f} KB")
+
+
+def _time(fn, pages: List[str], repeat: int) -> float:
+    per_pass = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for html in pages:
+            fn(html)
+        per_pass.append(time.perf_counter() - t0)
+    return statistics.median(per_pass) / len(pages) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark etfdb holdings parsing on saved pages.")
+    parser.add_argument("fixtures", type=Path, help="Directory of saved etfdb .html pages")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes over the fixtures")
+    parser.add_argument("--fetch", nargs="+", metavar="SYMBOL", help="Save these ETF pages first")
+    args = parser.parse_args()
+
+    if args.fetch:
+        _fetch_fixtures(args.fetch, args.fixtures)
+
+    pages = [p.read_text(encoding="utf-8", errors="replace") for p in sorted(args.fixtures.glob("*.html"))]
+    if not pages:
+        sys.exit(f"No .html fixtures under {args.fixtures}")
+
+    mismatches = sum(1 for html in pages if _parse_full_page(html) != _parse_etfdb_holdings(html))
+    full_ms = _time(_parse_full_page, pages, args.repeat)
+    fast_ms = _time(_parse_etfdb_holdings, pages, args.repeat)
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+
+    print(f"\n  etfdb parse benchmark  |  {len(pages)} pages (avg {avg_kb:.0f} KB) × {args.repeat} passes")
+    print(f"  {'Parser':<34} {'ms / page':>10} {'pages / s':>10}")
+    print(f"  {'─' * 56}")
+    print(f"  {'full page, html.parser (baseline)':<34} {full_ms:>10.2f} {1000 / full_ms:>10,.0f}")
+    print(f"  {'table only, ' + _HTML_PARSER:<34} {fast_ms:>10.2f} {1000 / fast_ms:>10,.0f}")
+    print(f"\n  Speed-up: {full_ms / fast_ms:.1f}×   Holdings mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+bench_form4_parse.py — Form 4 parse-time benchmark
+
+Times insider_tracker's streaming Form 4 parser against the two paths it
+replaced, on a corpus of saved filings:
+
+  edgartools   — Form4.from_xml + market_trades, what filing.obj() did
+                 per filing (parse cost only; obj() also paid two requests)
+  full DOM     — ElementTree.fromstring + XPath finds over the whole document
+
+and checks the DOM and streaming parsers produce the same summaries.
+edgartools mismatches are reported separately: its role strings can
+differ slightly from _position_from_relationship.
+
+Results depend on the corpus mix: filings without a code-P purchase (the
+large majority of a day's Form 4s) are rejected by a byte scan, while
+purchase filings go through iterparse at roughly full-DOM cost. Benchmark
+on a real day of filings rather than a hand-picked set of buys.
+
+The corpus is any directory of Form 4 documents: bare XML, or full
+submission .txt files as served under Archives/edgar/data/ (e.g. an EDGAR
+mirror used with `insider_tracker.py --bulk --archive-root`).
+
+Usage (from the repo root):
+  python scripts/bench_form4_parse.py path/to/form4_corpus [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from edgar.ownership import Form4  # noqa: E402
+
+from insider_tracker import (  # noqa: E402
+    _ISSUER_CIK_RE,
+    _extract_ownership_xml,
+    _is_set,
+    _position_from_relationship,
+    _summarize_form4_obj,
+    _summarize_form4_xml,
+    _summarize_p_rows,
+)
+
+
+def _summarize_edgartools(raw: bytes, filing_date: str) -> Tuple[int, Dict]:
+    """Baseline: edgartools' Form4 object, as _summarize_form4 used before."""
+    m = _ISSUER_CIK_RE.search(raw)
+    form4 = Form4.from_xml(_extract_ownership_xml(raw).decode("utf-8"))
+    return int(m.group(1)) if m else 0, _summarize_form4_obj(form4, filing_date)
+
+
+def _summarize_dom(raw: bytes, filing_date: str) -> Tuple[int, Dict]:
+    """Baseline: build the whole tree, then query it."""
+    root = ET.fromstring(_extract_ownership_xml(raw))
+    issuer_cik = int(root.findtext("issuer/issuerCik") or 0)
+    owner = root.find("reportingOwner")
+    name = owner.findtext("reportingOwnerId/rptOwnerName") or "Unknown"
+    rel = owner.find("reportingOwnerRelationship")
+    position = _position_from_relationship(
+        (rel.findtext("officerTitle") or "").strip(),
+        _is_set(rel.findtext("isDirector")),
+        _is_set(rel.findtext("isTenPercentOwner")),
+    )
+    rows: List[Tuple[float, float, str]] = []
+    for txn in root.iterfind("nonDerivativeTable/nonDerivativeTransaction"):
+        if (txn.findtext("transactionCoding/transactionCode") or "").strip() != "P":
+            continue
+        rows.append((
+            float(txn.findtext("transactionAmounts/transactionShares/value") or 0),
+            float(txn.findtext("transactionAmounts/transactionPricePerShare/value") or 0),
+            (txn.findtext("transactionDate/value") or filing_date)[:10],
+        ))
+    if not rows:
+        return issuer_cik, {"no_p": True, "filing_date": filing_date}
+    return issuer_cik, _summarize_p_rows(name.strip(), position, rows, filing_date)
+
+
+def _time(fn, docs: List[bytes], repeat: int) -> List[float]:
+    per_pass = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for raw in docs:
+            fn(raw, "")
+        per_pass.append(time.perf_counter() - t0)
+    return per_pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Form 4 parsers on saved filings.")
+    parser.add_argument("corpus", type=Path, help="Directory of Form 4 .xml/.txt files")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    docs: List[bytes] = []
+    for path in sorted(args.corpus.rglob("*")):
+        if path.suffix.lower() in (".xml", ".txt"):
+            raw = path.read_bytes()
+            if b"<ownershipDocument" in raw:
+                docs.append(raw)
+    if not docs:
+        sys.exit(f"No Form 4 documents found under {args.corpus}")
+
+    mismatches = sum(1 for raw in docs if _summarize_dom(raw, "") != _summarize_form4_xml(raw, ""))
+    et_mismatches = sum(1 for raw in docs if _summarize_edgartools(raw, "") != _summarize_form4_xml(raw, ""))
+
+    n = len(docs)
+    et_ms = statistics.median(_time(_summarize_edgartools, docs, args.repeat)) / n * 1000
+    dom_ms = statistics.median(_time(_summarize_dom, docs, args.repeat)) / n * 1000
+    stream_ms = statistics.median(_time(_summarize_form4_xml, docs, args.repeat)) / n * 1000
+
+    print(f"\n  Form 4 parse benchmark  |  {n} filings × {args.repeat} passes")
+    print(f"  {'Parser':<22} {'ms / filing':>12} {'filings / s':>12}")
+    print(f"  {'─' * 48}")
+    print(f"  {'edgartools (baseline)':<22} {et_ms:>12.4f} {1000 / et_ms:>12,.0f}")
+    print(f"  {'full DOM':<22} {dom_ms:>12.4f} {1000 / dom_ms:>12,.0f}")
+    print(f"  {'streaming iterparse':<22} {stream_ms:>12.4f} {1000 / stream_ms:>12,.0f}")
+    print(f"\n  Speed-up vs edgartools: {et_ms / stream_ms:.1f}×   vs full DOM: {dom_ms / stream_ms:.2f}×")
+    print(f"  Summary mismatches: {mismatches} (DOM), {et_mismatches} (edgartools)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,28 @@
 """
 speech_backtest.py — Political Speech Signal Backtester
 
-Maps keyword mention events (from cached news signals) to ticker forward returns,
-using data/snp500_30day_wide.csv as the price source.
+Maps keyword mention events (from the news event log, data/news_events/) to
+ticker forward returns, using data/snp500_30day_wide.csv as the price source.
 
-For each keyword+ticker pair: hit_rate, avg_return_1d/2d/5d, sample_size.
+For each keyword+ticker pair: hit_rate, avg_return_1d/2d/5d, sample_size, plus
+a permutation p-value and bootstrap 95% CIs (significance_tests, vectorized
+across all pairs, fixed seed). The leaderboard ranks by p-value.
 Requires sample_size >= 3 before reporting (avoids overfitting noise).
 
-Data is sparse at first — framework strengthens as news cache accumulates.
+This is the keyword client of event_study.py: forward returns for every
+ticker and horizon come from its ReturnPanel (horizons × dates × tickers),
+and events are matched to it in one np.searchsorted batch over the date index.
+event_study.py also runs the same keyword events, insider buys and convergence
+verdicts against the market benchmark.
+
+Data is sparse at first — framework strengthens as the event log accumulates.
+
+backtest_all() is incremental: per-pair sufficient statistics and the events
+still waiting for their forward window live in data/backtest_state.json, and
+each run folds in only newly logged or newly matured events.
 
 CLI:
-  python speech_backtest.py --run
+  python speech_backtest.py --run [--full]
   python speech_backtest.py --leaderboard
 """
 
@@ -20,18 +32,29 @@ import argparse
 import json
 import logging
 import re
+import warnings
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import pandas as pd
 import numpy as np
 
+from event_study import HORIZONS, ReturnPanel, load_prices as _load_prices
+from news_event_log import LOG_DIR as NEWS_LOG_DIR, iter_events, read_logged_before, read_new_events
+
 BACKTEST_PATH = Path("data/backtest_results.json")
+STATE_PATH = Path("data/backtest_state.json")
 NEWS_CACHE_PATH = Path("data/news_signals.json")
-PRICE_CSV = Path("data/snp500_30day_wide.csv")
 MIN_SAMPLE_SIZE = 3
+N_RESAMPLES = 10_000
+SIGNIFICANCE_SEED = 7      # fixed so reruns on the same data give the same p-values
+RESAMPLE_CHUNK = 500       # resamples per vectorized block (bounds memory to chunk × events)
+_RSS_FORMAT = "%a, %d %b %Y %H:%M:%S %z"   # "Wed, 03 Jun 2026 00:15:15 +0000"
+DEDUP_WINDOW_DAYS = 14     # (keyword, ticker, day) keys remembered across incremental runs
+RETURNS_KEPT = 1000        # most recent 5d returns / signs kept per pair for median + significance
+PENDING_MAX_DAYS = 45      # events still short of a 10d window after this are folded as they are
 
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +63,8 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+_TS_MEMO: Dict[str, float] = {}   # published string -> epoch seconds (NaN if unparseable)
+
 # Keyword → sector/ticker affinity map (used to expand signals to related tickers)
 KEYWORD_TICKER_MAP: Dict[str, List[str]] = {
     "tariff":       ["AAPL", "NVDA", "MU", "INTC", "QCOM", "AMAT", "LRCX"],
@@ -69,89 +94,93 @@ KEYWORD_TICKER_MAP: Dict[str, List[str]] = {
 }
 
 
-# ── Price data ─────────────────────────────────────────────────────────────────
-def _load_prices() -> pd.DataFrame:
-    """Load wide-format price CSV; returns DataFrame indexed by date (date only)."""
-    if not PRICE_CSV.exists():
-        raise FileNotFoundError(f"{PRICE_CSV} not found — run update_snp500_history.py first.")
-    df = pd.read_csv(PRICE_CSV)
-    df["Date"] = pd.to_datetime(df["Date"], format="%m/%d/%y", errors="coerce")
-    df = df.dropna(subset=["Date"]).set_index("Date").sort_index()
-    return df
-
-
-def _forward_returns(prices: pd.DataFrame, ticker: str, event_date: datetime) -> Optional[Dict]:
-    """
-    Return forward returns for ticker at 1, 2, 5, 10 trading days after event_date.
-    Returns None if ticker not in prices or insufficient future data.
-    """
-    if ticker not in prices.columns:
-        return None
-
-    series = prices[ticker].dropna()
-    future = series[series.index > pd.Timestamp(event_date)]
-
-    if future.empty:
-        return None
-
-    base = float(series[series.index <= pd.Timestamp(event_date)].iloc[-1]) if not series[series.index <= pd.Timestamp(event_date)].empty else float(future.iloc[0])
-
-    def _ret(n: int) -> Optional[float]:
-        if len(future) >= n:
-            return round(float(future.iloc[n - 1] - base) / base * 100, 4)
-        return None
-
-    return {"r1d": _ret(1), "r2d": _ret(2), "r5d": _ret(5), "r10d": _ret(10)}
-
-
 # ── Signal event loading ───────────────────────────────────────────────────────
-def _load_news_events() -> List[Dict]:
+def _load_news_events() -> Iterator[Dict]:
     """
-    Load cached news signals. Each entry: {ticker, keyword, direction, published}.
-    Falls back to empty list (fresh install) — framework populates over time.
+    Stream the full news event history. Each entry: {ticker, keyword, direction, published}.
+    Falls back to the latest news_signals.json snapshot when the log is still
+    empty, and to nothing on a fresh install — framework populates over time.
     """
-    if not NEWS_CACHE_PATH.exists():
-        return []
+    found = False
+    for event in iter_events():
+        found = True
+        yield event
+    if found or not NEWS_CACHE_PATH.exists():
+        return
     try:
         data = json.loads(NEWS_CACHE_PATH.read_text(encoding="utf-8"))
-        return data.get("signals", [])
+        yield from data.get("signals", [])
     except Exception as e:
         log.warning(f"Could not load news cache: {e}")
-        return []
 
 
 def _parse_event_date(published_str: str) -> Optional[datetime]:
-    """Parse RSS published string to datetime."""
+    """Parse one RSS published string to naive UTC (slow path for odd formats)."""
     if not published_str:
         return None
-    # Typical: "Wed, 03 Jun 2026 00:15:15 +0000"
-    for fmt in ("%a, %d %b %Y %H:%M:%S %z", "%a, %d %b %Y %H:%M:%S +0000"):
-        try:
-            return datetime.strptime(published_str, fmt).replace(tzinfo=None)
-        except ValueError:
-            pass
-    # Fallback: try pandas
     try:
         return pd.to_datetime(published_str, utc=True).tz_localize(None).to_pydatetime()
     except Exception:
         return None
 
 
-def _build_event_table() -> List[Dict]:
+def _event_times(signals: List[Dict]) -> List[Optional[datetime]]:
     """
-    Build a flat list of (keyword, ticker, direction, event_date) events by:
-    1. Loading news cache signals (ticker-keyed events)
-    2. Expanding via KEYWORD_TICKER_MAP for political/macro keywords
+    Naive-UTC publication time per signal. Signals logged with `published_ts`
+    (epoch seconds, set by news_fetcher) need no parsing; legacy ones are
+    parsed once per distinct string: one pd.to_datetime call with the RSS
+    format, one more for the leftovers, then one by one for whatever is
+    still unparsed. Every result is memoised.
+    """
+    epoch = np.full(len(signals), np.nan)
+    todo: Dict[str, List[int]] = defaultdict(list)
+    for i, sig in enumerate(signals):
+        ts = sig.get("published_ts")
+        if ts is not None:
+            epoch[i] = ts
+            continue
+        published = sig.get("published") or ""
+        if published in _TS_MEMO:
+            epoch[i] = _TS_MEMO[published]
+        else:
+            todo[published].append(i)
+
+    if todo:
+        strings = list(todo)
+        parsed = pd.to_datetime(pd.Series(strings, dtype=object), format=_RSS_FORMAT, errors="coerce", utc=True)
+        values = (parsed - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy(dtype=np.float64, copy=True)
+        odd = np.flatnonzero(np.isnan(values) & np.array([bool(t) for t in strings]))
+        if len(odd):   # second batch: whatever single format pandas infers for the leftovers
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)   # "could not infer format" — expected here
+                again = pd.to_datetime(pd.Series([strings[k] for k in odd], dtype=object), errors="coerce", utc=True)
+            values[odd] = (again - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy(dtype=np.float64)
+        for k in np.flatnonzero(np.isnan(values) & np.array([bool(t) for t in strings])):
+            dt = _parse_event_date(strings[k])
+            values[k] = dt.replace(tzinfo=timezone.utc).timestamp() if dt else np.nan
+        _TS_MEMO.update(zip(strings, values.tolist()))
+        rows = np.concatenate([todo[t] for t in strings])
+        epoch[rows] = np.repeat(values, [len(todo[t]) for t in strings])
+
+    known = ~np.isnan(epoch)
+    stamps = np.full(len(signals), None, dtype=object)
+    stamps[known] = pd.to_datetime(epoch[known], unit="s").to_pydatetime()
+    return stamps.tolist()
+
+
+def _expand_events(signals: Iterable[Dict], seen: Set[Tuple[str, str, str]]) -> List[Dict]:
+    """
+    Turn news signals into (keyword, ticker, direction, event_date) events:
+    the signal's own ticker plus its keyword's related tickers from
+    KEYWORD_TICKER_MAP. One event per (keyword, ticker, day); `seen` holds the
+    keys already emitted and is updated in place.
     """
+    signals = list(signals)
     events: List[Dict] = []
-    seen = set()
-
-    news_events = _load_news_events()
-    for sig in news_events:
+    for sig, dt in zip(signals, _event_times(signals)):
         kw = sig.get("keyword", "")
         ticker = sig.get("ticker", "")
         direction = sig.get("direction", "→")
-        dt = _parse_event_date(sig.get("published", ""))
         if not dt:
             dt = datetime.utcnow() - timedelta(days=1)  # treat as yesterday
 
@@ -171,18 +200,79 @@ def _build_event_table() -> List[Dict]:
     return events
 
 
-# ── Core backtester ───────────────────────────────────────────────────────────
-def backtest_keyword(keyword: str, ticker: str, prices: Optional[pd.DataFrame] = None) -> Dict:
+def _build_event_table() -> List[Dict]:
     """
-    Backtest a keyword+ticker pair against historical price data.
-    Returns a result dict including hit_rate and forward returns.
+    Build a flat list of (keyword, ticker, direction, event_date) events by:
+    1. Streaming the news event log (ticker-keyed events)
+    2. Expanding via KEYWORD_TICKER_MAP for political/macro keywords
     """
-    if prices is None:
-        prices = _load_prices()
+    return _expand_events(_load_news_events(), set())
+
+
+def _group_events(events: List[Dict]) -> Dict[Tuple[str, str], List[Dict]]:
+    """Bucket the event table by (keyword lower-case, ticker upper-case) in one pass."""
+    groups: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+    for e in events:
+        groups[(e["keyword"].lower(), e["ticker"].upper())].append(e)
+    return groups
 
-    events = [e for e in _build_event_table()
-               if e["keyword"].lower() == keyword.lower() and e["ticker"].upper() == ticker.upper()]
 
+# ── Significance ──────────────────────────────────────────────────────────────
+def significance_tests(panel: ReturnPanel, tickers: List[str], signs: np.ndarray, returns_5d: np.ndarray,
+                       bounds: np.ndarray, n_resamples: int = N_RESAMPLES,
+                       seed: int = SIGNIFICANCE_SEED) -> Dict[str, np.ndarray]:
+    """
+    Resampling statistics for many pairs at once. Events of pair i are
+    positions bounds[i]:bounds[i+1] of the flat arrays; `signs` is +1 / -1 / 0
+    for ↑ / ↓ / →.
+
+    p_value   — permutation test: each event is moved to a random date with a
+                5d return for its own ticker (random-offset matrix into the
+                panel), keeping its direction; p = (1 + #null ≥ observed) / (1 + n).
+    *_ci_*    — 95% percentile bootstrap (events resampled with replacement)
+                for the hit rate and the average 5d return.
+    """
+    rng = np.random.default_rng(seed)
+    n_pairs = len(bounds) - 1
+    sizes = np.diff(bounds)
+    starts = bounds[:-1]
+    pair_of = np.repeat(np.arange(n_pairs), sizes)
+
+    # 5d returns of every ticker on every date it has one, packed per ticker
+    r5 = panel.returns[panel.horizons.index(5)]
+    cols = np.array([panel.ticker_index[t] for t in tickers], dtype=np.int64)
+    pool_by_col = [r5[~np.isnan(r5[:, c]), c] for c in range(r5.shape[1])]
+    pool = np.concatenate(pool_by_col) if pool_by_col else np.empty(0)
+    pool_start = np.concatenate([[0], np.cumsum([len(p) for p in pool_by_col])])[:-1]
+    pool_size = np.array([len(p) for p in pool_by_col])
+
+    observed = np.add.reduceat(signs * returns_5d > 0, starts) / sizes
+    exceed = np.zeros(n_pairs)
+    boot_hit = np.empty((n_resamples, n_pairs))
+    boot_ret = np.empty((n_resamples, n_pairs))
+
+    for lo in range(0, n_resamples, RESAMPLE_CHUNK):
+        n = min(RESAMPLE_CHUNK, n_resamples - lo)
+        offsets = (rng.random((n, len(cols))) * pool_size[cols]).astype(np.int64)
+        null_hits = signs * pool[pool_start[cols] + offsets] > 0
+        exceed += (np.add.reduceat(null_hits, starts, axis=1) / sizes >= observed - 1e-12).sum(axis=0)
+
+        picks = starts[pair_of] + (rng.random((n, len(cols))) * sizes[pair_of]).astype(np.int64)
+        boot_hit[lo:lo + n] = np.add.reduceat(signs[picks] * returns_5d[picks] > 0, starts, axis=1) / sizes
+        boot_ret[lo:lo + n] = np.add.reduceat(returns_5d[picks], starts, axis=1) / sizes
+
+    hit_ci = np.percentile(boot_hit, [2.5, 97.5], axis=0)
+    ret_ci = np.percentile(boot_ret, [2.5, 97.5], axis=0)
+    return {
+        "p_value": (1 + exceed) / (1 + n_resamples),
+        "hit_rate_ci_low": hit_ci[0], "hit_rate_ci_high": hit_ci[1],
+        "avg_return_5d_ci_low": ret_ci[0], "avg_return_5d_ci_high": ret_ci[1],
+    }
+
+
+# ── Core backtester ───────────────────────────────────────────────────────────
+def _evaluate_pair(keyword: str, ticker: str, events: List[Dict], fwd: np.ndarray) -> Dict:
+    """Score one pair from its events and their (horizons × events) forward returns."""
     if len(events) < MIN_SAMPLE_SIZE:
         return {
             "keyword": keyword, "ticker": ticker,
@@ -191,24 +281,9 @@ def backtest_keyword(keyword: str, ticker: str, prices: Optional[pd.DataFrame] =
             "note": f"Need ≥{MIN_SAMPLE_SIZE} events; have {len(events)}."
         }
 
-    returns_1d, returns_2d, returns_5d, returns_10d = [], [], [], []
-    directions = []
-
-    for e in events:
-        fwd = _forward_returns(prices, ticker, e["event_date"])
-        if fwd is None:
-            continue
-        if fwd["r1d"] is not None:
-            returns_1d.append(fwd["r1d"])
-        if fwd["r2d"] is not None:
-            returns_2d.append(fwd["r2d"])
-        if fwd["r5d"] is not None:
-            returns_5d.append(fwd["r5d"])
-            directions.append(e["direction"])
-        if fwd["r10d"] is not None:
-            returns_10d.append(fwd["r10d"])
-
-    if not directions:
+    r1, r2, r5, r10 = (fwd[HORIZONS.index(h)] for h in (1, 2, 5, 10))
+    has5 = ~np.isnan(r5)
+    if not has5.any():
         return {
             "keyword": keyword, "ticker": ticker,
             "sample_size": len(events),
@@ -216,53 +291,240 @@ def backtest_keyword(keyword: str, ticker: str, prices: Optional[pd.DataFrame] =
             "note": "Events found but no matching forward price data yet."
         }
 
-    correct = sum(
-        1 for d, r in zip(directions, returns_5d)
-        if (d == "↑" and r > 0) or (d == "↓" and r < 0)
-    )
-    hit_rate = correct / len(directions) if directions else 0.0
-    dominant_dir = max(set(directions), key=directions.count)
+    directions = np.array([e["direction"] for e in events], dtype=object)[has5]
+    returns_5d = r5[has5]
+    correct = ((directions == "↑") & (returns_5d > 0)) | ((directions == "↓") & (returns_5d < 0))
+    dir_list = list(directions)
+    dominant_dir = max(set(dir_list), key=dir_list.count)
 
-    def _safe_avg(lst):
-        return round(float(np.mean(lst)), 4) if lst else None
+    def _safe_avg(arr):
+        arr = arr[~np.isnan(arr)]
+        return round(float(np.mean(arr)), 4) if arr.size else None
 
-    def _safe_median(lst):
-        return round(float(np.median(lst)), 4) if lst else None
+    def _safe_median(arr):
+        arr = arr[~np.isnan(arr)]
+        return round(float(np.median(arr)), 4) if arr.size else None
 
     return {
         "keyword": keyword,
         "ticker": ticker,
         "direction": dominant_dir,
-        "hit_rate": round(hit_rate, 4),
-        "avg_return_1d": _safe_avg(returns_1d),
-        "avg_return_2d": _safe_avg(returns_2d),
+        "hit_rate": round(float(correct.mean()), 4),
+        "avg_return_1d": _safe_avg(r1),
+        "avg_return_2d": _safe_avg(r2),
         "avg_return_5d": _safe_avg(returns_5d),
         "median_return_5d": _safe_median(returns_5d),
-        "avg_return_10d": _safe_avg(returns_10d),
-        "sample_size": len(directions),
+        "avg_return_10d": _safe_avg(r10),
+        "sample_size": int(has5.sum()),
+        "insufficient_data": False,
+        "last_updated": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+
+
+def backtest_keyword(keyword: str, ticker: str, prices: Optional[pd.DataFrame] = None,
+                     events: Optional[List[Dict]] = None, panel: Optional[ReturnPanel] = None) -> Dict:
+    """
+    Backtest a keyword+ticker pair against historical price data.
+    Returns a result dict including hit_rate and forward returns.
+    `events` is the pair's own events; when omitted the event table is built
+    and filtered here. backtest_all scores every pair from one batch lookup.
+    """
+    if panel is None:
+        panel = ReturnPanel(prices if prices is not None else _load_prices())
+    if events is None:
+        events = _group_events(_build_event_table()).get((keyword.lower(), ticker.upper()), [])
+    fwd = panel.lookup([ticker.upper()] * len(events), [e["event_date"] for e in events])
+    return _evaluate_pair(keyword, ticker, events, fwd)
+
+
+def _add_significance(panel: ReturnPanel, pairs: List[Tuple[str, str]], stats: List[Dict],
+                      results: List[Dict]) -> None:
+    """Attach p-values and CIs to every scored pair from its stored 5d returns and directions."""
+    scored = [i for i, r in enumerate(results) if not r.get("insufficient_data")]
+    if not scored:
+        return
+    tickers = [pairs[i][1] for i in scored for _ in stats[i]["r5"]]
+    signs = np.concatenate([np.asarray(stats[i]["signs"], dtype=np.int8) for i in scored])
+    rets = np.concatenate([np.asarray(stats[i]["r5"], dtype=np.float64) for i in scored])
+    bounds = np.cumsum([0] + [len(stats[i]["r5"]) for i in scored])
+
+    sig = significance_tests(panel, tickers, signs, rets, bounds)
+    for k, i in enumerate(scored):
+        results[i].update({name: round(float(v[k]), 4) for name, v in sig.items()})
+    log.info(f"Significance: {len(scored)} pairs × {N_RESAMPLES:,} resamples")
+
+
+# ── Incremental state ─────────────────────────────────────────────────────────
+# data/backtest_state.json keeps, per keyword+ticker pair, the sufficient
+# statistics of every folded event (count / sum / sum of squares per horizon,
+# directional hits, direction counts) plus the 5d returns and direction signs
+# the median and significance tests need, capped at the RETURNS_KEPT most
+# recent. Events whose 10d window is not
+# complete yet wait in `pending`; `offsets` records how far into each news
+# log segment has been read. A run reads only new log lines, re-checks the
+# pending events and folds in the ones that matured.
+def _pair_key(keyword: str, ticker: str) -> str:
+    return f"{keyword.lower()}|{ticker.upper()}"
+
+
+def _empty_stats() -> Dict:
+    n = len(HORIZONS)
+    return {"events": 0, "count": [0] * n, "sum": [0.0] * n, "sumsq": [0.0] * n,
+            "hits": 0, "directions": {}, "r5": [], "signs": []}
+
+
+def _empty_state() -> Dict:
+    return {"offsets": {}, "seen": [], "pending": [], "pairs": {}}
+
+
+def _load_state() -> Dict:
+    if STATE_PATH.exists():
+        try:
+            return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+        except Exception as e:
+            log.warning(f"Could not read {STATE_PATH} ({e}) — rebuilding from the full event log.")
+    return _empty_state()
+
+
+def _save_state(state: Dict) -> None:
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+    tmp.replace(STATE_PATH)
+
+
+def _fold_events(state: Dict, events: List[Dict], fwd: np.ndarray) -> None:
+    """Add matured events (and their horizons × events returns) to the pair statistics."""
+    i5 = HORIZONS.index(5)
+    for j, e in enumerate(events):
+        st = state["pairs"].setdefault(_pair_key(e["keyword"], e["ticker"]), _empty_stats())
+        st["events"] += 1
+        for h in range(len(HORIZONS)):
+            r = fwd[h, j]
+            if not np.isnan(r):
+                st["count"][h] += 1
+                st["sum"][h] += float(r)
+                st["sumsq"][h] += float(r) * float(r)
+        r5 = fwd[i5, j]
+        if np.isnan(r5):
+            continue
+        sign = {"↑": 1, "↓": -1}.get(e["direction"], 0)
+        st["hits"] += int(sign * r5 > 0)
+        st["directions"][e["direction"]] = st["directions"].get(e["direction"], 0) + 1
+        st["r5"].append(float(r5))
+        st["signs"].append(sign)
+        if len(st["r5"]) > RETURNS_KEPT:
+            del st["r5"][:-RETURNS_KEPT], st["signs"][:-RETURNS_KEPT]
+
+
+def _result_from_stats(keyword: str, ticker: str, st: Dict, pending: int) -> Dict:
+    """The backtest_keyword result shape, from a pair's sufficient statistics."""
+    if st["events"] < MIN_SAMPLE_SIZE:
+        return {
+            "keyword": keyword, "ticker": ticker,
+            "sample_size": st["events"], "pending_events": pending,
+            "insufficient_data": True,
+            "note": f"Need ≥{MIN_SAMPLE_SIZE} events; have {st['events']}."
+        }
+    i5 = HORIZONS.index(5)
+    n5 = st["count"][i5]
+    if not n5:
+        return {
+            "keyword": keyword, "ticker": ticker,
+            "sample_size": st["events"], "pending_events": pending,
+            "insufficient_data": True,
+            "note": "Events found but no matching forward price data yet."
+        }
+
+    def _avg(h: int) -> Optional[float]:
+        i = HORIZONS.index(h)
+        return round(st["sum"][i] / st["count"][i], 4) if st["count"][i] else None
+
+    var5 = max(st["sumsq"][i5] / n5 - (st["sum"][i5] / n5) ** 2, 0.0)
+    return {
+        "keyword": keyword,
+        "ticker": ticker,
+        "direction": max(st["directions"], key=st["directions"].get),
+        "hit_rate": round(st["hits"] / n5, 4),
+        "avg_return_1d": _avg(1),
+        "avg_return_2d": _avg(2),
+        "avg_return_5d": _avg(5),
+        "median_return_5d": round(float(np.median(st["r5"])), 4),
+        "std_return_5d": round(var5 ** 0.5, 4),
+        "avg_return_10d": _avg(10),
+        "sample_size": n5,
+        "pending_events": pending,
         "insufficient_data": False,
         "last_updated": datetime.utcnow().isoformat(timespec="seconds"),
     }
 
 
-def backtest_all() -> Dict:
-    """Run backtests for all keyword+ticker pairs in KEYWORD_TICKER_MAP."""
+def backtest_all(full: bool = False) -> Dict:
+    """
+    Update backtests for all keyword+ticker pairs in KEYWORD_TICKER_MAP,
+    folding only events logged since the last run (full=True starts over).
+    """
     log.info("Loading prices...")
-    prices = _load_prices()
-    available_tickers = set(prices.columns)
-
-    results: List[Dict] = []
-    for kw, tickers in KEYWORD_TICKER_MAP.items():
-        for ticker in tickers:
-            if ticker not in available_tickers:
-                log.debug(f"[{ticker}] not in price data — skipping")
-                continue
-            r = backtest_keyword(kw, ticker, prices)
-            results.append(r)
+    panel = ReturnPanel(_load_prices())
+    available_tickers = set(panel.tickers)
+    pairs = [
+        (kw, ticker) for kw, tickers in KEYWORD_TICKER_MAP.items()
+        for ticker in tickers if ticker in available_tickers
+    ]
+    wanted = {_pair_key(kw, t) for kw, t in pairs}
+
+    # Without a log yet, score the latest news snapshot from scratch and keep no state
+    persist = any(NEWS_LOG_DIR.glob("*.jsonl"))
+    state = _load_state() if persist and not full else _empty_state()
+    consumed = state["offsets"]
+    if persist:
+        signals, state["offsets"] = read_new_events(consumed)
+    else:
+        signals = list(_load_news_events())
+
+    cutoff = (datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS)).date().isoformat()
+    seen = {tuple(k) for k in state["seen"] if k[2] >= cutoff}
+    # Headlines published before the window can still be logged late (e.g. a
+    # ticker fetched for the first time). Their day's keys have left `seen`,
+    # so rebuild them from what earlier runs read of that month's segment.
+    late = {dt.strftime("%Y-%m") for dt in _event_times(signals) if dt and dt.date().isoformat() < cutoff}
+    if late:
+        _expand_events(read_logged_before(consumed, late), seen)
+    new_events = [e for e in _expand_events(signals, seen) if _pair_key(e["keyword"], e["ticker"]) in wanted]
+    state["seen"] = sorted(k for k in seen if k[2] >= cutoff)
+
+    pending = [dict(e, event_date=datetime.fromisoformat(e["event_date"])) for e in state["pending"]]
+    candidates = pending + new_events
+    fwd = panel.lookup([e["ticker"].upper() for e in candidates], [e["event_date"] for e in candidates])
+
+    # matured: every horizon is in, or the event is too old to wait any longer
+    stale = datetime.utcnow() - timedelta(days=PENDING_MAX_DAYS)
+    matured = ~np.isnan(fwd[-1]) | np.array([e["event_date"] < stale for e in candidates], dtype=bool)
+    ready = np.flatnonzero(matured)
+    _fold_events(state, [candidates[i] for i in ready], fwd[:, ready])
+    state["pending"] = [
+        dict(candidates[i], event_date=candidates[i]["event_date"].isoformat())
+        for i in np.flatnonzero(~matured)
+    ]
+    log.info(f"Backtest: {len(new_events)} new event(s), {len(ready)} folded, {len(state['pending'])} pending")
+
+    pending_by_pair = defaultdict(int)
+    for e in state["pending"]:
+        pending_by_pair[_pair_key(e["keyword"], e["ticker"])] += 1
+    stats = [state["pairs"].get(_pair_key(kw, t), _empty_stats()) for kw, t in pairs]
+    results: List[Dict] = [
+        _result_from_stats(kw, t, st, pending_by_pair[_pair_key(kw, t)])
+        for (kw, t), st in zip(pairs, stats)
+    ]
+    _add_significance(panel, pairs, stats, results)
+    if persist:
+        _save_state(state)
 
     payload = {
         "generated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "n_resamples": N_RESAMPLES,
         "total_pairs": len(results),
+        "pending_events": len(state["pending"]),
         "results": results,
     }
     BACKTEST_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -292,10 +554,16 @@ def get_best_signals(min_hit_rate: float = 0.55, min_sample: int = MIN_SAMPLE_SI
     ]
 
 
+def _leaderboard_key(r: Dict) -> Tuple[float, float]:
+    """Most significant first (results saved before p-values existed sort last), then hit rate."""
+    return (r.get("p_value", 1.0), -r.get("hit_rate", 0))
+
+
 def get_signal_leaderboard() -> List[Dict]:
-    """All valid results sorted by hit_rate descending."""
+    """All valid results, most significant first: p_value ascending, then hit_rate descending.
+    Each entry carries p_value and 95% CIs (hit_rate_ci_low/high, avg_return_5d_ci_low/high)."""
     valid = [r for r in _load_results() if not r.get("insufficient_data")]
-    return sorted(valid, key=lambda r: r.get("hit_rate", 0), reverse=True)
+    return sorted(valid, key=_leaderboard_key)
 
 
 # ── CLI ────────────────────────────────────────────────────────────────────────
@@ -304,20 +572,21 @@ def main() -> None:
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--run", action="store_true", help="Run full backtest and save results")
     group.add_argument("--leaderboard", action="store_true", help="Print signal leaderboard from saved results")
+    parser.add_argument("--full", action="store_true", help="With --run: discard stored statistics and replay every event")
     args = parser.parse_args()
 
     if args.run:
-        payload = backtest_all()
+        payload = backtest_all(full=args.full)
         valid = [r for r in payload["results"] if not r.get("insufficient_data")]
         print(f"\n{'═'*80}")
         print(f"  Backtest complete  |  {payload['total_pairs']} pairs tested, {len(valid)} with sufficient data")
         print(f"  Results saved → {BACKTEST_PATH}")
         print(f"{'═'*80}\n")
         if valid:
-            _print_leaderboard(sorted(valid, key=lambda r: r.get("hit_rate", 0), reverse=True))
+            _print_leaderboard(sorted(valid, key=_leaderboard_key))
         else:
             print("  ⚠️  No pairs have sufficient data (≥3 events) yet.")
-            print("  Run get_news_signals() regularly to accumulate events — signals strengthen over time.")
+            print("  Run get_news_signals() regularly to grow the event log — signals strengthen over time.")
     else:
         board = get_signal_leaderboard()
         print(f"\n{'═'*80}")
@@ -330,18 +599,23 @@ def main() -> None:
 
 
 def _print_leaderboard(results: List[Dict]) -> None:
-    header = f"  {'Keyword':<20} {'Ticker':<7} {'Dir':>3} {'HitRate':>8} {'Avg5d%':>8} {'Med5d%':>8} {'N':>4}"
+    header = (f"  {'Keyword':<20} {'Ticker':<7} {'Dir':>3} {'HitRate':>8} {'95% CI':>13} "
+              f"{'p':>7} {'Avg5d%':>8} {'Med5d%':>8} {'N':>4}")
     print(header)
     print("  " + "─" * (len(header) - 2))
     for r in results[:20]:
         avg5 = r.get("avg_return_5d")
         med5 = r.get("median_return_5d")
+        p = r.get("p_value")
+        ci = (f"{r['hit_rate_ci_low']*100:.0f}–{r['hit_rate_ci_high']*100:.0f}%"
+              if "hit_rate_ci_low" in r else "N/A")
         print(
             f"  {r['keyword']:<20} {r['ticker']:<7} {r.get('direction','?'):>3} "
-            f"{r['hit_rate']*100:>7.1f}%  "
-            f"{avg5*100:>7.2f}%  " if avg5 is not None else f"{'N/A':>8}  "
-            f"{med5*100:>7.2f}%  " if med5 is not None else f"{'N/A':>8}  "
-            f"{r['sample_size']:>4}"
+            f"{r['hit_rate']*100:>7.1f}% {ci:>13} "
+            + (f"{p:>7.4f} " if p is not None else f"{'N/A':>7} ")
+            + (f"{avg5:>7.2f}% " if avg5 is not None else f"{'N/A':>8} ")   # returns are in percent
+            + (f"{med5:>7.2f}% " if med5 is not None else f"{'N/A':>8} ")
+            + f"{r['sample_size']:>4}"
         )
 
 
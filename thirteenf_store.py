@@ -0,0 +1,278 @@
+"""
+thirteenf_store.py — Per-accession 13F cache + quarter-over-quarter diffs
+
+Every 13F-HR information table parsed from EDGAR is written once to a
+compact columnar file keyed by accession number:
+
+  data/13f/{cik}/{accession}.parquet     cusip, issuer, ticker, title_class, shares, value
+
+with data/13f/index.json listing each filer's cached accessions and report
+periods, so walking a fund's history never re-parses a quarter. Option
+rows (PutCall set) are left out — the diff tracks the equity book.
+
+Files keep the tickers as filed. Tickers the filing left blank are filled
+offline from the CUSIP index (cusip_index.py) whenever holdings are read,
+and every new table teaches the index its CUSIP → ticker pairs.
+
+The diff engine hash-joins two quarters on CUSIP (pandas merge) and labels
+each position new / added / trimmed / exited / unchanged, so multi-quarter
+histories come straight from the cache.
+
+Functions:
+  normalize_infotable(df)                     -> one row per CUSIP, store columns
+  store_filing(cik, filing, scheduler=None)   -> cached holdings for one 13F-HR filing
+  cache_fund_history(cik, quarters, scheduler=None) -> index entries, newest first
+  list_quarters(cik)                          -> cached index entries, newest first
+  load_holdings(cik, accession)               -> DataFrame
+  diff_holdings(prev, curr)                   -> per-CUSIP change DataFrame
+  fund_diffs(cik, quarters=4)                 -> [(prev_entry, curr_entry, diff_df), ...]
+
+CLI:
+  python thirteenf_store.py --cik 0001067983 [--quarters 4] [--fetch]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cusip_index import learn_from_holdings, resolve_tickers
+from rate_limit import SEC_BUCKET, RequestScheduler
+
+STORE_DIR = Path("data/13f")
+INDEX_PATH = STORE_DIR / "index.json"
+EDGAR_IDENTITY = "SmartPortfolioBot research@smartportfoliobot.com"
+
+COLUMNS = ["cusip", "issuer", "ticker", "title_class", "shares", "value"]
+
+# edgartools column → store column
+_RENAME = {
+    "Cusip": "cusip",
+    "Issuer": "issuer",
+    "Ticker": "ticker",
+    "Class": "title_class",
+    "SharesPrnAmount": "shares",
+    "Value": "value",
+}
+
+log = logging.getLogger(__name__)
+
+_INDEX_LOCK = threading.Lock()
+
+
+def _cik_key(cik) -> str:
+    return str(int(cik)).zfill(10)
+
+
+# ── Index ──────────────────────────────────────────────────────────────────────
+def _load_index() -> Dict[str, List[Dict]]:
+    if INDEX_PATH.exists():
+        try:
+            return json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+        except Exception as e:
+            log.warning(f"Could not read {INDEX_PATH} ({e}) — rebuilding.")
+    return {}
+
+
+def _record_in_index(cik: str, entry: Dict) -> None:
+    with _INDEX_LOCK:
+        index = _load_index()
+        rows = [e for e in index.get(cik, []) if e["accession"] != entry["accession"]]
+        rows.append(entry)
+        rows.sort(key=lambda e: (e.get("period") or "", e["filing_date"]), reverse=True)
+        index[cik] = rows
+        INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        INDEX_PATH.write_text(json.dumps(index, indent=1), encoding="utf-8")
+
+
+def list_quarters(cik) -> List[Dict]:
+    """Cached filings for a filer, newest report period first:
+    {accession, filing_date, period, positions, total_value}"""
+    return _load_index().get(_cik_key(cik), [])
+
+
+# ── Storage ────────────────────────────────────────────────────────────────────
+def _holdings_path(cik: str, accession: str) -> Path:
+    return STORE_DIR / cik / f"{accession}.parquet"
+
+
+def normalize_infotable(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce an edgartools information table to one equity row per CUSIP:
+    drop put/call rows, sum shares and value across lines (a filer may
+    report one security under several managers), keep the first issuer,
+    ticker and class seen.
+    """
+    df = df.rename(columns=lambda c: c.strip()).rename(columns=_RENAME)
+    if "PutCall" in df.columns:
+        df = df[df["PutCall"].fillna("").astype(str).str.strip() == ""]
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = "" if col in ("issuer", "ticker", "title_class") else 0
+    df = df[COLUMNS].copy()
+    df["cusip"] = df["cusip"].astype(str).str.strip().str.upper()
+    for col in ("issuer", "ticker", "title_class"):
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    df["shares"] = pd.to_numeric(df["shares"], errors="coerce").fillna(0).astype(np.int64)
+    df["value"] = pd.to_numeric(df["value"], errors="coerce").fillna(0).astype(np.int64)
+
+    out = df.groupby("cusip", sort=False).agg(
+        issuer=("issuer", "first"),
+        ticker=("ticker", "first"),
+        title_class=("title_class", "first"),
+        shares=("shares", "sum"),
+        value=("value", "sum"),
+    ).reset_index()
+    return out.sort_values("value", ascending=False, ignore_index=True)[COLUMNS]
+
+
+def load_holdings(cik, accession: str) -> pd.DataFrame:
+    return resolve_tickers(pd.read_parquet(_holdings_path(_cik_key(cik), accession)))
+
+
+def store_filing(cik, filing, scheduler: Optional[RequestScheduler] = None) -> pd.DataFrame:
+    """
+    Return the holdings of one 13F-HR filing, parsing and caching it only
+    the first time its accession number is seen.
+    """
+    cik = _cik_key(cik)
+    accession = str(filing.accession_no)
+    path = _holdings_path(cik, accession)
+    if path.exists():
+        return resolve_tickers(pd.read_parquet(path))
+
+    scheduler = scheduler or RequestScheduler(SEC_BUCKET, name="13f")
+    obj = scheduler.call(filing.obj, cost=3)   # filing index + primary doc + information table
+    table = getattr(obj, "infotable", None)
+    if table is None or len(table) == 0:
+        table = obj.holdings
+    holdings = normalize_infotable(table)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    holdings.to_parquet(path, index=False, compression="zstd")
+    _record_in_index(cik, {
+        "accession": accession,
+        "filing_date": str(filing.filing_date),
+        "period": str(getattr(obj, "report_period", "") or getattr(filing, "period_of_report", "") or ""),
+        "positions": int(len(holdings)),
+        "total_value": int(holdings["value"].sum()),
+    })
+    log.info(f"[{cik}] cached 13F {accession}: {len(holdings)} positions")
+    learn_from_holdings(holdings)
+    return resolve_tickers(holdings)
+
+
+def cache_fund_history(cik, quarters: int = 4, scheduler: Optional[RequestScheduler] = None) -> List[Dict]:
+    """Make sure the latest `quarters` 13F-HR filings of a filer are cached."""
+    import edgar
+
+    scheduler = scheduler or RequestScheduler(SEC_BUCKET, name="13f")
+    edgar.set_identity(EDGAR_IDENTITY)
+    entity = scheduler.call(edgar.get_entity, _cik_key(cik))
+    filings = scheduler.call(entity.get_filings, form="13F-HR")
+    if not filings or len(filings) == 0:
+        raise RuntimeError(f"No 13F-HR filings found for CIK {cik}")
+
+    for i in range(min(quarters, len(filings))):
+        store_filing(cik, filings[i], scheduler)
+    return list_quarters(cik)[:quarters]
+
+
+# ── Diff engine ────────────────────────────────────────────────────────────────
+def diff_holdings(prev: pd.DataFrame, curr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join two quarters on CUSIP and label each position:
+      new      — held now, not last quarter
+      exited   — held last quarter, not now
+      added / trimmed / unchanged — by change in share count
+    Columns: cusip, issuer, ticker, shares_prev, shares_curr, share_change,
+             pct_change, value_prev, value_curr, status
+    Sorted by absolute change in market value.
+    """
+    merged = prev[COLUMNS].merge(
+        curr[COLUMNS], on="cusip", how="outer", suffixes=("_prev", "_curr"), indicator=True
+    )
+    for col in ("shares", "value"):
+        for side in ("_prev", "_curr"):
+            merged[col + side] = merged[col + side].fillna(0).astype(np.int64)
+    merged["issuer"] = merged["issuer_curr"].fillna(merged["issuer_prev"])
+    merged["ticker"] = merged["ticker_curr"].fillna("").where(
+        merged["ticker_curr"].fillna("") != "", merged["ticker_prev"].fillna("")
+    )
+    merged["share_change"] = merged["shares_curr"] - merged["shares_prev"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = merged["share_change"] / merged["shares_prev"].replace(0, np.nan) * 100
+    merged["pct_change"] = pct.round(2)
+
+    merged["status"] = np.select(
+        [
+            merged["_merge"] == "right_only",
+            merged["_merge"] == "left_only",
+            merged["share_change"] > 0,
+            merged["share_change"] < 0,
+        ],
+        ["new", "exited", "added", "trimmed"],
+        default="unchanged",
+    )
+    order = (merged["value_curr"] - merged["value_prev"]).abs().sort_values(ascending=False).index
+    cols = ["cusip", "issuer", "ticker", "shares_prev", "shares_curr", "share_change",
+            "pct_change", "value_prev", "value_curr", "status"]
+    return merged.loc[order, cols].reset_index(drop=True)
+
+
+def fund_diffs(cik, quarters: int = 4) -> List[Tuple[Dict, Dict, pd.DataFrame]]:
+    """
+    Consecutive-quarter diffs over the cached filings, newest first. Uses
+    only what is on disk — run cache_fund_history() first to fill gaps.
+    When a period has several filings (amendments), the latest filed wins.
+    """
+    by_period: Dict[str, Dict] = {}
+    for entry in list_quarters(cik):
+        key = entry.get("period") or entry["filing_date"]
+        if key not in by_period or entry["filing_date"] > by_period[key]["filing_date"]:
+            by_period[key] = entry
+    entries = [by_period[k] for k in sorted(by_period, reverse=True)][: quarters + 1]
+
+    loaded = {e["accession"]: load_holdings(cik, e["accession"]) for e in entries}
+    return [
+        (prev, curr, diff_holdings(loaded[prev["accession"]], loaded[curr["accession"]]))
+        for curr, prev in zip(entries, entries[1:])
+    ]
+
+
+# ── CLI ────────────────────────────────────────────────────────────────────────
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+    parser = argparse.ArgumentParser(description="13F per-accession cache and quarter-over-quarter diffs.")
+    parser.add_argument("--cik", required=True, help="Filer CIK")
+    parser.add_argument("--quarters", type=int, default=4, help="Number of quarter-over-quarter diffs")
+    parser.add_argument("--fetch", action="store_true", help="Fetch and cache missing quarters from EDGAR first")
+    parser.add_argument("--top", type=int, default=10, help="Changes to print per quarter")
+    args = parser.parse_args()
+
+    if args.fetch:
+        cache_fund_history(args.cik, args.quarters + 1)
+
+    for prev, curr, diff in fund_diffs(args.cik, args.quarters):
+        counts = diff["status"].value_counts()
+        print(f"\n{'═'*78}")
+        print(f"  {prev.get('period') or prev['filing_date']} → {curr.get('period') or curr['filing_date']}  |  "
+              + "  ".join(f"{s}: {int(counts.get(s, 0))}" for s in ("new", "added", "trimmed", "exited")))
+        print(f"{'═'*78}")
+        changed = diff[diff["status"] != "unchanged"].head(args.top)
+        for _, r in changed.iterrows():
+            pct = "" if pd.isna(r["pct_change"]) else f"{r['pct_change']:+.1f}%"
+            print(f"  {r['status']:<8} {r['ticker'] or r['cusip']:<10} {r['issuer'][:30]:<31} "
+                  f"{r['share_change']:>+14,} {pct:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,26 @@ from typing import List, Dict
 import pandas as pd
 
 WATCHLIST_CSV = "data/watchlist.csv"
+WATCHLIST_DIR = "data/watchlists"   # optional per-user lists: data/watchlists/<email>.csv
 SNAP_DIR = "data/tracked_portfolios"
 
 os.makedirs("data", exist_ok=True)
 os.makedirs(SNAP_DIR, exist_ok=True)
 
 # ---------- Watchlist ----------
-def load_watchlist() -> List[str]:
-    if not os.path.exists(WATCHLIST_CSV):
+def load_watchlist(user: str = "", shared_fallback: bool = True) -> List[str]:
+    """Shared watchlist, or `user`'s own list in WATCHLIST_DIR when one exists.
+    With shared_fallback=False a user without their own list gets []."""
+    path = WATCHLIST_CSV
+    if user:
+        own = os.path.join(WATCHLIST_DIR, f"{user.strip().lower()}.csv")
+        if os.path.exists(own):
+            path = own
+        elif not shared_fallback:
+            return []
+    if not os.path.exists(path):
         return []
-    with open(WATCHLIST_CSV, "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         items = [line.strip().upper() for line in f if line.strip()]
     # de-dup and sort
     return sorted(set(items))